@@ -4,11 +4,13 @@ from .research_agents import create_research_team
 from .planning_agents import create_planning_pipeline
 from .other_agents import create_validation_agent, create_booking_agent
 from .coordinator import create_coordinator
+from .templates import create_plan_personalizer
 
 __all__ = [
     "create_research_team",
     "create_planning_pipeline",
     "create_validation_agent",
     "create_booking_agent",
-    "create_coordinator"
+    "create_coordinator",
+    "create_plan_personalizer"
 ]
@@ -1,9 +1,8 @@
 """Root coordinator agent."""
 
 from google.adk.agents import Agent
-from google.adk.models.google_llm import Gemini
 from google.adk.tools import AgentTool
-from config import MODEL_NAME, RETRY_CONFIG
+from agents.models import create_model, create_generation_config
 from agents.research_agents import create_research_team
 from agents.planning_agents import create_planning_pipeline
 from agents.other_agents import create_validation_agent, create_booking_agent
@@ -18,10 +17,8 @@ def create_coordinator():
     
     return Agent(
         name="VertexVoyagesCoordinator",
-        model=Gemini(
-            model=MODEL_NAME,
-            retry_options=RETRY_CONFIG
-        ),
+        model=create_model("VertexVoyagesCoordinator"),
+        generate_content_config=create_generation_config("VertexVoyagesCoordinator"),
         instruction="""You are the Vertex Voyages travel planning coordinator.
 
     CRITICAL: You MUST complete ALL 4 steps in sequence. Do NOT stop until all 4 are done.
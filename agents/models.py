@@ -0,0 +1,210 @@
+"""Model factory shared by all agents.
+
+Each agent's model tier, generation settings, latency deadline and hedging
+policy come from config.get_agent_model_config(). Models are wrapped in a
+TieredModel that hedges slow calls and falls back to the next faster tier
+if the primary does not answer in time. Latency per agent and tier is
+recorded in utils.metrics.metrics under "model.latency", alongside
+"model.hedge", "model.hedge_won", "model.deadline_exceeded" and
+"model.fallback" counters.
+"""
+
+import asyncio
+import time
+from typing import AsyncGenerator, Optional
+
+from google.genai import types
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.google_llm import Gemini
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from config import (
+    MODEL_BACKEND,
+    MODEL_RECORDING,
+    MODEL_TIERS,
+    RETRY_CONFIG,
+    SIMULATED_MODEL_NAME,
+    SIMULATED_LATENCY_MEAN,
+    SIMULATED_LATENCY_SIGMA,
+    SIMULATED_RESPONSE_CHARS,
+    SIMULATED_TIER_LATENCY_FACTOR,
+    HEDGE_MIN_SAMPLES,
+    get_agent_model_config
+)
+from utils.metrics import metrics, percentile
+
+
+class TieredModel(BaseLlm):
+    """Primary model with hedging, a latency deadline and a faster fallback tier.
+
+    With hedge_percentile set, a duplicate request is sent once the primary
+    has been outstanding longer than that percentile of this agent's recent
+    latency (or hedge_delay seconds until enough samples exist); whichever
+    answers first wins. Past the deadline, outstanding requests are
+    cancelled and the faster fallback tier is used instead.
+    """
+
+    primary: BaseLlm
+    fallback: Optional[BaseLlm] = None
+    deadline: Optional[float] = None
+    hedge_percentile: Optional[float] = None
+    hedge_delay: Optional[float] = None
+    agent_name: str = ""
+    tier: str = ""
+    fallback_tier: str = ""
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        started = time.perf_counter()
+        attempts = {}
+
+        def launch(model, request, tier, kind):
+            responses = model.generate_content_async(request, stream)
+            attempts[asyncio.ensure_future(responses.__anext__())] = (responses, tier, kind)
+
+        launch(self.primary, llm_request, self.tier, "primary")
+        hedge_at = self._hedge_delay()
+        deadline_at = self.deadline
+        winner = None
+        try:
+            while winner is None:
+                timers = [timer for timer in (hedge_at, deadline_at) if timer is not None]
+                timeout = max(0.0, min(timers) - (time.perf_counter() - started)) if timers else None
+                done, _ = await asyncio.wait(attempts, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                error = None
+                for task in done:
+                    responses, tier, kind = attempts.pop(task)
+                    exception = task.exception()
+                    if exception is None or isinstance(exception, StopAsyncIteration):
+                        winner = (task, responses, tier, kind)
+                        break
+                    error = exception
+                    await responses.aclose()
+                if winner is not None:
+                    break
+                if error is not None and not attempts:
+                    raise error
+
+                elapsed = time.perf_counter() - started
+                if hedge_at is not None and elapsed >= hedge_at:
+                    hedge_at = None
+                    metrics.increment("model.hedge", agent=self.agent_name, tier=self.tier)
+                    launch(self.primary, llm_request, self.tier, "hedge")
+                if deadline_at is not None and elapsed >= deadline_at:
+                    deadline_at = hedge_at = None
+                    metrics.increment("model.deadline_exceeded", agent=self.agent_name, tier=self.tier)
+                    if self.fallback is not None:
+                        await self._cancel(attempts)
+                        metrics.increment("model.fallback", agent=self.agent_name, tier=self.fallback_tier)
+                        launch(
+                            self.fallback,
+                            llm_request.model_copy(update={"model": self.fallback.model}),
+                            self.fallback_tier,
+                            "fallback"
+                        )
+        finally:
+            await self._cancel(attempts)
+
+        task, responses, tier, kind = winner
+        if task.exception() is not None:
+            return
+        metrics.observe("model.latency", time.perf_counter() - started, agent=self.agent_name, tier=tier)
+        if kind == "hedge":
+            metrics.increment("model.hedge_won", agent=self.agent_name, tier=tier)
+        yield task.result()
+        async for response in responses:
+            yield response
+
+    def _hedge_delay(self) -> Optional[float]:
+        if self.hedge_percentile is None:
+            return None
+        samples = metrics.samples("model.latency", agent=self.agent_name, tier=self.tier)
+        if len(samples) < HEDGE_MIN_SAMPLES:
+            return self.hedge_delay
+        return percentile(samples, self.hedge_percentile)
+
+    @staticmethod
+    async def _cancel(attempts: dict):
+        for task in attempts:
+            task.cancel()
+        await asyncio.gather(*attempts, return_exceptions=True)
+        for responses, _, _ in attempts.values():
+            await responses.aclose()
+        attempts.clear()
+
+
+def _create_tier_model(tier: str) -> BaseLlm:
+    if MODEL_BACKEND == "simulated":
+        from utils.simulated_model import SimulatedGemini
+
+        return SimulatedGemini(
+            model=f"{SIMULATED_MODEL_NAME}-{tier}",
+            latency_mean=SIMULATED_LATENCY_MEAN * SIMULATED_TIER_LATENCY_FACTOR.get(tier, 1.0),
+            latency_sigma=SIMULATED_LATENCY_SIGMA,
+            response_chars=SIMULATED_RESPONSE_CHARS
+        )
+
+    return Gemini(
+        model=MODEL_TIERS[tier],
+        retry_options=RETRY_CONFIG
+    )
+
+
+def _faster_tier(tier: str) -> Optional[str]:
+    tiers = list(MODEL_TIERS)
+    index = tiers.index(tier)
+    return tiers[index - 1] if index > 0 else None
+
+
+def create_model(agent_name: str) -> BaseLlm:
+    """Create the model used by an agent.
+
+    Args:
+        agent_name: Agent name used to look up its model settings
+
+    Returns:
+        Model for the agent's tier, wrapped in a TieredModel that records
+        latency and enforces the agent's deadline (and, with
+        MODEL_RECORDING, in a RecordedModel for evaluation replays)
+    """
+    settings = get_agent_model_config(agent_name)
+    tier = settings["tier"]
+    primary = _create_tier_model(tier)
+    fallback_tier = _faster_tier(tier) if settings["deadline"] else None
+
+    model = TieredModel(
+        model=primary.model,
+        primary=primary,
+        fallback=_create_tier_model(fallback_tier) if fallback_tier else None,
+        deadline=settings["deadline"],
+        hedge_percentile=settings["hedge_percentile"],
+        hedge_delay=settings["hedge_delay"],
+        agent_name=agent_name,
+        tier=tier,
+        fallback_tier=fallback_tier or ""
+    )
+    if MODEL_RECORDING:
+        from utils.recorded_model import RecordedModel
+
+        return RecordedModel(model=model.model, inner=model, agent_name=agent_name)
+    return model
+
+
+def create_generation_config(agent_name: str) -> Optional[types.GenerateContentConfig]:
+    """Create the agent's GenerateContentConfig from its model settings.
+
+    Args:
+        agent_name: Agent name used to look up its model settings
+
+    Returns:
+        GenerateContentConfig, or None when no generation settings are set
+    """
+    settings = get_agent_model_config(agent_name)
+    options = {
+        key: settings[key]
+        for key in ("temperature", "max_output_tokens")
+        if settings[key] is not None
+    }
+    return types.GenerateContentConfig(**options) if options else None
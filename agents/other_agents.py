@@ -1,9 +1,8 @@
 """Validation and booking agents."""
 
 from google.adk.agents import Agent
-from google.adk.models.google_llm import Gemini
 from google.adk.tools import FunctionTool
-from config import MODEL_NAME, RETRY_CONFIG
+from agents.models import create_model, create_generation_config
 from tools.destination_validator import validate_destination
 from tools.booking_approval import request_booking_approval
 
@@ -12,17 +11,17 @@ def create_validation_agent():
     """Create destination validation agent."""
     return Agent(
         name="ValidationAgent",
-        model=Gemini(
-            model=MODEL_NAME,
-            retry_options=RETRY_CONFIG
-        ),
+        model=create_model("ValidationAgent"),
+        generate_content_config=create_generation_config("ValidationAgent"),
         instruction="""You are a travel safety and feasibility validator.
         
         Your task:
         1. Extract the destination and travel dates from the user's request
         2. Use the validate_destination tool with these parameters
         3. Report the safety rating and any travel warnings
-        4. Provide recommendations based on the validation results
+        4. Report how well the dates fit the season (the tool's "season" result)
+        5. Provide recommendations based on the validation results, suggesting
+           the tool's "better_dates" if the season fit is fair or poor
         
         IMPORTANT: 
         - If dates are mentioned in the request (like "2025-06-15 to 2025-06-20"), use them directly
@@ -35,6 +34,7 @@ def create_validation_agent():
         **Destination Validation:**
         - Safety Rating: X/5.0
         - Best Months: [list]
+        - Season Fit: [suitability and the warnings active during the trip]
         - Warnings: [list or "None"]
         - Recommendation: [Your advice]
         """,
@@ -47,14 +47,13 @@ def create_booking_agent():
     """Create booking agent."""
     return Agent(
         name="BookingAgent",
-        model=Gemini(
-            model=MODEL_NAME,
-            retry_options=RETRY_CONFIG
-        ),
+        model=create_model("BookingAgent"),
+        generate_content_config=create_generation_config("BookingAgent"),
         instruction="""You are a travel booking specialist.
         
         Your task:
         1. Extract the total cost from the budget analysis: {budget_analysis}
+           (pass the number in the currency it is quoted in; do not convert it)
         2. Extract destination and traveler count from the user's request
         3. Use the request_booking_approval tool to check if approval is needed
         4. If status is "pending", inform the user that approval is required
@@ -64,7 +63,7 @@ def create_booking_agent():
         
         Response format:
         **Booking Status:** [Approved/Pending/Rejected]
-        **Total Cost:** $X,XXX.XX
+        **Total Cost:** [Total exactly as quoted in the budget, in its currency]
         **Next Steps:** [What happens next]
         """,
         tools=[FunctionTool(func=request_booking_approval)],
@@ -1,34 +1,37 @@
 """Planning agents for itinerary, budget, and optimization."""
 
 from google.adk.agents import Agent, SequentialAgent
-from google.adk.models.google_llm import Gemini
 from google.adk.tools import FunctionTool
-from config import MODEL_NAME, RETRY_CONFIG
+from agents.models import create_model, create_generation_config
 from tools.budget_calculator import calculate_trip_budget
+from tools.itinerary_optimizer import optimize_itinerary
 
 
 def create_itinerary_builder():
     """Create itinerary builder agent."""
     return Agent(
         name="ItineraryBuilder",
-        model=Gemini(
-            model=MODEL_NAME,
-            retry_options=RETRY_CONFIG
-        ),
+        model=create_model("ItineraryBuilder"),
+        generate_content_config=create_generation_config("ItineraryBuilder"),
         instruction="""You are an expert travel itinerary planner.
         
         Using the research data:
         - Destination Info: {destination_research}
         - Activities: {activity_research}
         - Weather: {weather_research}
+        - Trip legs (multi-city trips only): {trip_legs?}
         
-        Create a day-by-day itinerary that:
-        1. Balances popular attractions with unique experiences
-        2. Groups nearby locations together to minimize travel time
-        3. Considers weather conditions and best times for outdoor activities
-        4. Includes realistic time allocations (travel time, activity duration, meals)
-        5. Provides morning, afternoon, and evening plans for each day
-        6. Leaves some flexibility for spontaneous exploration
+        Your task:
+        1. Call the optimize_itinerary tool with the destination and number of days.
+           It already groups nearby attractions by day, orders each day's route
+           and fits activities into time slots.
+        2. Narrate its plan day by day. Keep its days, order and times; add a
+           short note per activity, meal suggestions, and weather advice.
+        3. Mention one or two of its optional extras for spare time.
+        4. For days marked "no_data" (or if the tool returns status "no_data"),
+           plan those days yourself from the research, grouping nearby places.
+           On multi-city trips, keep each leg's days and put travel between
+           cities on the first morning of each new leg.
         
         Format as:
         **Day 1:**
@@ -38,6 +41,7 @@ def create_itinerary_builder():
         
         Keep it concise and practical. Total length: 200-300 words.
         """,
+        tools=[FunctionTool(func=optimize_itinerary)],
         output_key="itinerary_draft",
     )
 
@@ -46,15 +50,13 @@ def create_budget_calculator():
     """Create budget calculator agent."""
     return Agent(
         name="BudgetCalculator",
-        model=Gemini(
-            model=MODEL_NAME,
-            retry_options=RETRY_CONFIG
-        ),
+        model=create_model("BudgetCalculator"),
+        generate_content_config=create_generation_config("BudgetCalculator"),
         instruction="""You are a travel budget specialist.
         
         Your task:
         1. Use the calculate_trip_budget tool with the user's preferences
-        2. Present the budget breakdown clearly
+        2. Present the budget breakdown clearly, in the currency the tool quotes
         3. Provide money-saving tips specific to the destination
         4. Suggest budget adjustments if costs seem too high
         
@@ -78,10 +80,8 @@ def create_optimizer():
     """Create optimizer agent."""
     return Agent(
         name="OptimizerAgent",
-        model=Gemini(
-            model=MODEL_NAME,
-            retry_options=RETRY_CONFIG
-        ),
+        model=create_model("OptimizerAgent"),
+        generate_content_config=create_generation_config("OptimizerAgent"),
         instruction="""You are a travel plan optimization specialist.
         
         Review the itinerary and budget:
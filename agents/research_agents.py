@@ -1,23 +1,35 @@
 """Research agents for destination, activities, and weather."""
 
-from google.adk.agents import Agent, ParallelAgent
-from google.adk.models.google_llm import Gemini
-from google.adk.tools import google_search
-from config import MODEL_NAME, RETRY_CONFIG
+import asyncio
+import re
+from typing import AsyncGenerator
+
+from google.genai import types
+from google.adk.agents import Agent, BaseAgent, ParallelAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from config import RESEARCH_CACHE_SIZE, RESEARCH_CACHE_TTL, RESEARCH_MAX_CONCURRENT_LEGS, RESEARCH_OUTPUT_KEYS
+from agents.models import create_model, create_generation_config
+from agents.stages import normalize_destination, with_stage_deadline
+from tools.search import create_search_tool
+from utils.cache import TTLCache
+from utils.metrics import metrics
+
+
+# Research outputs per (city, travel month), shared across trips
+leg_research_cache = TTLCache(maxsize=RESEARCH_CACHE_SIZE, ttl=RESEARCH_CACHE_TTL)
 
 
 def create_destination_researcher():
     """Create destination research agent."""
     return Agent(
         name="DestinationResearcher",
-        model=Gemini(
-            model=MODEL_NAME,
-            retry_options=RETRY_CONFIG
-        ),
+        model=create_model("DestinationResearcher"),
+        generate_content_config=create_generation_config("DestinationResearcher"),
         instruction="""You are a destination research specialist.
         
         Your task:
-        1. Research the given destination using Google Search
+        1. Research the given destination with one or two web searches
         2. Find information about: top attractions, local culture, must-see landmarks, hidden gems
         3. Focus on recent and popular recommendations
         4. Keep your findings concise (150-200 words)
@@ -29,7 +41,7 @@ def create_destination_researcher():
         - [Attraction 2]: Brief description
         ...
         """,
-        tools=[google_search],
+        tools=[create_search_tool()],
         output_key="destination_research",
     )
 
@@ -38,14 +50,12 @@ def create_activity_finder():
     """Create activity finder agent."""
     return Agent(
         name="ActivityFinder",
-        model=Gemini(
-            model=MODEL_NAME,
-            retry_options=RETRY_CONFIG
-        ),
+        model=create_model("ActivityFinder"),
+        generate_content_config=create_generation_config("ActivityFinder"),
         instruction="""You are an activity and experience specialist.
         
         Your task:
-        1. Use Google Search to find activities, tours, and experiences at the destination
+        1. Search the web for activities, tours, and experiences at the destination
         2. Focus on: outdoor activities, cultural experiences, food tours, adventure sports
         3. Include family-friendly and adult options
         4. Provide realistic time estimates for each activity
@@ -57,32 +67,25 @@ def create_activity_finder():
         - [Activity 2]: Description (Duration: X hours)
         ...
         """,
-        tools=[google_search],
+        tools=[create_search_tool()],
         output_key="activity_research",
     )
 
 
 def create_weather_checker():
     """Create weather checker agent."""
-    from google.genai import types
-    
     return Agent(
         name="WeatherChecker",
-        model=Gemini(
-            model=MODEL_NAME,
-            retry_options=RETRY_CONFIG,
-            generation_config=types.GenerateContentConfig(
-                temperature=0.7,
-            )
-        ),
+        model=create_model("WeatherChecker"),
+        generate_content_config=create_generation_config("WeatherChecker"),
         instruction="""You are a weather research specialist for travel planning.
 
 YOUR MISSION:
-Extract the destination and travel dates/months from the user's request, then use Google Search to find accurate weather information.
+Extract the destination and travel dates/months from the user's request, then search the web for accurate weather information.
 
 SEARCH STRATEGY:
-1. Search: "[destination] weather [specific month/season] average"
-2. Search: "[destination] climate [month]" 
+1. Search once: "[destination] weather [specific month/season]"
+2. Search again only if the results do not cover the travel month
 3. Look for: temperature ranges, rainfall, seasonal patterns, typical conditions
 
 WHAT TO FIND:
@@ -102,18 +105,154 @@ OUTPUT FORMAT:
 
 Keep your response concise (120-150 words), accurate, and immediately actionable for travelers.
 """,
-        tools=[google_search],
+        tools=[create_search_tool()],
         output_key="weather_research",
     )
 
 
+class ResearchFanoutAgent(BaseAgent):
+    """Runs the research team once per trip leg with bounded concurrency.
+
+    Legs come from the "trip_legs" session state written by plan_trip. Each
+    leg runs on its own branch with a leg-specific request, at most
+    max_concurrent_legs at a time, and results are cached per city so
+    repeated legs and later trips skip the research entirely. The merged
+    research of all legs is written to the usual research keys in one
+    final event. Without trip_legs the team runs once, as before.
+    """
+
+    max_concurrent_legs: int = RESEARCH_MAX_CONCURRENT_LEGS
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        team = self.sub_agents[0]
+        legs = ctx.session.state.get("trip_legs")
+        if not legs:
+            async for event in team.run_async(ctx):
+                yield event
+            return
+
+        results = {}
+        pending = []
+        for index, leg in enumerate(legs):
+            cached = leg_research_cache.get(_leg_cache_key(leg))
+            if cached is not None:
+                metrics.increment("research.leg_cache_hit")
+                results[index] = cached
+            else:
+                pending.append((index, leg))
+
+        semaphore = asyncio.Semaphore(self.max_concurrent_legs)
+        queue = asyncio.Queue()
+
+        async def emit(event):
+            # Wait until the runner has stored the event before continuing,
+            # so each leg's agents see their own leg request in the session.
+            processed = asyncio.Event()
+            await queue.put((event, processed))
+            await processed.wait()
+
+        async def research(index, leg):
+            try:
+                async with semaphore:
+                    metrics.increment("research.leg")
+                    leg_ctx = _leg_context(ctx, index, leg)
+                    await emit(Event(
+                        invocation_id=ctx.invocation_id,
+                        author="user",
+                        branch=leg_ctx.branch,
+                        content=leg_ctx.user_content,
+                    ))
+                    outputs = {}
+                    async for event in team.run_async(leg_ctx):
+                        state_delta = event.actions.state_delta if event.actions else None
+                        for key in RESEARCH_OUTPUT_KEYS:
+                            if state_delta and key in state_delta:
+                                outputs[key] = state_delta.pop(key)
+                        await emit(event)
+                    results[index] = outputs
+                    leg_research_cache.set(_leg_cache_key(leg), outputs)
+            finally:
+                await queue.put((None, None))
+
+        tasks = [asyncio.create_task(research(index, leg)) for index, leg in pending]
+        try:
+            remaining = len(tasks)
+            while remaining:
+                event, processed = await queue.get()
+                if event is None:
+                    remaining -= 1
+                    continue
+                yield event
+                processed.set()
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        merged = {
+            key: "\n\n".join(
+                f"### {leg['destination']}\n{results[index].get(key, '')}"
+                for index, leg in enumerate(legs)
+            )
+            for key in RESEARCH_OUTPUT_KEYS
+        }
+        summary = "\n\n".join(
+            f"## {leg['destination']}\n" + "\n\n".join(results[index].get(key, "") for key in RESEARCH_OUTPUT_KEYS)
+            for index, leg in enumerate(legs)
+        )
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=summary)]),
+            actions=EventActions(state_delta={
+                **merged,
+                "leg_research": {leg["destination"]: results[index] for index, leg in enumerate(legs)},
+            }),
+        )
+
+
+def _leg_cache_key(leg: dict) -> tuple:
+    return (normalize_destination(leg["destination"]), leg.get("travel_dates", "")[5:7])
+
+
+def _leg_context(ctx: InvocationContext, index: int, leg: dict) -> InvocationContext:
+    """Invocation context for one leg: its own branch and request."""
+    slug = re.sub(r"\W+", "_", normalize_destination(leg["destination"])).strip("_")
+    leg_branch = f"leg{index}_{slug}"
+    details = [f"- Destination: {leg['destination']}", f"- Duration: {leg['num_days']} days"]
+    if leg.get("travel_dates"):
+        details.insert(1, f"- Dates: {leg['travel_dates']}")
+    if ctx.session.state.get("num_travelers"):
+        details.append(f"- Travelers: {ctx.session.state['num_travelers']}")
+    request = (
+        f"Research only this leg (stop {index + 1}) of a multi-city trip.\n\n"
+        "Trip Details:\n" + "\n".join(details)
+    )
+    return ctx.model_copy(update={
+        "branch": f"{ctx.branch}.{leg_branch}" if ctx.branch else leg_branch,
+        "user_content": types.Content(role="user", parts=[types.Part(text=request)]),
+    })
+
+
 def create_research_team():
-    """Create parallel research team."""
-    return ParallelAgent(
+    """Create parallel research team.
+    
+    Each researcher runs under a hard deadline so one slow search cannot
+    hold back the whole team (see agents.stages). Multi-city trips fan the
+    team out across legs (see ResearchFanoutAgent).
+    """
+    return ResearchFanoutAgent(
         name="ResearchTeam",
+        description="Researches attractions, activities and weather for every destination of the trip.",
         sub_agents=[
-            create_destination_researcher(),
-            create_activity_finder(),
-            create_weather_checker()
+            ParallelAgent(
+                name="DestinationResearchTeam",
+                sub_agents=[
+                    with_stage_deadline(create_destination_researcher()),
+                    with_stage_deadline(create_activity_finder()),
+                    with_stage_deadline(create_weather_checker())
+                ],
+            )
         ],
     )
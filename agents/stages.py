@@ -0,0 +1,119 @@
+"""Stage wrappers that bound how long one agent can hold up the pipeline."""
+
+import asyncio
+import re
+from typing import AsyncGenerator
+
+from google.genai import types
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from config import RESEARCH_CACHE_SIZE, RESEARCH_CACHE_TTL, get_agent_model_config
+from utils.cache import TTLCache
+from utils.metrics import metrics
+
+
+# Last successful output per (output_key, destination)
+research_cache = TTLCache(maxsize=RESEARCH_CACHE_SIZE, ttl=RESEARCH_CACHE_TTL)
+
+
+def destination_key(ctx: InvocationContext) -> str:
+    """Normalised destination a stage is working on.
+
+    Uses the "Destination:" line of the stage's request (set per leg for
+    multi-city trips), then the destination validated earlier in the trip,
+    then the whole request text.
+    """
+    request = ""
+    if ctx.user_content and ctx.user_content.parts:
+        request = " ".join(part.text for part in ctx.user_content.parts if part.text)
+    match = re.search(r"Destination:\s*(.+)", request)
+    destination = match.group(1) if match else ctx.session.state.get("validated_destination") or request
+    return normalize_destination(destination)
+
+
+def normalize_destination(destination: str) -> str:
+    """Lower-cased city part of a destination, e.g. "Kyoto, Japan" -> "kyoto"."""
+    return (destination or "").lower().split(",")[0].strip()
+
+
+class StageDeadlineAgent(BaseAgent):
+    """Runs one agent with a hard deadline and degrades instead of blocking.
+
+    If the wrapped agent has not finished within hard_deadline seconds it
+    is cancelled, and output_key is set to the last cached result for the
+    same destination (or left empty) so the rest of the pipeline proceeds.
+    """
+
+    output_key: str
+    hard_deadline: float
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        stage = self.sub_agents[0]
+        cache_key = (self.output_key, destination_key(ctx))
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.hard_deadline
+
+        # The stage runs in one task of its own and hands over each event;
+        # stepping its generator through wait_for would run every step in a
+        # new task and split ADK's tracing context across them.
+        handoff = asyncio.Queue()
+        runner = asyncio.create_task(self._drive(stage, ctx, handoff))
+        try:
+            while True:
+                item = await asyncio.wait_for(handoff.get(), max(0.0, deadline - loop.time()))
+                if item is None:
+                    await runner  # re-raises the stage's error, if any
+                    return
+                event, resume = item
+                state_delta = event.actions.state_delta if event.actions else None
+                if state_delta and self.output_key in state_delta:
+                    research_cache.set(cache_key, state_delta[self.output_key])
+                yield event
+                resume.set_result(None)
+        except asyncio.TimeoutError:
+            runner.cancel()
+            await asyncio.gather(runner, return_exceptions=True)
+        finally:
+            runner.cancel()
+
+        metrics.increment("stage.timeout", stage=stage.name)
+        cached = research_cache.get(cache_key)
+        if cached is not None:
+            metrics.increment("stage.cache_fallback", stage=stage.name)
+            notice = f"{stage.name} timed out after {self.hard_deadline:.0f}s; using cached research."
+        else:
+            notice = f"{stage.name} timed out after {self.hard_deadline:.0f}s; no research available."
+
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=notice)]),
+            actions=EventActions(state_delta={self.output_key: cached or ""}),
+        )
+
+    @staticmethod
+    async def _drive(stage, ctx: InvocationContext, handoff: asyncio.Queue):
+        """Run the stage, waiting after each event until the caller has yielded it."""
+        try:
+            async for event in stage.run_async(ctx):
+                resume = asyncio.get_running_loop().create_future()
+                handoff.put_nowait((event, resume))
+                await resume
+        finally:
+            handoff.put_nowait(None)
+
+
+def with_stage_deadline(agent):
+    """Wrap an agent in a StageDeadlineAgent if it has a hard_deadline configured."""
+    hard_deadline = get_agent_model_config(agent.name)["hard_deadline"]
+    if hard_deadline is None:
+        return agent
+    return StageDeadlineAgent(
+        name=f"{agent.name}Stage",
+        description=agent.description,
+        sub_agents=[agent],
+        output_key=agent.output_key,
+        hard_deadline=hard_deadline,
+    )
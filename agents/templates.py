@@ -0,0 +1,184 @@
+"""Plan templates: the offline precompute job and the request-time personalizer.
+
+Run the job after deploying, and again to refresh the research:
+
+    python -m agents.templates --year 2026
+
+For each catalogue destination and season it runs the research team once
+and writes the results to PLAN_TEMPLATES_FILE (see tools.plan_templates).
+A trip that matches a template skips validation, research and planning.
+Only PlanPersonalizer runs: it asks for booking approval and writes the
+final plan from the precomputed parts.
+"""
+
+import argparse
+import asyncio
+from datetime import datetime
+
+from google.genai import types
+from google.adk.agents import Agent
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.adk.tools import FunctionTool
+
+from config import PLAN_TEMPLATES_FILE, RESEARCH_OUTPUT_KEYS
+from agents.models import create_model, create_generation_config
+from agents.research_agents import create_research_team
+from tools.booking_approval import request_booking_approval
+from tools.plan_templates import (
+    CATALOGUE,
+    SEASONS,
+    TEMPLATE_DESTINATIONS,
+    build_template_record,
+    compile_plan_templates,
+    season_dates,
+)
+from utils.structured_log import get_logger
+
+
+logger = get_logger("templates")
+
+_PRECOMPUTE_APP = "vertex_voyages_templates"
+_PRECOMPUTE_USER = "template_builder"
+
+
+def create_plan_personalizer():
+    """Create the agent that finishes a trip assembled from a plan template."""
+    return Agent(
+        name="PlanPersonalizer",
+        model=create_model("PlanPersonalizer"),
+        generate_content_config=create_generation_config("PlanPersonalizer"),
+        instruction="""You are the Vertex Voyages travel planning coordinator.
+
+    Validation, research, itinerary and budget for this trip are already done:
+
+    {validation_result}
+
+    **Research:**
+    {destination_research}
+
+    {activity_research}
+
+    {weather_research}
+
+    **Itinerary:**
+    {itinerary_draft}
+
+    {budget_analysis}
+    - total_estimated_cost: {last_budget_local} {currency}
+
+    **Seasonal tips:**
+    {plan_tips}
+
+    Your task:
+    1. Call request_booking_approval with the total_estimated_cost above (in its
+       currency; do not convert it), the destination and the traveler count
+       from the user's request
+    2. Then write the final plan, tailored to what the user asked for. Keep the
+       days, times and costs exactly as given - only the wording is yours.
+
+    Final output:
+
+    **🌍 Vertex Voyages Travel Plan**
+
+    **Destination:** [Name]
+    **Dates:** [Travel dates]
+    **Travelers:** [Number]
+
+    **✅ Validation:** [Summary of the validation above]
+
+    **🔍 Research Highlights:**
+    [Key findings that fit the user's request, and the seasonal tips]
+
+    **📅 Itinerary & Budget:**
+    [The itinerary and total cost above]
+
+    **💳 Booking Status:**
+    [Approved, Pending Approval or Rejected, from request_booking_approval]
+    """,
+        tools=[FunctionTool(func=request_booking_approval)],
+        output_key="personalized_plan",
+    )
+
+
+def _research_query(key: str, season: str, year: int) -> types.Content:
+    name = CATALOGUE.get(key, key.title())
+    dates = season_dates(season, year)
+    return types.Content(role="user", parts=[types.Part(text=f"""Research {name} for travelers in {season} {year}.
+
+Trip Details:
+- Destination: {name}
+- Dates: {dates}
+- Duration: 4 days
+- Travelers: 2
+""")])
+
+
+async def precompute_plan_templates(
+    target: str = PLAN_TEMPLATES_FILE,
+    year: int = None,
+    destinations: list = None,
+    seasons: list = None,
+    concurrency: int = 4
+) -> int:
+    """Research every catalogue destination and season and write the template index.
+
+    Args:
+        target: Index file to write
+        year: Year the research and seasonal advice are for (default: this year)
+        destinations: Catalogue keys to build (default TEMPLATE_DESTINATIONS)
+        seasons: Seasons to build (default all of SEASONS)
+        concurrency: Research runs in flight at once
+
+    Returns:
+        Number of templates written
+    """
+    year = year or datetime.now().year
+    session_service = InMemorySessionService()
+    runner = Runner(app_name=_PRECOMPUTE_APP, agent=create_research_team(), session_service=session_service)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def build(key, season):
+        async with semaphore:
+            session_id = f"template_{key.replace(' ', '_')}_{season}"
+            await session_service.create_session(
+                app_name=_PRECOMPUTE_APP, user_id=_PRECOMPUTE_USER, session_id=session_id
+            )
+            async for _ in runner.run_async(
+                user_id=_PRECOMPUTE_USER,
+                session_id=session_id,
+                new_message=_research_query(key, season, year)
+            ):
+                pass
+            session = await session_service.get_session(
+                app_name=_PRECOMPUTE_APP, user_id=_PRECOMPUTE_USER, session_id=session_id
+            )
+            research = {output: session.state.get(output, "") for output in RESEARCH_OUTPUT_KEYS}
+            await session_service.delete_session(
+                app_name=_PRECOMPUTE_APP, user_id=_PRECOMPUTE_USER, session_id=session_id
+            )
+            logger.info(f"🧩 Template {key}/{season} researched", extra={
+                "event": "templates.built", "fields": {"destination": key, "season": season}
+            })
+            return build_template_record(key, season, research, year)
+
+    records = await asyncio.gather(*(
+        build(key, season)
+        for key in destinations or TEMPLATE_DESTINATIONS
+        for season in seasons or SEASONS
+    ))
+    return compile_plan_templates(records, target)
+
+
+if __name__ == "__main__":
+    from utils.structured_log import ensure_logging
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--year", type=int, default=None, help="Year the templates are for (default: this year)")
+    parser.add_argument("--target", default=PLAN_TEMPLATES_FILE, help="Index file to write")
+    parser.add_argument("--concurrency", type=int, default=4, help="Research runs in flight at once")
+    args = parser.parse_args()
+
+    ensure_logging()
+    count = asyncio.run(precompute_plan_templates(args.target, args.year, concurrency=args.concurrency))
+    logger.info(f"✅ Wrote {count} plan templates to {args.target}")
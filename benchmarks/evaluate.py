@@ -0,0 +1,346 @@
+"""Regression evaluation over a fixed corpus of trips with recorded model responses.
+
+Every case in data/eval/corpus.json is planned end to end through
+main.create_trip_session and main.run_trip, with each model call answered
+from its recording in data/eval/recordings/ (no model, no network; local
+search). Replayed calls sleep their recorded latency times
+--latency-scale, so wall time follows the model's critical path as well
+as local overhead.
+
+Cases marked "template" take the plan template path, as plan_trip does
+for catalogue trips: a scratch template index is built from the corpus's
+"templates" entry (its research replayed from recordings/templates.json)
+and only PlanPersonalizer runs.
+
+Each case is checked for structural correctness:
+
+- steps: the coordinator ran ValidationAgent, ResearchTeam,
+  PlanningPipeline and BookingAgent, in that order (for template cases,
+  PlanPersonalizer called request_booking_approval)
+- budget: the quoted total matches calculate_trip_budget for the trip
+- approval: the booking took the branch the case expects (auto_approved,
+  policy_approved, policy_rejected or review)
+- itinerary: one "**Day N:**" entry per day of the trip
+
+The checked-in recordings come from the scripted simulated backend
+(utils.simulated_model), which always runs the four coordinator steps and
+writes one "**Day N:**" entry per day. Against them the steps and
+itinerary checks only guard the harness and the pipeline's wiring, not
+model output; re-record with VERTEX_VOYAGES_MODEL_BACKEND=gemini to check
+a real model. The report says which backend the replayed recordings came
+from.
+
+Each case's model calls, prompt and output tokens and wall time are compared
+with data/eval/baseline.json. Exits with status 1 if quality drops below
+the baseline (or min_quality), or calls, tokens or wall time grow past the
+baseline's tolerances.
+
+    python benchmarks/evaluate.py                    # replay and gate
+    python benchmarks/evaluate.py --record           # re-record responses from the model backend
+    python benchmarks/evaluate.py --update-baseline  # accept the current numbers
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+from datetime import date
+
+os.environ["VERTEX_VOYAGES_MODEL_RECORDING"] = "1"
+os.environ.setdefault("VERTEX_VOYAGES_MODEL_BACKEND", "simulated")
+os.environ["VERTEX_VOYAGES_SEARCH_BACKEND"] = "local"
+os.environ["VERTEX_VOYAGES_LOG_QUIET"] = "1"
+_scratch = tempfile.mkdtemp(prefix="vv_eval_")
+os.environ["VERTEX_VOYAGES_CHECKPOINT_DIR"] = os.path.join(_scratch, "checkpoints")
+os.environ["VERTEX_VOYAGES_ARCHIVE_DIR"] = os.path.join(_scratch, "archive")
+os.environ["VERTEX_VOYAGES_SEARCH_CACHE"] = os.path.join(_scratch, "search.sqlite")
+os.environ["VERTEX_VOYAGES_PLAN_TEMPLATES_FILE"] = os.path.join(_scratch, "plan_templates.bin")
+os.environ["VERTEX_VOYAGES_USER_MEMORY_DIR"] = os.path.join(_scratch, "users")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+DEFAULT_THRESHOLDS = {
+    "min_quality": 1.0,  # share of checks that must pass in every case
+    "model_calls": 0.0,  # allowed growth over the baseline, as a fraction
+    "prompt_tokens": 0.10,
+    "wall_seconds": 0.25,
+    "wall_slack_seconds": 0.25,  # absolute allowance for timer noise on short cases
+}
+METRICS = ("model_calls", "prompt_tokens", "output_tokens", "wall_seconds")
+_DAY_PATTERN = re.compile(r"\*\*Day (\d+):\*\*")
+_TEMPLATE_STEPS = ["request_booking_approval"]
+
+
+class _BudgetContext:
+    """Just enough of a ToolContext for calculate_trip_budget: session state."""
+
+    def __init__(self, state: dict):
+        self.state = state
+
+
+def check_steps(events: list, template: bool = False) -> tuple:
+    from utils.simulated_model import COORDINATOR_STEPS
+
+    steps = _TEMPLATE_STEPS if template else COORDINATOR_STEPS
+    called = []
+    for event in events:
+        for part in (event.content.parts if event.content and event.content.parts else []):
+            name = part.function_call.name if part.function_call else None
+            if name in steps and name not in called:
+                called.append(name)
+    return called == steps, " → ".join(called) or "no steps"
+
+
+def check_budget(trip: dict, state: dict) -> tuple:
+    from tools.budget_calculator import calculate_trip_budget
+
+    context = _BudgetContext({"currency": trip["currency"], "trip_legs": trip["legs"]})
+    calculate_trip_budget(
+        trip["destination"], trip["num_days"], trip["num_travelers"], trip["accommodation_level"], context
+    )
+    expected = context.state["last_budget_local"]
+    quoted = state.get("last_budget_local")
+    ok = quoted is not None and abs(float(quoted) - expected) < 0.01
+    return ok, f"quoted {quoted}, expected {expected:.2f} {trip['currency']}"
+
+
+def approval_branch(state: dict) -> str:
+    reason = state.get("approval_reason")
+    if reason in ("awaiting_approval", "human_approved", "rejected"):
+        return "review"
+    return reason or "none"
+
+
+def check_approval(expected: str, state: dict) -> tuple:
+    branch = approval_branch(state)
+    return branch == expected, f"{branch}, expected {expected}"
+
+
+def check_itinerary(num_days: int, state: dict) -> tuple:
+    days = [int(day) for day in _DAY_PATTERN.findall(str(state.get("itinerary_draft", "")))]
+    return days == list(range(1, num_days + 1)), f"{len(days)} day entries for {num_days} days"
+
+
+def load_json(path: str, default=None):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
+
+
+def trip_of(case: dict) -> dict:
+    """Trip parameters of a case, with legs and totals as plan_trip derives them."""
+    from config import BASE_CURRENCY
+    from main import build_trip_legs
+
+    trip = {
+        "user_query": case["query"],
+        "destination": case.get("destination"),
+        "travel_dates": case["travel_dates"],
+        "num_days": case.get("num_days"),
+        "num_travelers": case["num_travelers"],
+        "accommodation_level": case.get("accommodation_level", "mid-range"),
+        "currency": case.get("currency", BASE_CURRENCY).upper(),
+        "legs": None,
+    }
+    if case.get("legs"):
+        trip["legs"] = build_trip_legs(case["legs"], case["travel_dates"])
+        trip["destination"] = " → ".join(leg["destination"] for leg in trip["legs"])
+        trip["num_days"] = sum(leg["num_days"] for leg in trip["legs"])
+    return trip
+
+
+async def run_case(runners: dict, case: dict, mode: str, latency_scale: float, templates=None) -> dict:
+    from config import APP_NAME, DEFAULT_USER_ID, EVAL_RECORDINGS_DIR
+    from main import session_service, build_trip_query, create_trip_session, run_trip
+    from tools.plan_templates import template_trip_state
+    from utils.recorded_model import Cassette, current_cassette
+
+    trip = trip_of(case)
+    user_id = case.get("user_id", DEFAULT_USER_ID)
+    session_id = f"eval_{case['id']}"
+    template = None
+    if case.get("template"):
+        template = template_trip_state(
+            trip["destination"], trip["travel_dates"], trip["num_days"], trip["num_travelers"],
+            trip["accommodation_level"], trip["legs"], trip["currency"], index=templates
+        )
+    runner = runners["template" if template is not None else "full"]
+    await create_trip_session(session_id, trip, user_id, template=template)
+    query = build_trip_query(**trip)
+
+    async def decide(approval_info):
+        return case.get("approve", True)
+
+    cassette = Cassette(os.path.join(EVAL_RECORDINGS_DIR, f"{case['id']}.json"), mode, latency_scale)
+    token = current_cassette.set(cassette)
+    events, error = [], None
+    started = time.perf_counter()
+    try:
+        async for event in run_trip(runner, session_id, query, decide, user_id=user_id):
+            events.append(event)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    finally:
+        wall = time.perf_counter() - started
+        current_cassette.reset(token)
+    if error is None:
+        cassette.save()
+
+    session = await session_service.get_session(app_name=APP_NAME, user_id=user_id, session_id=session_id)
+    state = session.state if session else {}
+    checks = {
+        "steps": check_steps(events, template is not None),
+        "budget": check_budget(trip, state),
+        "approval": check_approval(case["expect"]["approval"], state),
+        "itinerary": check_itinerary(trip["num_days"], state),
+    }
+    if case.get("template"):
+        checks["template"] = (template is not None, state.get("plan_template") or "no template for this trip")
+    if error is not None:
+        checks["run"] = (False, error)
+    await session_service.delete_session(app_name=APP_NAME, user_id=user_id, session_id=session_id)
+
+    return {
+        "id": case["id"],
+        "checks": checks,
+        "quality": round(sum(ok for ok, _ in checks.values()) / len(checks), 3),
+        "model_calls": cassette.stats["model_calls"],
+        "prompt_tokens": cassette.stats["prompt_tokens"],
+        "output_tokens": cassette.stats["output_tokens"],
+        "model_seconds": round(cassette.stats["model_seconds"], 3),
+        "wall_seconds": round(wall, 3),
+    }
+
+
+def regressions(result: dict, baseline: dict, thresholds: dict, gate_wall: bool) -> list:
+    """Reasons a case fails its gates; empty if it passes."""
+    failures = []
+    if result["quality"] < thresholds["min_quality"]:
+        failures.append(f"quality {result['quality']:.2f} < {thresholds['min_quality']:.2f}")
+    if baseline is None:
+        return failures
+    if result["quality"] < baseline["quality"]:
+        failures.append(f"quality {result['quality']:.2f} < baseline {baseline['quality']:.2f}")
+    for metric in ("model_calls", "prompt_tokens"):
+        limit = baseline[metric] * (1 + thresholds[metric])
+        if result[metric] > limit:
+            failures.append(f"{metric} {result[metric]} > {limit:.0f} (baseline {baseline[metric]})")
+    limit = max(
+        baseline["wall_seconds"] * (1 + thresholds["wall_seconds"]),
+        baseline["wall_seconds"] + thresholds["wall_slack_seconds"]
+    )
+    if gate_wall and result["wall_seconds"] > limit:
+        failures.append(f"wall {result['wall_seconds']:.2f}s > {limit:.2f}s (baseline {baseline['wall_seconds']:.2f}s)")
+    return failures
+
+
+async def build_templates(spec: dict, mode: str):
+    """Template index for the template cases, researched from recordings/templates.json."""
+    from agents.templates import precompute_plan_templates
+    from config import EVAL_RECORDINGS_DIR, PLAN_TEMPLATES_FILE
+    from tools.plan_templates import PlanTemplateIndex
+    from utils.recorded_model import Cassette, current_cassette
+
+    cassette = Cassette(os.path.join(EVAL_RECORDINGS_DIR, "templates.json"), mode, 0.0)
+    token = current_cassette.set(cassette)
+    try:
+        await precompute_plan_templates(PLAN_TEMPLATES_FILE, spec["year"], spec["destinations"], spec["seasons"])
+    finally:
+        current_cassette.reset(token)
+    cassette.save()
+    return PlanTemplateIndex(PLAN_TEMPLATES_FILE)
+
+
+async def evaluate(cases: list, warmup: dict, mode: str, latency_scale: float, templates: dict = None) -> list:
+    from main import create_runner, create_template_runner
+
+    runners = {"full": create_runner(), "template": create_template_runner()}
+    index = None
+    if templates and any(case.get("template") for case in cases):
+        index = await build_templates(templates, mode)
+    if warmup:
+        # The first trip in a process pays one-off setup; its city is in no case
+        await run_case(runners, warmup, mode, 0.0)
+    # Cases share process caches (search, leg research), so they always run
+    # one at a time in corpus order, the order they were recorded in
+    return [await run_case(runners, case, mode, latency_scale, index) for case in cases]
+
+
+def main(args) -> int:
+    from config import EVAL_BASELINE_FILE, EVAL_CORPUS_FILE, MODEL_BACKEND
+    from tools.approval_policy import approval_policy
+
+    corpus = load_json(EVAL_CORPUS_FILE)
+    # Envelopes expire; judge every run on the date the corpus was written for
+    approval_policy.today = date.fromisoformat(corpus["today"])
+    cases = corpus["cases"]
+    if args.cases:
+        wanted = set(args.cases.split(","))
+        cases = [case for case in cases if case["id"] in wanted]
+    baseline = load_json(EVAL_BASELINE_FILE, {})
+    thresholds = {**DEFAULT_THRESHOLDS, **baseline.get("thresholds", {})}
+    latency_scale = args.latency_scale if args.latency_scale is not None else baseline.get("latency_scale", 1.0)
+    mode = "record" if args.record else "replay"
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        results = asyncio.run(evaluate(cases, corpus.get("warmup"), mode, latency_scale, corpus.get("templates")))
+
+    if mode == "record":
+        print(f"🎙️  Recorded {sum(r['model_calls'] for r in results)} model calls from the "
+              f"{MODEL_BACKEND} backend for {len(results)} cases")
+    if mode == "replay":
+        from config import EVAL_RECORDINGS_DIR
+
+        backends = sorted({
+            load_json(os.path.join(EVAL_RECORDINGS_DIR, f"{result['id']}.json"), {}).get("backend", "unknown")
+            for result in results
+        })
+        print(f"Replaying recordings from the {', '.join(backends)} backend")
+        if backends == ["simulated"]:
+            print("ℹ️  Scripted responses: the steps and itinerary checks cover wiring, not model output")
+    gate_wall = mode == "replay" and latency_scale == baseline.get("latency_scale", 1.0)
+    print(f"{'case':<22} {'quality':>7} {'calls':>5} {'prompt tok':>10} {'output tok':>10} {'model s':>7} {'wall s':>7}")
+    failed = 0
+    for result in results:
+        print(f"{result['id']:<22} {result['quality']:>7.2f} {result['model_calls']:>5} "
+              f"{result['prompt_tokens']:>10} {result['output_tokens']:>10} "
+              f"{result['model_seconds']:>7.2f} {result['wall_seconds']:>7.2f}")
+        for name, (ok, detail) in result["checks"].items():
+            if not ok:
+                print(f"    ❌ {name}: {detail}")
+        failures = regressions(result, baseline.get("cases", {}).get(result["id"]), thresholds, gate_wall)
+        for failure in failures:
+            print(f"    📉 {failure}")
+        failed += bool(failures)
+
+    if args.update_baseline:
+        recorded = baseline.get("cases", {})
+        recorded.update({result["id"]: {metric: result[metric] for metric in ("quality", *METRICS)} for result in results})
+        baseline = {"thresholds": thresholds, "latency_scale": latency_scale, "cases": recorded}
+        with open(EVAL_BASELINE_FILE, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2)
+            f.write("\n")
+        print(f"\n💾 Baseline updated for {len(results)} cases")
+        return 0
+
+    if failed:
+        print(f"\n❌ {failed} of {len(results)} cases regressed")
+        return 1
+    print(f"\n✅ {len(results)} cases passed every check and gate")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--record", action="store_true", help="Call the model backend and save its responses")
+    parser.add_argument("--update-baseline", action="store_true", help="Write this run's numbers as the baseline")
+    parser.add_argument("--cases", help="Comma-separated case ids (default all)")
+    parser.add_argument("--latency-scale", type=float, help="Factor on recorded latency (default the baseline's)")
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,60 @@
+"""Speed of the offline itinerary engine as a city's POI count grows.
+
+Generates synthetic attractions around a city centre and times
+plan_days (selection, clustering, routing and slot fitting) as well as
+k-medoids over every POI at once.
+
+    python benchmarks/itinerary_engine.py --pois 100 500 2000 --days 7
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def synthetic_pois(count, rng, lat=48.8566, lon=2.3522):
+    from tools.itinerary_optimizer import prepare_pois
+
+    return prepare_pois([
+        {
+            "name": f"Attraction {i}",
+            "lat": lat + rng.gauss(0, 0.03),
+            "lon": lon + rng.gauss(0, 0.045),
+            "duration_hours": rng.choice([1.0, 1.5, 2.0, 2.5, 3.0]),
+            **({"slot": "evening"} if rng.random() < 0.1 else {}),
+        }
+        for i in range(count)
+    ])
+
+
+def main(counts, days, repeats, seed):
+    from tools.itinerary_optimizer import plan_days, k_medoids
+
+    rng = random.Random(seed)
+    print(f"{'pois':>6} {'plan ms':>9} {'k-medoids all ms':>17}")
+    for count in counts:
+        pois = synthetic_pois(count, rng)
+
+        started = time.perf_counter()
+        for _ in range(repeats):
+            plan_days(pois, days)
+        plan_ms = (time.perf_counter() - started) / repeats * 1000
+
+        started = time.perf_counter()
+        k_medoids([poi["vector"] for poi in pois], days)
+        cluster_ms = (time.perf_counter() - started) * 1000
+        print(f"{count:>6} {plan_ms:>9.2f} {cluster_ms:>17.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pois", type=int, nargs="+", default=[100, 500, 2000])
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    main(args.pois, args.days, args.repeats, args.seed)
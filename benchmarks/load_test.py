@@ -0,0 +1,255 @@
+"""Offline load-testing harness simulating concurrent travelers.
+
+Travelers arrive as a Poisson process at --rate trips/second for
+--duration seconds. Each picks a destination and accommodation level from
+the traffic mix; --luxury-share of them book luxury trips for two, which
+exceed APPROVAL_THRESHOLD and exercise the approval pause/resume path.
+
+Everything runs against the simulated model, so no network or API key is
+needed. Use --target service to drive the HTTP service instead of calling
+the workflow in-process.
+
+    python benchmarks/load_test.py --rate 20 --duration 30 --luxury-share 0.3
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+import tracemalloc
+import uuid
+
+os.environ.setdefault("VERTEX_VOYAGES_MODEL_BACKEND", "simulated")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+DESTINATIONS = [
+    ("Paris, France", 0.25),
+    ("Tokyo, Japan", 0.25),
+    ("Bali, Indonesia", 0.2),
+    ("New York, USA", 0.15),
+    ("Istanbul, Turkey", 0.15),
+]
+STANDARD_LEVELS = ["budget", "mid-range"]
+
+
+def make_trip(rng: random.Random, luxury_share: float) -> dict:
+    """Draw one trip request from the traffic mix."""
+    names, weights = zip(*DESTINATIONS)
+    destination = rng.choices(names, weights)[0]
+    luxury = rng.random() < luxury_share
+    num_days = rng.randint(3, 7) if luxury else rng.randint(2, 4)
+    return {
+        "user_query": f"Plan a trip to {destination}.",
+        "destination": destination,
+        "travel_dates": "2026-05-01 to 2026-05-0%d" % (1 + num_days),
+        "num_days": num_days,
+        "num_travelers": 2 if luxury else 1,
+        "accommodation_level": "luxury" if luxury else rng.choice(STANDARD_LEVELS),
+    }
+
+
+def current_memory_bytes() -> int:
+    """Traced heap bytes when tracemalloc is on, else resident set size."""
+    if tracemalloc.is_tracing():
+        return tracemalloc.get_traced_memory()[0]
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def count_sessions(session_service) -> tuple:
+    """Return (sessions, events) held by an InMemorySessionService."""
+    sessions = events = 0
+    for users in getattr(session_service, "sessions", {}).values():
+        for user_sessions in users.values():
+            for session in user_sessions.values():
+                sessions += 1
+                events += len(session.events)
+    return sessions, events
+
+
+class InProcessTarget:
+    """Runs trips through main.run_trip on a shared runner."""
+
+    def __init__(self):
+        from main import session_service, create_runner
+        self.session_service = session_service
+        self.runner = create_runner()
+
+    async def plan(self, trip: dict, approval_delay: float) -> dict:
+        from config import APP_NAME, DEFAULT_USER_ID
+        from main import build_trip_query, run_trip
+
+        session_id = f"trip_{uuid.uuid4().hex[:8]}"
+        await self.session_service.create_session(
+            app_name=APP_NAME, user_id=DEFAULT_USER_ID, session_id=session_id
+        )
+        paused_at = None
+
+        async def decide_approval(approval_info):
+            nonlocal paused_at
+            paused_at = time.perf_counter()
+            await asyncio.sleep(approval_delay)
+            return True
+
+        query = build_trip_query(**trip)
+        async for _ in run_trip(self.runner, session_id, query, decide_approval):
+            pass
+        return {"paused_at": paused_at}
+
+
+class ServiceTarget:
+    """Runs trips through the HTTP service started in-process."""
+
+    def __init__(self):
+        from service.http import PlanningServer
+        from service.trips import TripManager
+        from main import session_service
+        self.server = PlanningServer(TripManager(max_active_trips=10_000), host="127.0.0.1", port=0)
+        self.session_service = session_service
+
+    async def plan(self, trip: dict, approval_delay: float) -> dict:
+        from service_load import http_request, follow_trip
+
+        client_id = f"traveler-{uuid.uuid4().hex[:6]}"
+        status, payload = await http_request(self.server.host, self.server.port, "POST", "/trips", trip, client_id)
+        if status != 202:
+            raise RuntimeError(f"POST /trips returned {status}: {payload}")
+        outcome, paused_at = await follow_trip(
+            self.server.host, self.server.port, payload["trip_id"], client_id,
+            approval_delay=approval_delay
+        )
+        if outcome != "trip.completed":
+            raise RuntimeError(outcome)
+        return {"paused_at": paused_at}
+
+
+async def run_load(target, rate, duration, luxury_share, approval_delay, sample_interval, seed):
+    from utils.metrics import summarize_latencies
+
+    rng = random.Random(seed)
+    latencies, approval_rtts, errors = [], [], []
+    memory_samples = []
+    tasks = []
+
+    async def traveler(trip):
+        started = time.perf_counter()
+        try:
+            result = await target.plan(trip, approval_delay)
+        except Exception as exc:
+            errors.append(repr(exc))
+            return
+        finished = time.perf_counter()
+        latencies.append(finished - started)
+        if result["paused_at"] is not None:
+            approval_rtts.append(finished - result["paused_at"])
+
+    async def sampler():
+        t0 = time.perf_counter()
+        while True:
+            sessions, events = count_sessions(target.session_service)
+            memory_samples.append((time.perf_counter() - t0, current_memory_bytes(), sessions, events))
+            await asyncio.sleep(sample_interval)
+
+    sampling = asyncio.create_task(sampler())
+    started = time.perf_counter()
+    while time.perf_counter() - started < duration:
+        tasks.append(asyncio.create_task(traveler(make_trip(rng, luxury_share))))
+        await asyncio.sleep(rng.expovariate(rate))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+    sampling.cancel()
+    sessions, events = count_sessions(target.session_service)
+    memory_samples.append((elapsed, current_memory_bytes(), sessions, events))
+
+    return {
+        "elapsed": elapsed,
+        "offered": len(tasks),
+        "completed": len(latencies),
+        "errors": errors,
+        "throughput": len(latencies) / elapsed if elapsed else 0.0,
+        "latency": summarize_latencies(latencies),
+        "approval_rtt": summarize_latencies(approval_rtts),
+        "memory": memory_samples,
+    }
+
+
+def print_report(report: dict, approval_delay: float):
+    latency, rtt = report["latency"], report["approval_rtt"]
+    print(f"\n{'='*70}")
+    print("📊 LOAD TEST REPORT")
+    print(f"{'='*70}")
+    print(f"Offered trips:   {report['offered']}  (completed {report['completed']}, errors {len(report['errors'])})")
+    print(f"Throughput:      {report['throughput']:.2f} trips/s over {report['elapsed']:.1f}s")
+    print(f"Latency (s):     p50 {latency['p50']:.3f}  p95 {latency['p95']:.3f}  p99 {latency['p99']:.3f}  max {latency['max']:.3f}")
+    print(f"Approval RTT(s): n={rtt['count']}  p50 {rtt['p50']:.3f}  p95 {rtt['p95']:.3f}  p99 {rtt['p99']:.3f}"
+          f"  (includes {approval_delay:.2f}s simulated decision)")
+    print(f"\n{'t (s)':>8} {'memory MB':>10} {'sessions':>9} {'events':>8}")
+    for elapsed, memory, sessions, events in report["memory"]:
+        print(f"{elapsed:>8.1f} {memory / 1e6:>10.1f} {sessions:>9} {events:>8}")
+    first, last = report["memory"][0], report["memory"][-1]
+    if last[2] > first[2]:
+        growth = (last[1] - first[1]) / (last[2] - first[2])
+        print(f"\nMemory growth: {growth / 1024:.1f} KiB per retained session")
+    print_model_tiers()
+    for error in report["errors"][:5]:
+        print(f"❌ {error}")
+
+
+def print_model_tiers():
+    """Print per-tier model latency, hedging, deadline fallbacks and stage timeouts."""
+    from config import MODEL_TIERS
+    from utils.metrics import metrics, summarize_latencies
+
+    print(f"\n{'tier':>10} {'calls':>7} {'p50 s':>7} {'p95 s':>7} {'p99 s':>7}"
+          f" {'hedges':>7} {'hedge wins':>11} {'deadline miss':>14} {'fallbacks':>10}")
+    for tier in MODEL_TIERS:
+        summary = summarize_latencies(metrics.samples("model.latency", tier=tier))
+        if not summary["count"]:
+            continue
+        print(f"{tier:>10} {summary['count']:>7} {summary['p50']:>7.3f} {summary['p95']:>7.3f} {summary['p99']:>7.3f}"
+              f" {metrics.count('model.hedge', tier=tier):>7} {metrics.count('model.hedge_won', tier=tier):>11}"
+              f" {metrics.count('model.deadline_exceeded', tier=tier):>14} {metrics.count('model.fallback', tier=tier):>10}")
+    print(f"\nStage timeouts: {metrics.count('stage.timeout')}"
+          f"  (served from cache: {metrics.count('stage.cache_fallback')})")
+
+
+async def main(args):
+    if args.trace_memory:
+        tracemalloc.start()
+    target = ServiceTarget() if args.target == "service" else InProcessTarget()
+    if args.target == "service":
+        await target.server.start()
+    report = await run_load(
+        target, args.rate, args.duration, args.luxury_share,
+        args.approval_delay, args.sample_interval, args.seed
+    )
+    if args.target == "service":
+        await target.server.shutdown(drain_timeout=5.0)
+    print_report(report, args.approval_delay)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rate", type=float, default=10.0, help="Mean arrivals per second")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds of arrivals")
+    parser.add_argument("--luxury-share", type=float, default=0.3, help="Fraction of luxury (approval) trips")
+    parser.add_argument("--approval-delay", type=float, default=0.2, help="Simulated human decision time")
+    parser.add_argument("--latency", type=float, help="Mean simulated model latency in seconds")
+    parser.add_argument("--latency-sigma", type=float, help="Lognormal spread of simulated latency")
+    parser.add_argument("--target", choices=["inprocess", "service"], default="inprocess")
+    parser.add_argument("--sample-interval", type=float, default=2.0)
+    parser.add_argument("--trace-memory", action="store_true", help="Measure heap with tracemalloc instead of RSS")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    if args.latency is not None:
+        os.environ["VERTEX_VOYAGES_SIMULATED_LATENCY"] = str(args.latency)
+    if args.latency_sigma is not None:
+        os.environ["VERTEX_VOYAGES_SIMULATED_SIGMA"] = str(args.latency_sigma)
+    asyncio.run(main(args))
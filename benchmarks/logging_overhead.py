@@ -0,0 +1,97 @@
+"""Per-event cost of reporting agent responses: print() versus queued logging.
+
+Feeds the same synthetic agent events through the old synchronous print()
+path and through print_agent_response in text, JSON and quiet mode, all
+writing to the same file. Each written line can be delayed to mimic a
+terminal or log pipe that is not keeping up. "caller" is the time the
+event loop spends per event; "total" includes the listener thread writing
+out the queue.
+
+    python benchmarks/logging_overhead.py --events 5000 --write-latency 200
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class SlowStream:
+    """File wrapper that stalls for latency seconds on every line written."""
+
+    def __init__(self, stream, latency):
+        self.stream = stream
+        self.latency = latency
+
+    def write(self, text):
+        if self.latency and "\n" in text:
+            time.sleep(self.latency)
+        return self.stream.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+
+def make_events(count, chars):
+    text = ("Day 1: Sultanahmet walking tour, Hagia Sophia and the Basilica Cistern. " * 20)[:chars]
+    return [
+        SimpleNamespace(author="VertexVoyagesCoordinator", content=SimpleNamespace(parts=[SimpleNamespace(text=text)]))
+        for _ in range(count)
+    ]
+
+
+def print_responses(events, stream):
+    """The previous print_agent_response, kept for comparison."""
+    for event in events:
+        if event.content and event.content.parts:
+            for part in event.content.parts:
+                if part.text:
+                    print(f"🤖 Agent: {part.text}", file=stream)
+
+
+def measure(mode, events, path, latency):
+    from utils.helpers import print_agent_response
+    from utils.structured_log import configure_logging, log_context, stop_logging
+
+    with open(path, "w", encoding="utf-8") as target:
+        stream = SlowStream(target, latency)
+        if mode == "print":
+            started = time.perf_counter()
+            for event in events:
+                print_responses([event], stream)
+            caller = time.perf_counter() - started
+            stream.flush()
+            return caller, time.perf_counter() - started
+
+        configure_logging(fmt="json" if mode == "json" else "text", quiet=mode == "quiet", stream=stream)
+        with log_context(trip_id="trip_bench", session_id="trip_bench"):
+            started = time.perf_counter()
+            for event in events:
+                print_agent_response([event])
+            caller = time.perf_counter() - started
+        stop_logging()
+        stream.flush()
+        return caller, time.perf_counter() - started
+
+
+def main(count, chars, latency):
+    events = make_events(count, chars)
+    path = os.path.join(tempfile.mkdtemp(prefix="vv_logging_"), "out.log")
+    print(f"{count} events of {chars} chars, {latency * 1e6:.0f} µs per line written -> {path}")
+    print(f"{'mode':>6} {'caller µs/event':>16} {'total µs/event':>15}")
+    for mode in ("print", "text", "json", "quiet"):
+        caller, total = measure(mode, events, path, latency)
+        print(f"{mode:>6} {caller / count * 1e6:>16.2f} {total / count * 1e6:>15.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=5000, help="Number of agent events")
+    parser.add_argument("--chars", type=int, default=600, help="Text length of each event")
+    parser.add_argument("--write-latency", type=float, default=200, help="Stall per written line (µs); 0 for a fast file")
+    args = parser.parse_args()
+    main(args.events, args.chars, args.write_latency / 1e6)
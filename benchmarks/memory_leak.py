@@ -0,0 +1,119 @@
+"""Heap growth over thousands of trips, with and without session retention.
+
+Plans --trips mock trips in one process through main.plan_trip (simulated
+model, local search, no latency), --concurrency at a time, the way a
+long-running worker does. After a warm-up the traced heap is sampled at
+intervals. With retention, finished sessions are evicted and the heap
+levels off; with --no-retention every session stays and the heap grows
+with the trip count. Exits with status 1 if the heap grew past
+--ceiling-mb after warm-up, and lists the source lines that grew most.
+
+    python benchmarks/memory_leak.py --trips 10000 --ceiling-mb 48
+"""
+
+import argparse
+import asyncio
+import contextlib
+import gc
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("VERTEX_VOYAGES_MODEL_BACKEND", "simulated")
+os.environ["VERTEX_VOYAGES_SIMULATED_LATENCY"] = "0"
+os.environ["VERTEX_VOYAGES_LOG_QUIET"] = "1"
+os.environ.setdefault("VERTEX_VOYAGES_SEARCH_BACKEND", "local")
+_scratch = tempfile.mkdtemp(prefix="vv_memory_")
+os.environ["VERTEX_VOYAGES_CHECKPOINT_DIR"] = os.path.join(_scratch, "checkpoints")
+os.environ["VERTEX_VOYAGES_ARCHIVE_DIR"] = os.path.join(_scratch, "archive")
+os.environ["VERTEX_VOYAGES_SEARCH_CACHE"] = os.path.join(_scratch, "search.sqlite")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+TRIPS = [
+    ("Paris, France", "2026-05-01 to 2026-05-05", 4, "mid-range"),
+    ("Tokyo, Japan", "2026-04-02 to 2026-04-09", 7, "luxury"),
+    ("Istanbul, Turkey", "2026-09-01 to 2026-09-04", 3, "budget"),
+    ("Kyoto, Japan", "2026-11-10 to 2026-11-15", 5, "mid-range"),
+]
+
+
+def traced_mb() -> float:
+    import tracemalloc
+
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0] / 2**20
+
+
+async def run(trips, concurrency, warmup, samples):
+    from main import plan_trip, session_service
+    from utils.memory import memory_profiler, session_memory
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(index):
+        destination, dates, days, level = TRIPS[index % len(TRIPS)]
+        async with semaphore:
+            await plan_trip("Plan a trip.", destination, dates, days, 2, level)
+
+    async def batch(start, stop):
+        await asyncio.gather(*(one(index) for index in range(start, stop)))
+
+    await batch(0, warmup)
+    baseline = traced_mb()
+    memory_profiler.snapshot(top=0)  # the final report is diffed against this
+    rows = [(warmup, baseline, session_memory(session_service, top=0)["sessions"], 0.0)]
+    started = time.perf_counter()
+    step = max(1, (trips - warmup) // samples)
+    done = warmup
+    while done < trips:
+        stop = min(trips, done + step)
+        await batch(done, stop)
+        done = stop
+        rows.append((done, traced_mb(), session_memory(session_service, top=0)["sessions"], time.perf_counter() - started))
+    return baseline, rows
+
+
+def main(args):
+    from main import session_retention
+    from utils.memory import memory_profiler
+
+    if args.no_retention:
+        session_retention.max_sessions = float("inf")
+        session_retention.ttl = float("inf")
+
+    memory_profiler.snapshot(top=0)  # starts tracing
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        baseline, rows = asyncio.run(run(args.trips, args.concurrency, min(args.warmup, args.trips), args.samples))
+    report = memory_profiler.snapshot(top=args.top)
+    memory_profiler.stop()
+
+    print(f"retention: {'off' if args.no_retention else session_retention.stats()}")
+    print(f"{'trips':>7} {'heap MB':>8} {'growth MB':>10} {'sessions':>9} {'trips/s':>8}")
+    for done, heap, sessions, elapsed in rows:
+        rate = (done - rows[0][0]) / elapsed if elapsed else 0.0
+        print(f"{done:>7} {heap:>8.1f} {heap - baseline:>10.1f} {sessions:>9} {rate:>8.1f}")
+
+    growth = rows[-1][1] - baseline
+    print("\nTop allocation growth since warm-up:")
+    for line in report["top"]:
+        print(f"  {line['bytes_diff'] / 1024:>9.1f} KiB  {line['where']}")
+
+    if growth > args.ceiling_mb:
+        print(f"\n❌ Heap grew {growth:.1f} MB after warm-up, over the {args.ceiling_mb:.0f} MB ceiling")
+        return 1
+    print(f"\n✅ Heap grew {growth:.1f} MB after warm-up, within the {args.ceiling_mb:.0f} MB ceiling")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--trips", type=int, default=10000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=500, help="Trips before the baseline is taken")
+    parser.add_argument("--samples", type=int, default=10, help="Heap samples after warm-up")
+    parser.add_argument("--ceiling-mb", type=float, default=48.0, help="Allowed heap growth after warm-up")
+    parser.add_argument("--no-retention", action="store_true", help="Keep every finished session")
+    parser.add_argument("--top", type=int, default=8, help="Source lines listed in the report")
+    sys.exit(main(parser.parse_args()))
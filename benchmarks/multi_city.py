@@ -0,0 +1,80 @@
+"""Latency of multi-city trips as the number of legs grows.
+
+Plans trips with 1..N legs against the simulated model and prints wall
+time per trip, showing how research fan-out keeps growth sublinear. A
+second pass over the same cities shows the per-city research cache. An
+untimed warm-up trip to a city outside the list runs first, so process
+start-up does not land on the 1-leg baseline.
+
+    python benchmarks/multi_city.py --max-legs 5 --latency 0.2
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+
+os.environ.setdefault("VERTEX_VOYAGES_MODEL_BACKEND", "simulated")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+CITIES = ["Tokyo, Japan", "Kyoto, Japan", "Osaka, Japan", "Bali, Indonesia", "Istanbul, Turkey", "Paris, France"]
+WARMUP_CITY = "Lisbon, Portugal"
+
+
+async def plan(runner, legs):
+    from config import APP_NAME, DEFAULT_USER_ID
+    from main import session_service, build_trip_legs, build_trip_query, initial_trip_state, run_trip
+
+    legs = build_trip_legs(legs, "2026-04-01 to 2026-04-15")
+    session_id = f"trip_{uuid.uuid4().hex[:8]}"
+    await session_service.create_session(
+        app_name=APP_NAME, user_id=DEFAULT_USER_ID, session_id=session_id,
+        state=initial_trip_state(2, legs)
+    )
+    query = build_trip_query(
+        "Plan a multi-city trip.",
+        " → ".join(leg["destination"] for leg in legs),
+        "2026-04-01 to 2026-04-15",
+        sum(leg["num_days"] for leg in legs),
+        2,
+        "mid-range",
+        legs
+    )
+
+    async def approve(approval_info):
+        return True
+
+    started = time.perf_counter()
+    async for _ in run_trip(runner, session_id, query, approve):
+        pass
+    return time.perf_counter() - started
+
+
+async def main(max_legs):
+    from main import create_runner
+    from agents.research_agents import leg_research_cache
+
+    runner = create_runner()
+    await plan(runner, [{"destination": WARMUP_CITY, "num_days": 2}])
+    print(f"{'legs':>5} {'cold s':>8} {'warm s':>8} {'cold / 1-leg':>13}")
+    single = None
+    for count in range(1, max_legs + 1):
+        legs = [{"destination": city, "num_days": 2} for city in CITIES[:count]]
+        leg_research_cache.clear()
+        cold = await plan(runner, legs)
+        warm = await plan(runner, legs)
+        single = single or cold
+        print(f"{count:>5} {cold:>8.2f} {warm:>8.2f} {cold / single:>13.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-legs", type=int, default=5)
+    parser.add_argument("--latency", type=float, help="Mean simulated model latency in seconds")
+    args = parser.parse_args()
+    if args.latency is not None:
+        os.environ["VERTEX_VOYAGES_SIMULATED_LATENCY"] = str(args.latency)
+    asyncio.run(main(min(args.max_legs, len(CITIES))))
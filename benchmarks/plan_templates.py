@@ -0,0 +1,90 @@
+"""Latency of catalogue trips planned in full vs from precomputed plan templates.
+
+Builds a plan template index in a temporary file with the simulated
+model, then plans the same catalogue trips --trips times each way: through
+the full coordinator pipeline, and from their template, where only
+PlanPersonalizer calls the model. Reports p50/p95 latency and model calls
+per trip.
+
+    python benchmarks/plan_templates.py --latency 0.2 --trips 20
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+os.environ.setdefault("VERTEX_VOYAGES_MODEL_BACKEND", "simulated")
+os.environ.setdefault("VERTEX_VOYAGES_SEARCH_BACKEND", "local")
+_scratch = tempfile.mkdtemp(prefix="vv_templates_")
+os.environ["VERTEX_VOYAGES_PLAN_TEMPLATES_FILE"] = os.path.join(_scratch, "plan_templates.bin")
+os.environ["VERTEX_VOYAGES_CHECKPOINT_DIR"] = os.path.join(_scratch, "checkpoints")
+os.environ["VERTEX_VOYAGES_ARCHIVE_DIR"] = os.path.join(_scratch, "archive")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+TRIPS = [
+    ("Paris, France", "2026-05-01 to 2026-05-05", 4, "mid-range"),
+    ("Tokyo, Japan", "2026-04-02 to 2026-04-09", 7, "luxury"),
+    ("Istanbul, Turkey", "2026-09-01 to 2026-09-04", 3, "budget"),
+    ("Bali, Indonesia", "2026-07-10 to 2026-07-16", 6, "mid-range"),
+]
+
+
+async def plan(runner, trip, template: bool) -> float:
+    from config import APP_NAME, DEFAULT_USER_ID
+    from main import session_service, build_trip_query, initial_trip_state, run_trip
+    from tools.plan_templates import template_trip_state
+
+    destination, dates, days, level = trip
+    state = initial_trip_state(2)
+    if template:
+        state.update(template_trip_state(destination, dates, days, 2, level))
+    session_id = f"bench_{uuid.uuid4().hex[:8]}"
+    await session_service.create_session(app_name=APP_NAME, user_id=DEFAULT_USER_ID, session_id=session_id, state=state)
+
+    async def approve(approval_info):
+        return True
+
+    started = time.perf_counter()
+    async for _ in run_trip(runner, session_id, build_trip_query("Plan a trip.", destination, dates, days, 2, level), approve):
+        pass
+    elapsed = time.perf_counter() - started
+    await session_service.delete_session(app_name=APP_NAME, user_id=DEFAULT_USER_ID, session_id=session_id)
+    return elapsed
+
+
+async def main(trips):
+    from agents.templates import precompute_plan_templates
+    from main import create_runner, create_template_runner
+    from tools.plan_templates import plan_templates
+    from utils.metrics import metrics, percentile
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        built = await precompute_plan_templates(year=2026)
+    plan_templates.reload()
+    print(f"Built {built} plan templates\n")
+
+    print(f"{'mode':<10} {'p50 (s)':>8} {'p95 (s)':>8} {'calls/trip':>11}")
+    for mode, runner in (("full", create_runner()), ("template", create_template_runner())):
+        metrics.reset()
+        timings = []
+        with contextlib.redirect_stdout(io.StringIO()):
+            for index in range(trips):
+                timings.append(await plan(runner, TRIPS[index % len(TRIPS)], mode == "template"))
+        calls = len(metrics.samples("model.latency"))
+        print(f"{mode:<10} {percentile(timings, 50):>8.2f} {percentile(timings, 95):>8.2f} {calls / trips:>11.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.2, help="Mean simulated model latency (seconds)")
+    parser.add_argument("--trips", type=int, default=20, help="Trips planned each way")
+    args = parser.parse_args()
+    os.environ["VERTEX_VOYAGES_SIMULATED_LATENCY"] = str(args.latency)
+    asyncio.run(main(args.trips))
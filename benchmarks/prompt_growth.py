@@ -0,0 +1,63 @@
+"""Coordinator prompt size per turn, with and without event compaction.
+
+Plans the same trip twice against the simulated model, whose answers are
+padded to a realistic length, and prints the prompt tokens the
+coordinator sends on each turn. Without compaction every stage report is
+resent on every later turn; with it only their summaries are.
+
+    python benchmarks/prompt_growth.py --response-chars 2000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import uuid
+
+os.environ.setdefault("VERTEX_VOYAGES_MODEL_BACKEND", "simulated")
+os.environ.setdefault("VERTEX_VOYAGES_SIMULATED_LATENCY", "0")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+async def coordinator_prompts(compaction):
+    from config import APP_NAME, DEFAULT_USER_ID
+    from main import session_service, create_runner, build_trip_query, initial_trip_state, run_trip
+
+    runner = create_runner(compaction=compaction)
+    session_id = f"trip_{uuid.uuid4().hex[:8]}"
+    await session_service.create_session(
+        app_name=APP_NAME, user_id=DEFAULT_USER_ID, session_id=session_id,
+        state=initial_trip_state(2)
+    )
+    query = build_trip_query(
+        "Plan a week in Istanbul.", "Istanbul, Turkey", "2026-05-01 to 2026-05-08", 7, 2, "mid-range"
+    )
+
+    async def approve(approval_info):
+        return True
+
+    prompts = []
+    async for event in run_trip(runner, session_id, query, approve):
+        if event.author == "VertexVoyagesCoordinator" and event.usage_metadata:
+            prompts.append(event.usage_metadata.prompt_token_count or 0)
+    return prompts
+
+
+async def main():
+    without = await coordinator_prompts(compaction=False)
+    with_compaction = await coordinator_prompts(compaction=True)
+
+    print(f"{'turn':>5} {'no compaction':>14} {'compaction':>11}")
+    for turn in range(max(len(without), len(with_compaction))):
+        before = without[turn] if turn < len(without) else ""
+        after = with_compaction[turn] if turn < len(with_compaction) else ""
+        print(f"{turn + 1:>5} {before:>14} {after:>11}")
+    print(f"{'total':>5} {sum(without):>14} {sum(with_compaction):>11}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--response-chars", type=int, default=2000, help="Length of each simulated answer")
+    args = parser.parse_args()
+    os.environ["VERTEX_VOYAGES_SIMULATED_RESPONSE_CHARS"] = str(args.response_chars)
+    asyncio.run(main())
@@ -0,0 +1,91 @@
+"""Time to finish an interrupted trip, by how far it got before the crash.
+
+Starts a trip against the simulated model, cancels it as soon as k stages
+are checkpointed (standing in for a killed worker), then times
+main.resume_trip. Stages already checkpointed answer from the checkpoint,
+so recovery time falls as k grows instead of staying at a full replan.
+
+    python benchmarks/resume.py --latency 0.2
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+os.environ.setdefault("VERTEX_VOYAGES_MODEL_BACKEND", "simulated")
+os.environ.setdefault("VERTEX_VOYAGES_CHECKPOINT_DIR", tempfile.mkdtemp(prefix="vv_checkpoints_"))
+os.environ.setdefault("VERTEX_VOYAGES_ARCHIVE_DIR", tempfile.mkdtemp(prefix="vv_archive_"))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+# Checkpointed stage counts to interrupt at. There is no 4: the last
+# researcher and ResearchTeam are checkpointed together, so waiting for 4
+# stops at 5 and would repeat the 5 row.
+INTERRUPTION_POINTS = [0, 1, 2, 3, 5, 6, 7]
+
+TRIP = {
+    "user_query": "Plan a week in Istanbul.",
+    "destination": "Istanbul, Turkey",
+    "travel_dates": "2026-05-01 to 2026-05-08",
+    "num_days": 7,
+    "num_travelers": 2,
+    "accommodation_level": "mid-range",
+    "legs": None,
+    "currency": "USD",
+}
+
+
+async def interrupt_after(runner, stages):
+    """Start a trip and cancel it once `stages` stages are checkpointed."""
+    from config import APP_NAME, DEFAULT_USER_ID
+    from main import session_service, checkpoint_store, build_trip_query, initial_trip_state, run_trip
+
+    session_id = f"trip_{uuid.uuid4().hex[:8]}"
+    await session_service.create_session(
+        app_name=APP_NAME, user_id=DEFAULT_USER_ID, session_id=session_id,
+        state=initial_trip_state(2, trip_id=session_id)
+    )
+    checkpoint_store.start(session_id, DEFAULT_USER_ID, TRIP)
+
+    async def approve(approval_info):
+        return True
+
+    async def run():
+        async for _ in run_trip(runner, session_id, build_trip_query(**TRIP), approve):
+            pass
+
+    task = asyncio.create_task(run())
+    while not task.done() and len(checkpoint_store.load(session_id)["stages"]) < stages:
+        await asyncio.sleep(0.005)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    return session_id, list(checkpoint_store.load(session_id)["stages"])
+
+
+async def main(max_stages):
+    from main import create_runner, resume_trip
+
+    runner = create_runner()
+    print(f"{'checkpointed':>12} {'resume (s)':>11}  stages")
+    for stages in [point for point in INTERRUPTION_POINTS if point <= max_stages]:
+        session_id, done = await interrupt_after(runner, stages)
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            await resume_trip(session_id)
+        elapsed = time.perf_counter() - started
+        print(f"{len(done):>12} {elapsed:>11.2f}  {', '.join(done)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.2, help="Mean simulated model latency (seconds)")
+    parser.add_argument("--max-stages", type=int, default=7, help="Interrupt after up to this many stages")
+    args = parser.parse_args()
+    os.environ["VERTEX_VOYAGES_SIMULATED_LATENCY"] = str(args.latency)
+    asyncio.run(main(args.max_stages))
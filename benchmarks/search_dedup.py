@@ -0,0 +1,81 @@
+"""Research searches per trip with the dedup and cache layer.
+
+Plans a batch of trips over a few cities against the simulated model and
+the local search backend, with a fresh search cache, and prints how many
+searches each trip asked for against how many reached the backend. The
+first trips to a city pay for its searches; later ones are served from
+cache, and identical searches running at the same time are shared.
+
+    python benchmarks/search_dedup.py --trips 12 --concurrency 4
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import uuid
+
+os.environ.setdefault("VERTEX_VOYAGES_MODEL_BACKEND", "simulated")
+os.environ.setdefault("VERTEX_VOYAGES_SIMULATED_LATENCY", "0.01")
+os.environ["VERTEX_VOYAGES_SEARCH_BACKEND"] = "local"
+os.environ["VERTEX_VOYAGES_SEARCH_CACHE"] = os.path.join(tempfile.mkdtemp(prefix="vv_search_"), "cache.sqlite")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+TRIPS = [
+    ("Paris, France", "2026-05-01 to 2026-05-05"),
+    ("Tokyo, Japan", "2026-04-02 to 2026-04-06"),
+    ("Kyoto, Japan", "2026-11-10 to 2026-11-14"),
+    ("Istanbul, Turkey", "2026-09-01 to 2026-09-05"),
+]
+
+
+async def plan(runner, destination, dates):
+    from config import APP_NAME, DEFAULT_USER_ID
+    from main import session_service, build_trip_query, initial_trip_state, run_trip
+    from tools.search import trip_search_stats
+
+    session_id = f"trip_{uuid.uuid4().hex[:8]}"
+    await session_service.create_session(
+        app_name=APP_NAME, user_id=DEFAULT_USER_ID, session_id=session_id,
+        state=initial_trip_state(2, trip_id=session_id)
+    )
+    query = build_trip_query("Plan a short city break.", destination, dates, 4, 2, "mid-range")
+
+    async def approve(approval_info):
+        return True
+
+    async for _ in run_trip(runner, session_id, query, approve):
+        pass
+    return destination, trip_search_stats(session_id)
+
+
+async def main(trips, concurrency):
+    from main import create_runner
+    from tools.search import get_search_service
+
+    runner = create_runner(checkpoints=False)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded(index):
+        async with semaphore:
+            return await plan(runner, *TRIPS[index % len(TRIPS)])
+
+    results = await asyncio.gather(*(bounded(index) for index in range(trips)))
+
+    print(f"{'trip':>4} {'destination':<18} {'requested':>9} {'unique':>6} {'backend':>7} {'cache':>5} {'shared':>6}")
+    for index, (destination, stats) in enumerate(results, 1):
+        print(f"{index:>4} {destination:<18} {stats['requested']:>9} {stats['unique']:>6} "
+              f"{stats['backend']:>7} {stats['cache']:>5} {stats['shared']:>6}")
+    requested = sum(stats["requested"] for _, stats in results)
+    print(f"\n{requested} searches requested, {get_search_service().backend.calls} sent to the backend "
+          f"({requested / trips:.1f} vs {get_search_service().backend.calls / trips:.2f} per trip)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--trips", type=int, default=12)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+    asyncio.run(main(args.trips, args.concurrency))
@@ -0,0 +1,51 @@
+"""Throughput of the seasonality index batch API.
+
+Scores random (destination, date range) pairs with
+SeasonalityIndex.score_batch and reports pairs scored per millisecond,
+then ranks alternative dates for one off-season trip.
+
+    python benchmarks/seasonality.py --pairs 200000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+DESTINATIONS = ["Tokyo, Japan", "Bali, Indonesia", "Paris, France", "New York, USA", "Istanbul, Turkey", "Lima, Peru"]
+
+
+def main(count, seed):
+    from tools.destination_validator import season_index
+
+    rng = random.Random(seed)
+    date_ranges = [
+        f"2026-{month:02d}-{day:02d} to 2026-{month:02d}-{day + 6:02d}"
+        for month in range(1, 13)
+        for day in range(1, 22)
+    ]
+    pairs = [(rng.choice(DESTINATIONS), rng.choice(date_ranges)) for _ in range(count)]
+
+    started = time.perf_counter()
+    season_index.score_batch(pairs)
+    cold = time.perf_counter() - started
+    started = time.perf_counter()
+    season_index.score_batch(pairs)
+    warm = time.perf_counter() - started
+    print(f"Scored {count} pairs: {count / cold / 1000:.0f}/ms cold, {count / warm / 1000:.0f}/ms warm")
+
+    print("\nBetter dates for Tokyo, 2026-08-20 to 2026-09-05:")
+    for option in season_index.rank_alternative_dates("Tokyo, Japan", "2026-08-20 to 2026-09-05"):
+        print(f"  {option['travel_dates']}  score {option['score']:+.2f} ({option['suitability']})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pairs", type=int, default=200000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    main(args.pairs, args.seed)
@@ -0,0 +1,133 @@
+"""Concurrency load test for the planning service.
+
+Starts the HTTP service in-process with the simulated model, then runs
+increasing numbers of concurrent trips end to end (POST /trips, follow the
+SSE stream, answer approvals) and reports how many one process sustains.
+
+    python benchmarks/service_load.py --levels 10 50 100 200 --latency 0.05
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault("VERTEX_VOYAGES_MODEL_BACKEND", "simulated")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+TRIP = {
+    "user_query": "Plan a luxury getaway to Paris.",
+    "destination": "Paris, France",
+    "travel_dates": "2026-09-01 to 2026-09-04",
+    "num_days": 3,
+    "num_travelers": 2,
+    "accommodation_level": "luxury",
+}
+
+
+async def http_request(host, port, method, path, payload=None, client_id="load"):
+    """Send one request and return (status, decoded JSON body)."""
+    reader, writer = await asyncio.open_connection(host, port)
+    body = json.dumps(payload).encode() if payload is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nX-Client-Id: {client_id}\r\n"
+        # Each client plans and approves its own trips
+        f"X-User-Id: {client_id}\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    head, _, data = raw.partition(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    return status, json.loads(data or b"{}")
+
+
+async def follow_trip(host, port, trip_id, client_id, approve=True, approval_delay=0.0):
+    """Read the SSE stream until the trip ends, answering approval requests.
+
+    Returns:
+        (outcome event type, perf_counter time the approval was requested or None)
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(
+        f"GET /trips/{trip_id}/events HTTP/1.1\r\nHost: {host}\r\n"
+        f"X-Client-Id: {client_id}\r\n\r\n".encode()
+    )
+    await writer.drain()
+    outcome = "disconnected"
+    event_type = None
+    approval_at = None
+    async for line in reader:
+        line = line.decode().rstrip("\n")
+        if line.startswith("event: "):
+            event_type = line[len("event: "):]
+        elif line.startswith("data: "):
+            if event_type == "approval.required":
+                approval_at = time.perf_counter()
+                await asyncio.sleep(approval_delay)
+                await http_request(host, port, "POST", f"/trips/{trip_id}/approval",
+                                   {"approved": approve}, client_id)
+            elif event_type in ("trip.completed", "trip.failed"):
+                outcome = event_type
+    writer.close()
+    return outcome, approval_at
+
+
+async def run_traveler(host, port, client_id):
+    """Plan one trip through the HTTP API and return (ok, seconds)."""
+    started = time.perf_counter()
+    while True:
+        status, payload = await http_request(host, port, "POST", "/trips", TRIP, client_id)
+        if status not in (429, 503):
+            break
+        await asyncio.sleep(0.05)
+    if status != 202:
+        return False, time.perf_counter() - started
+    outcome, _ = await follow_trip(host, port, payload["trip_id"], client_id)
+    return outcome == "trip.completed", time.perf_counter() - started
+
+
+async def main(levels, slo_factor):
+    from service.http import PlanningServer
+    from service.trips import TripManager
+    from utils.metrics import percentile
+
+    server = PlanningServer(TripManager(max_active_trips=max(levels)), host="127.0.0.1", port=0)
+    await server.start()
+
+    print(f"{'concurrent':>10} {'ok':>5} {'failed':>6} {'trips/s':>8} {'p50 s':>7} {'p95 s':>7}")
+    baseline = None
+    sustained = 0
+    for level in levels:
+        started = time.perf_counter()
+        results = await asyncio.gather(*(
+            run_traveler(server.host, server.port, f"client-{i}") for i in range(level)
+        ))
+        elapsed = time.perf_counter() - started
+        latencies = [seconds for ok, seconds in results if ok]
+        failures = sum(1 for ok, _ in results if not ok)
+        p50, p95 = statistics.median(latencies) if latencies else 0.0, percentile(latencies, 95)
+        print(f"{level:>10} {len(latencies):>5} {failures:>6} {len(latencies) / elapsed:>8.1f} {p50:>7.2f} {p95:>7.2f}")
+
+        baseline = baseline or p50
+        if failures == 0 and p95 <= slo_factor * baseline:
+            sustained = level
+
+    await server.shutdown(drain_timeout=5.0)
+    print(f"\n✅ Sustained concurrency: {sustained} trips (p95 within {slo_factor}x of the lightest level's p50)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 10, 50, 100, 200])
+    parser.add_argument("--latency", type=float, help="Mean simulated model latency in seconds")
+    parser.add_argument("--slo-factor", type=float, default=3.0)
+    args = parser.parse_args()
+    if args.latency is not None:
+        os.environ["VERTEX_VOYAGES_SIMULATED_LATENCY"] = str(args.latency)
+    asyncio.run(main(args.levels, args.slo_factor))
@@ -0,0 +1,88 @@
+"""Session listing with every trip under one user vs partitioned by user.
+
+Fills an InMemorySessionService with --sessions trip sessions (state the
+size of a finished trip's), either all under DEFAULT_USER_ID or spread
+over --users users, and times listing one user's sessions and finding a
+trip's owner through the SessionDirectory. With one shared user every
+listing copies every session; partitioned, it copies only that user's.
+
+    python benchmarks/session_partitioning.py --sessions 5000 --users 500
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def trip_state(index: int) -> dict:
+    """State of about the size a finished trip leaves behind."""
+    return {
+        "trip_id": f"trip_{index:06d}",
+        "num_travelers": 2,
+        "currency": "USD",
+        "destination_research": "Top attractions. " * 60,
+        "activity_research": "Recommended activities. " * 60,
+        "weather_research": "Weather notes. " * 40,
+        "itinerary_draft": "**Day 1:** sights\n" * 7,
+        "budget_breakdown": {"accommodation": 700.0, "food": 350.0, "activities": 210.0, "total": 1400.0},
+    }
+
+
+async def fill(session_service, sessions: int, users: int) -> tuple:
+    from config import APP_NAME
+    from utils.users import SessionDirectory
+
+    directory = SessionDirectory()
+    owners = []
+    for index in range(sessions):
+        user_id = f"user_{index % users:05d}"
+        session_id = f"trip_{index:06d}"
+        await session_service.create_session(
+            app_name=APP_NAME, user_id=user_id, session_id=session_id, state=trip_state(index)
+        )
+        directory.register(session_id, user_id)
+        owners.append((session_id, user_id))
+    return directory, owners
+
+
+async def measure(sessions: int, users: int, lookups: int) -> dict:
+    from google.adk.sessions import InMemorySessionService
+    from config import APP_NAME
+
+    session_service = InMemorySessionService()
+    directory, owners = await fill(session_service, sessions, users)
+
+    started = time.perf_counter()
+    for index in range(lookups):
+        _, user_id = owners[index * 7919 % len(owners)]
+        await session_service.list_sessions(app_name=APP_NAME, user_id=user_id)
+    listing = (time.perf_counter() - started) / lookups
+
+    started = time.perf_counter()
+    for index in range(lookups):
+        session_id, _ = owners[index * 7919 % len(owners)]
+        user_id, _ = directory.owner(session_id)
+        await session_service.get_session(app_name=APP_NAME, user_id=user_id, session_id=session_id)
+    lookup = (time.perf_counter() - started) / lookups
+    return {"list_ms": listing * 1000, "lookup_ms": lookup * 1000}
+
+
+async def main(sessions: int, users: int, lookups: int):
+    print(f"{sessions} sessions, {lookups} lookups each\n")
+    print(f"{'partition':<18} {'list user (ms)':>15} {'find + get (ms)':>16}")
+    for label, count in (("one user", 1), (f"{users} users", users)):
+        result = await measure(sessions, count, lookups)
+        print(f"{label:<18} {result['list_ms']:>15.3f} {result['lookup_ms']:>16.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=5000, help="Retained trip sessions")
+    parser.add_argument("--users", type=int, default=500, help="Users the sessions are spread over")
+    parser.add_argument("--lookups", type=int, default=200, help="Listings and lookups timed")
+    args = parser.parse_args()
+    asyncio.run(main(args.sessions, args.users, args.lookups))
@@ -6,8 +6,72 @@ from .settings import (
     RETRY_CONFIG,
     APPROVAL_THRESHOLD,
     DEFAULT_USER_ID,
-    APP_NAME
+    APP_NAME,
+    USER_MEMORY_ENABLED,
+    USER_MEMORY_TRIPS,
+    USER_MEMORY_CACHE_SIZE,
+    USER_RESEARCH_TTL,
+    DEFAULT_TRIP_PREFERENCES,
+    MODEL_BACKEND,
+    SIMULATED_MODEL_NAME,
+    SIMULATED_LATENCY_MEAN,
+    SIMULATED_LATENCY_SIGMA,
+    SIMULATED_RESPONSE_CHARS,
+    MODEL_RECORDING,
+    SERVICE_HOST,
+    SERVICE_PORT,
+    SERVICE_MAX_ACTIVE_TRIPS,
+    SERVICE_MAX_TRIPS_PER_CLIENT,
+    SERVICE_EVENT_QUEUE_SIZE,
+    SERVICE_SEND_TIMEOUT,
+    SERVICE_DRAIN_TIMEOUT,
+    APPROVAL_TIMEOUT,
+    LOG_FORMAT,
+    LOG_LEVEL,
+    LOG_QUIET,
+    MODEL_TIERS,
+    SIMULATED_TIER_LATENCY_FACTOR,
+    AGENT_MODEL_CONFIG_FILE,
+    DEFAULT_AGENT_MODEL_CONFIG,
+    HEDGE_MIN_SAMPLES,
+    PLAN_TEMPLATES_ENABLED,
+    TEMPLATE_MAX_DAYS,
+    TEMPLATE_MAX_AGE_DAYS,
+    RESEARCH_CACHE_TTL,
+    RESEARCH_CACHE_SIZE,
+    RESEARCH_OUTPUT_KEYS,
+    RESEARCH_MAX_CONCURRENT_LEGS,
+    DATA_DIR,
+    POI_DATA_FILE,
+    BASE_CURRENCY,
+    EXCHANGE_RATES_SOURCE,
+    EXCHANGE_RATES_FILE,
+    RATE_CHECK_INTERVAL,
+    COMPACTION_ENABLED,
+    COMPACTION_MIN_CHARS,
+    COMPACTION_SUMMARY_CHARS,
+    COMPACTION_ARCHIVE_DIR,
+    COMPACTION_ARCHIVE_SESSIONS,
+    CHECKPOINT_ENABLED,
+    CHECKPOINT_DIR,
+    USER_MEMORY_DIR,
+    PLAN_TEMPLATES_FILE,
+    EVAL_DIR,
+    EVAL_CORPUS_FILE,
+    EVAL_RECORDINGS_DIR,
+    EVAL_BASELINE_FILE,
+    SESSION_RETENTION_MAX,
+    SESSION_RETENTION_TTL,
+    TRACEMALLOC_FRAMES,
+    APPROVAL_POLICY_FILE,
+    SEARCH_BACKEND,
+    GOOGLE_CSE_ID,
+    SEARCH_CACHE_FILE,
+    SEARCH_CACHE_TTL,
+    SEARCH_WEATHER_TTL,
+    SEARCH_MAX_RESULTS
 )
+from .agent_models import load_agent_model_config, get_agent_model_config
 
 __all__ = [
     "GOOGLE_API_KEY",
@@ -15,5 +79,70 @@ __all__ = [
     "RETRY_CONFIG",
     "APPROVAL_THRESHOLD",
     "DEFAULT_USER_ID",
-    "APP_NAME"
+    "APP_NAME",
+    "USER_MEMORY_ENABLED",
+    "USER_MEMORY_TRIPS",
+    "USER_MEMORY_CACHE_SIZE",
+    "USER_RESEARCH_TTL",
+    "DEFAULT_TRIP_PREFERENCES",
+    "MODEL_BACKEND",
+    "SIMULATED_MODEL_NAME",
+    "SIMULATED_LATENCY_MEAN",
+    "SIMULATED_LATENCY_SIGMA",
+    "SIMULATED_RESPONSE_CHARS",
+    "MODEL_RECORDING",
+    "SERVICE_HOST",
+    "SERVICE_PORT",
+    "SERVICE_MAX_ACTIVE_TRIPS",
+    "SERVICE_MAX_TRIPS_PER_CLIENT",
+    "SERVICE_EVENT_QUEUE_SIZE",
+    "SERVICE_SEND_TIMEOUT",
+    "SERVICE_DRAIN_TIMEOUT",
+    "APPROVAL_TIMEOUT",
+    "LOG_FORMAT",
+    "LOG_LEVEL",
+    "LOG_QUIET",
+    "MODEL_TIERS",
+    "SIMULATED_TIER_LATENCY_FACTOR",
+    "AGENT_MODEL_CONFIG_FILE",
+    "DEFAULT_AGENT_MODEL_CONFIG",
+    "HEDGE_MIN_SAMPLES",
+    "PLAN_TEMPLATES_ENABLED",
+    "TEMPLATE_MAX_DAYS",
+    "TEMPLATE_MAX_AGE_DAYS",
+    "RESEARCH_CACHE_TTL",
+    "RESEARCH_CACHE_SIZE",
+    "RESEARCH_OUTPUT_KEYS",
+    "RESEARCH_MAX_CONCURRENT_LEGS",
+    "DATA_DIR",
+    "POI_DATA_FILE",
+    "BASE_CURRENCY",
+    "EXCHANGE_RATES_SOURCE",
+    "EXCHANGE_RATES_FILE",
+    "RATE_CHECK_INTERVAL",
+    "COMPACTION_ENABLED",
+    "COMPACTION_MIN_CHARS",
+    "COMPACTION_SUMMARY_CHARS",
+    "COMPACTION_ARCHIVE_DIR",
+    "COMPACTION_ARCHIVE_SESSIONS",
+    "CHECKPOINT_ENABLED",
+    "CHECKPOINT_DIR",
+    "USER_MEMORY_DIR",
+    "PLAN_TEMPLATES_FILE",
+    "EVAL_DIR",
+    "EVAL_CORPUS_FILE",
+    "EVAL_RECORDINGS_DIR",
+    "EVAL_BASELINE_FILE",
+    "SESSION_RETENTION_MAX",
+    "SESSION_RETENTION_TTL",
+    "TRACEMALLOC_FRAMES",
+    "APPROVAL_POLICY_FILE",
+    "SEARCH_BACKEND",
+    "GOOGLE_CSE_ID",
+    "SEARCH_CACHE_FILE",
+    "SEARCH_CACHE_TTL",
+    "SEARCH_WEATHER_TTL",
+    "SEARCH_MAX_RESULTS",
+    "load_agent_model_config",
+    "get_agent_model_config"
 ]
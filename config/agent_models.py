@@ -0,0 +1,57 @@
+"""Per-agent model configuration."""
+
+import json
+from functools import lru_cache
+
+from .settings import AGENT_MODEL_CONFIG_FILE, DEFAULT_AGENT_MODEL_CONFIG, MODEL_TIERS
+
+
+_DEFAULTS = {
+    "tier": "fast",
+    "temperature": None,
+    "max_output_tokens": None,
+    "deadline": None,
+    "hedge_percentile": None,
+    "hedge_delay": None,
+    "hard_deadline": None,
+}
+
+
+@lru_cache(maxsize=None)
+def load_agent_model_config(path: str = AGENT_MODEL_CONFIG_FILE) -> dict:
+    """Merge the built-in per-agent settings with an optional JSON file.
+
+    The file maps agent names to partial settings, e.g.
+    {"ItineraryBuilder": {"tier": "pro", "deadline": 45}}. A "*" entry
+    supplies defaults for settings an agent does not define itself.
+
+    Args:
+        path: JSON override file, or None for the built-in settings only
+
+    Returns:
+        Dictionary of agent name to settings
+    """
+    config = {name: dict(settings) for name, settings in DEFAULT_AGENT_MODEL_CONFIG.items()}
+    if path:
+        with open(path) as config_file:
+            overrides = json.load(config_file)
+        for name, settings in overrides.items():
+            config.setdefault(name, {}).update(settings)
+    return config
+
+
+def get_agent_model_config(agent_name: str) -> dict:
+    """Resolve the model settings for one agent.
+
+    Args:
+        agent_name: Agent name, e.g. "ItineraryBuilder"
+
+    Returns:
+        Dictionary with tier, temperature, max_output_tokens, deadline,
+        hedge_percentile, hedge_delay and hard_deadline
+    """
+    config = load_agent_model_config()
+    settings = {**_DEFAULTS, **config.get("*", {}), **config.get(agent_name, {})}
+    if settings["tier"] not in MODEL_TIERS:
+        raise ValueError(f"Unknown model tier {settings['tier']!r} for {agent_name}")
+    return settings
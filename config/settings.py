@@ -13,6 +13,50 @@ GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 # Model Configuration
 MODEL_NAME = "gemini-2.5-flash-lite"
 
+# "gemini" calls the real API; "simulated" uses the offline mock model
+MODEL_BACKEND = os.getenv("VERTEX_VOYAGES_MODEL_BACKEND", "gemini")
+SIMULATED_MODEL_NAME = "gemini-simulated"
+SIMULATED_LATENCY_MEAN = float(os.getenv("VERTEX_VOYAGES_SIMULATED_LATENCY", "0.05"))  # seconds
+SIMULATED_LATENCY_SIGMA = float(os.getenv("VERTEX_VOYAGES_SIMULATED_SIGMA", "0.5"))  # lognormal spread
+SIMULATED_RESPONSE_CHARS = int(os.getenv("VERTEX_VOYAGES_SIMULATED_RESPONSE_CHARS", "0"))  # pad text answers to this length
+# Wrap every agent's model so benchmarks/evaluate.py can record its
+# responses and replay them offline (a no-op outside an evaluation case)
+MODEL_RECORDING = os.getenv("VERTEX_VOYAGES_MODEL_RECORDING", "0") != "0"
+
+# Model tiers, fastest first. Agents fall back to the next faster tier
+# when their latency deadline is exceeded.
+MODEL_TIERS = {
+    "fast": MODEL_NAME,
+    "standard": "gemini-2.5-flash",
+    "pro": "gemini-2.5-pro",
+}
+SIMULATED_TIER_LATENCY_FACTOR = {"fast": 1.0, "standard": 2.0, "pro": 4.0}
+
+# Per-agent model settings: tier, temperature, max_output_tokens and
+# deadline (seconds to first response before falling back to the next
+# faster tier). "fast" has no faster tier, so there a missed deadline is
+# only counted in model.deadline_exceeded. Research
+# stages also hedge: after the hedge_percentile of their recent latency
+# (hedge_delay seconds until HEDGE_MIN_SAMPLES exist) a duplicate request
+# is sent, and past hard_deadline the stage is skipped and its research
+# key filled from cache. Override with a JSON file of the same shape named
+# by VERTEX_VOYAGES_AGENT_MODELS.
+AGENT_MODEL_CONFIG_FILE = os.getenv("VERTEX_VOYAGES_AGENT_MODELS")
+HEDGE_MIN_SAMPLES = 20
+_RESEARCH_STAGE = {"hedge_percentile": 90, "hedge_delay": 8.0, "hard_deadline": 45.0}
+DEFAULT_AGENT_MODEL_CONFIG = {
+    "VertexVoyagesCoordinator": {"tier": "fast", "max_output_tokens": 2048, "deadline": 20.0},
+    "ValidationAgent": {"tier": "fast", "max_output_tokens": 512, "deadline": 10.0},
+    "DestinationResearcher": {"tier": "fast", "max_output_tokens": 1024, "deadline": 20.0, **_RESEARCH_STAGE},
+    "ActivityFinder": {"tier": "fast", "max_output_tokens": 1024, "deadline": 20.0, **_RESEARCH_STAGE},
+    "WeatherChecker": {"tier": "fast", "temperature": 0.7, "max_output_tokens": 768, "deadline": 20.0, **_RESEARCH_STAGE},
+    "ItineraryBuilder": {"tier": "standard", "max_output_tokens": 1536, "deadline": 30.0},
+    "BudgetCalculator": {"tier": "fast", "max_output_tokens": 768, "deadline": 10.0},
+    "OptimizerAgent": {"tier": "standard", "max_output_tokens": 1024, "deadline": 20.0},
+    "BookingAgent": {"tier": "fast", "max_output_tokens": 512, "deadline": 10.0},
+    "PlanPersonalizer": {"tier": "fast", "max_output_tokens": 1536, "deadline": 10.0},
+}
+
 # Retry Configuration
 RETRY_CONFIG = types.HttpRetryOptions(
     attempts=5,
@@ -22,8 +66,118 @@ RETRY_CONFIG = types.HttpRetryOptions(
 )
 
 # Booking Configuration
-APPROVAL_THRESHOLD = 1000.0  # USD
+APPROVAL_THRESHOLD = 1000.0  # USD, unless a policy in APPROVAL_POLICY_FILE sets another
 
-# Session Configuration
+# Session Configuration. Sessions are partitioned by user_id; trips
+# started without one share DEFAULT_USER_ID.
 DEFAULT_USER_ID = "traveler_001"
 APP_NAME = "VertexVoyages"
+
+# User Memory Configuration. Finished trips of identified users (any
+# user_id but DEFAULT_USER_ID) are remembered in USER_MEMORY_DIR. A
+# returning user's trip request is prefilled from their past trips, and a
+# trip to a city and month they researched within USER_RESEARCH_TTL reuses
+# that research instead of running the researchers again.
+USER_MEMORY_ENABLED = os.getenv("VERTEX_VOYAGES_USER_MEMORY", "1") != "0"
+USER_MEMORY_TRIPS = 20  # past trips (and researched city/months) kept per user
+USER_MEMORY_CACHE_SIZE = 1024  # users whose memory is kept loaded
+USER_RESEARCH_TTL = 30 * 24 * 3600  # seconds remembered research is reused
+DEFAULT_TRIP_PREFERENCES = {"num_travelers": 1, "accommodation_level": "mid-range"}  # for users without history
+
+# Service Configuration
+SERVICE_HOST = os.getenv("VERTEX_VOYAGES_HOST", "127.0.0.1")
+SERVICE_PORT = int(os.getenv("VERTEX_VOYAGES_PORT", "8080"))
+SERVICE_MAX_ACTIVE_TRIPS = int(os.getenv("VERTEX_VOYAGES_MAX_ACTIVE_TRIPS", "200"))
+SERVICE_MAX_TRIPS_PER_CLIENT = int(os.getenv("VERTEX_VOYAGES_MAX_TRIPS_PER_CLIENT", "10"))
+SERVICE_EVENT_QUEUE_SIZE = 256  # buffered SSE events per subscriber
+SERVICE_SEND_TIMEOUT = 5.0  # seconds a slow subscriber may block a trip
+SERVICE_DRAIN_TIMEOUT = 60.0  # seconds to finish in-flight trips on shutdown
+APPROVAL_TIMEOUT = 900.0  # seconds to wait for a human decision before rejecting
+
+# Logging Configuration. Log records are queued and written by a
+# background thread: "text" prints the console banners, "json" one object
+# per line for log shipping. Quiet mode drops everything below WARNING.
+LOG_FORMAT = os.getenv("VERTEX_VOYAGES_LOG_FORMAT", "text")
+LOG_LEVEL = os.getenv("VERTEX_VOYAGES_LOG_LEVEL", "INFO")
+LOG_QUIET = os.getenv("VERTEX_VOYAGES_LOG_QUIET", "0") == "1"
+
+# Event Compaction Configuration. Sub-agent results longer than
+# COMPACTION_MIN_CHARS are archived in full and replaced in the
+# coordinator's history by a summary plus the state keys holding them.
+# The archive lives in COMPACTION_ARCHIVE_DIR (under DATA_DIR, below).
+COMPACTION_ENABLED = os.getenv("VERTEX_VOYAGES_COMPACTION", "1") != "0"
+COMPACTION_MIN_CHARS = 1200
+COMPACTION_SUMMARY_CHARS = 600
+COMPACTION_ARCHIVE_SESSIONS = 1000  # sessions kept by the in-memory archive
+
+# Checkpoint Configuration. Each stage's outputs are saved as it finishes
+# so main.resume_trip can restart an interrupted trip after its last
+# completed stage.
+CHECKPOINT_ENABLED = os.getenv("VERTEX_VOYAGES_CHECKPOINTS", "1") != "0"
+
+# Memory Configuration. Finished sessions (events and state) are kept for
+# the SESSION_RETENTION_MAX most recent trips, at most SESSION_RETENTION_TTL
+# seconds, then evicted from the session service.
+SESSION_RETENTION_MAX = int(os.getenv("VERTEX_VOYAGES_SESSION_RETENTION", "200"))
+SESSION_RETENTION_TTL = float(os.getenv("VERTEX_VOYAGES_SESSION_TTL", "900"))
+TRACEMALLOC_FRAMES = 1  # stack frames recorded per allocation by memory snapshots
+
+# Plan Template Configuration. Single-city trips to catalogue destinations
+# of up to TEMPLATE_MAX_DAYS days are assembled from precomputed research
+# and itinerary skeletons (PLAN_TEMPLATES_FILE); only PlanPersonalizer
+# calls the model. Other trips, or all trips with templates off, run the
+# full pipeline.
+PLAN_TEMPLATES_ENABLED = os.getenv("VERTEX_VOYAGES_PLAN_TEMPLATES", "1") != "0"
+TEMPLATE_MAX_DAYS = 14
+# Templates built longer ago than this, or for another year than the trip's,
+# are skipped and the trip takes the full pipeline (rerun the job to refresh)
+TEMPLATE_MAX_AGE_DAYS = int(os.getenv("VERTEX_VOYAGES_TEMPLATE_MAX_AGE_DAYS", "90"))
+
+# Research Cache Configuration
+RESEARCH_CACHE_TTL = 6 * 3600  # seconds a stage result may stand in for a timed-out stage
+RESEARCH_CACHE_SIZE = 512  # destinations kept per research key
+RESEARCH_OUTPUT_KEYS = ["destination_research", "activity_research", "weather_research"]
+RESEARCH_MAX_CONCURRENT_LEGS = int(os.getenv("VERTEX_VOYAGES_MAX_CONCURRENT_LEGS", "3"))
+
+# Local Data Configuration
+DATA_DIR = os.getenv(
+    "VERTEX_VOYAGES_DATA_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+)
+POI_DATA_FILE = os.path.join(DATA_DIR, "pois.json")  # attractions with coordinates per city
+APPROVAL_POLICY_FILE = os.getenv(
+    "VERTEX_VOYAGES_APPROVAL_POLICIES", os.path.join(DATA_DIR, "approval_policies.json")
+)  # per-tenant/user thresholds, rules and budget envelopes
+CHECKPOINT_DIR = os.getenv("VERTEX_VOYAGES_CHECKPOINT_DIR", os.path.join(DATA_DIR, "checkpoints"))
+COMPACTION_ARCHIVE_DIR = os.getenv(
+    "VERTEX_VOYAGES_ARCHIVE_DIR", os.path.join(DATA_DIR, "archive")
+) or None  # JSONL files of compacted results, deleted with their session; "" keeps them in memory
+USER_MEMORY_DIR = os.getenv("VERTEX_VOYAGES_USER_MEMORY_DIR", os.path.join(DATA_DIR, "users"))  # one JSON file per user
+PLAN_TEMPLATES_FILE = os.getenv(
+    "VERTEX_VOYAGES_PLAN_TEMPLATES_FILE", os.path.join(DATA_DIR, "plan_templates.bin")
+)  # written by python -m agents.templates
+EVAL_DIR = os.path.join(DATA_DIR, "eval")  # evaluation corpus, recorded model responses and baseline
+EVAL_CORPUS_FILE = os.path.join(EVAL_DIR, "corpus.json")
+EVAL_RECORDINGS_DIR = os.path.join(EVAL_DIR, "recordings")
+EVAL_BASELINE_FILE = os.path.join(EVAL_DIR, "baseline.json")
+
+# Search Configuration. "google" keeps Gemini's built-in google_search
+# grounding; "local" (offline stand-in, the default with the simulated
+# model) and "cse" (Custom Search JSON API, needs GOOGLE_CSE_ID) route
+# research searches through tools.search, which deduplicates and caches.
+SEARCH_BACKEND = os.getenv(
+    "VERTEX_VOYAGES_SEARCH_BACKEND", "local" if MODEL_BACKEND == "simulated" else "google"
+)
+GOOGLE_CSE_ID = os.getenv("GOOGLE_CSE_ID")
+SEARCH_CACHE_FILE = os.getenv("VERTEX_VOYAGES_SEARCH_CACHE", os.path.join(DATA_DIR, "search_cache.sqlite"))
+SEARCH_CACHE_TTL = 7 * 24 * 3600  # seconds search results stay fresh
+SEARCH_WEATHER_TTL = 24 * 3600  # weather queries go stale sooner
+SEARCH_MAX_RESULTS = 5
+
+# Currency Configuration. Prices and APPROVAL_THRESHOLD are in
+# BASE_CURRENCY; quotes are converted with the rate table compiled from
+# EXCHANGE_RATES_SOURCE into the memory-mapped EXCHANGE_RATES_FILE.
+BASE_CURRENCY = "USD"
+EXCHANGE_RATES_SOURCE = os.getenv("VERTEX_VOYAGES_RATES_SOURCE", os.path.join(DATA_DIR, "exchange_rates.json"))
+EXCHANGE_RATES_FILE = os.getenv("VERTEX_VOYAGES_RATES_FILE", os.path.join(DATA_DIR, "exchange_rates.bin"))
+RATE_CHECK_INTERVAL = 5.0  # seconds between checks for a refreshed rate table
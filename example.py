@@ -2,14 +2,18 @@
 
 import asyncio
 from main import plan_trip
+from utils.structured_log import Banner, ensure_logging, get_logger
+
+
+logger = get_logger("example")
 
 
 async def example_budget_trip():
     """Example 1: Budget-friendly trip to Bali (auto-approved)."""
-    print("\n" + "="*70)
-    print("EXAMPLE 1: Budget Trip to Bali")
-    print("Expected: Auto-approval (cost < $1,000)")
-    print("="*70)
+    logger.info(Banner(
+        "EXAMPLE 1: Budget Trip to Bali",
+        "Expected: Auto-approval (cost < $1,000)"
+    ))
     
     result = await plan_trip(
         user_query="I want to plan a relaxing beach vacation to Bali with my partner.",
@@ -21,16 +25,16 @@ async def example_budget_trip():
         auto_approve=True
     )
     
-    print(f"\n✅ Example 1 Complete - Session ID: {result['session_id']}")
+    logger.info(f"\n✅ Example 1 Complete - Session ID: {result['session_id']}")
     return result
 
 
 async def example_luxury_trip():
     """Example 2: Luxury trip to Paris (requires approval)."""
-    print("\n" + "="*70)
-    print("EXAMPLE 2: Luxury Trip to Paris")
-    print("Expected: Pauses for approval (cost > $1,000)")
-    print("="*70)
+    logger.info(Banner(
+        "EXAMPLE 2: Luxury Trip to Paris",
+        "Expected: Pauses for approval (cost > $1,000)"
+    ))
     
     result = await plan_trip(
         user_query="Plan a romantic luxury getaway to Paris for our anniversary.",
@@ -42,16 +46,16 @@ async def example_luxury_trip():
         auto_approve=True  # Change to False to simulate rejection
     )
     
-    print(f"\n✅ Example 2 Complete - Session ID: {result['session_id']}")
+    logger.info(f"\n✅ Example 2 Complete - Session ID: {result['session_id']}")
     return result
 
 
 async def example_midrange_trip():
     """Example 3: Mid-range trip to Tokyo."""
-    print("\n" + "="*70)
-    print("EXAMPLE 3: Mid-Range Trip to Tokyo")
-    print("Expected: May require approval depending on duration")
-    print("="*70)
+    logger.info(Banner(
+        "EXAMPLE 3: Mid-Range Trip to Tokyo",
+        "Expected: May require approval depending on duration"
+    ))
     
     result = await plan_trip(
         user_query="Plan a cultural exploration trip to Tokyo with traditional experiences.",
@@ -63,15 +67,14 @@ async def example_midrange_trip():
         auto_approve=True
     )
     
-    print(f"\n✅ Example 3 Complete - Session ID: {result['session_id']}")
+    logger.info(f"\n✅ Example 3 Complete - Session ID: {result['session_id']}")
     return result
 
 
 async def main():
     """Run all examples."""
-    print("\n" + "="*70)
-    print("🌍 VERTEX VOYAGES - EXAMPLE DEMONSTRATIONS")
-    print("="*70)
+    ensure_logging()
+    logger.info(Banner("🌍 VERTEX VOYAGES - EXAMPLE DEMONSTRATIONS"))
     
     # Run examples
     await example_budget_trip()
@@ -80,9 +83,7 @@ async def main():
     # await example_luxury_trip()
     # await example_midrange_trip()
     
-    print("\n" + "="*70)
-    print("✅ ALL EXAMPLES COMPLETE")
-    print("="*70 + "\n")
+    logger.info(Banner("✅ ALL EXAMPLES COMPLETE"))
 
 
 if __name__ == "__main__":
@@ -2,42 +2,76 @@
 
 import os
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
+from typing import AsyncGenerator, Awaitable, Callable, Optional
 
 from google.genai import types
 from google.adk.apps.app import App, ResumabilityConfig
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
-from google.adk.plugins import LoggingPlugin
 
-from config import DEFAULT_USER_ID, APP_NAME
+from config import DEFAULT_USER_ID, APP_NAME, BASE_CURRENCY, COMPACTION_ENABLED, CHECKPOINT_ENABLED
 from agents.coordinator import create_coordinator
+from agents.templates import create_plan_personalizer
+from plugins import EventArchive, EventCompactionPlugin, CheckpointStore, CheckpointPlugin, TraceLoggingPlugin
+from plugins.checkpoints import CHECKPOINT_STAGES
+from tools.currency import rate_table
+from tools.plan_templates import template_trip_state
+from tools.search import trip_search_stats
 from utils.helpers import check_for_approval, create_approval_response, print_agent_response
+from utils.memory import SessionRetention
+from utils.structured_log import Banner, ensure_logging, get_logger, log_context
+from utils.users import PREFILLED_FIELDS, SessionDirectory, UserMemory
 
 
+logger = get_logger("main")
+
 # Initialize services
 session_service = InMemorySessionService()
+event_archive = EventArchive()  # full stage results removed from history by compaction
+checkpoint_store = CheckpointStore()  # per-stage progress read back by resume_trip
+session_directory = SessionDirectory()  # sessions by id, user and tenant
+user_memory = UserMemory()  # past trips and research of identified users
+session_retention = SessionRetention(
+    session_service, event_archive, checkpoint_store, session_directory
+)  # evicts finished sessions
+
+# Researchers a returning user's remembered research stands in for
+_RESEARCH_STAGES = ["DestinationResearcher", "ActivityFinder", "WeatherChecker"]
 
 
-def create_app():
-    """Create and configure the Vertex Voyages app."""
+def create_app(compaction: bool = COMPACTION_ENABLED, checkpoints: bool = CHECKPOINT_ENABLED):
+    """Create and configure the Vertex Voyages app.
+    
+    Args:
+        compaction: Replace verbose stage results in the coordinator's
+            history with summaries (raw results go to event_archive)
+        checkpoints: Save each stage's outputs to checkpoint_store and skip
+            stages that are already saved
+    """
     coordinator = create_coordinator()
     
+    plugins = [TraceLoggingPlugin()]  # per-run trace; quiet mode drops it unformatted
+    if compaction:
+        plugins.append(EventCompactionPlugin(archive=event_archive))
+    if checkpoints:
+        plugins.append(CheckpointPlugin(checkpoint_store))
+    
     app = App(
         name=APP_NAME,
         root_agent=coordinator,
         resumability_config=ResumabilityConfig(
             is_resumable=True
         ),
-        plugins=[LoggingPlugin()]
+        plugins=plugins
     )
     
     return app
 
 
-def create_runner():
+def create_runner(compaction: bool = COMPACTION_ENABLED, checkpoints: bool = CHECKPOINT_ENABLED):
     """Create and configure the runner."""
-    app = create_app()
+    app = create_app(compaction, checkpoints)
     runner = Runner(
         app=app,
         session_service=session_service,
@@ -45,16 +79,148 @@ def create_runner():
     return runner
 
 
-async def plan_trip(
+def create_template_runner():
+    """Create the runner for trips assembled from a plan template.
+    
+    Its root agent is PlanPersonalizer, which only asks for booking
+    approval and writes the final plan; the rest of the trip's state comes
+    from template_trip_state().
+    """
+    app = App(
+        name=APP_NAME,
+        root_agent=create_plan_personalizer(),
+        resumability_config=ResumabilityConfig(
+            is_resumable=True
+        ),
+        plugins=[TraceLoggingPlugin()]
+    )
+    return Runner(
+        app=app,
+        session_service=session_service,
+    )
+
+
+def build_trip_legs(legs: list, travel_dates: str) -> list:
+    """Normalise the legs of a multi-city trip.
+    
+    Args:
+        legs: List of {"destination": str, "num_days": int}, in travel order
+        travel_dates: Date range "YYYY-MM-DD to YYYY-MM-DD" of the whole trip
+    
+    Returns:
+        List of legs, each with its own "travel_dates" when the trip start
+        date can be parsed
+    """
+    try:
+        leg_start = datetime.strptime(travel_dates.split(" to ")[0].strip(), "%Y-%m-%d")
+    except ValueError:
+        leg_start = None
+    
+    normalized = []
+    for leg in legs:
+        entry = {"destination": leg["destination"], "num_days": int(leg["num_days"])}
+        if leg.get("travel_dates"):
+            entry["travel_dates"] = leg["travel_dates"]
+        elif leg_start is not None:
+            leg_end = leg_start + timedelta(days=entry["num_days"])
+            entry["travel_dates"] = f"{leg_start:%Y-%m-%d} to {leg_end:%Y-%m-%d}"
+            leg_start = leg_end
+        normalized.append(entry)
+    return normalized
+
+
+def initial_trip_state(
+    num_travelers: int,
+    legs: Optional[list] = None,
+    currency: str = BASE_CURRENCY,
+    trip_id: Optional[str] = None,
+    tenant_id: Optional[str] = None,
+    user_id: Optional[str] = None
+) -> dict:
+    """Session state seeded before the coordinator runs.
+    
+    A trip_id (the trip's session id) turns on stage checkpoints for it.
+    A tenant_id and user_id select the approval policy.
+    """
+    state = {"num_travelers": num_travelers, "currency": currency.upper()}
+    if legs and len(legs) > 1:
+        state["trip_legs"] = legs
+    if trip_id:
+        state["trip_id"] = trip_id
+    if tenant_id:
+        state["tenant_id"] = tenant_id
+    if user_id:
+        state["user_id"] = user_id
+    return state
+
+
+async def create_trip_session(
+    session_id: str,
+    trip: dict,
+    user_id: str = DEFAULT_USER_ID,
+    tenant_id: Optional[str] = None,
+    template: Optional[dict] = None
+) -> list:
+    """Create a trip's session in its user's partition, with its checkpoint.
+    
+    The state is seeded from the trip's plan template, if it has one.
+    Otherwise research the user's memory holds for the same city and month
+    is saved as completed researcher stages in the trip's checkpoint, so
+    CheckpointPlugin answers those stages without a model call.
+    
+    Args:
+        session_id: Session ID, also the trip's ID
+        trip: plan_trip parameters (as build_trip_query takes them)
+        user_id: Owner of the session
+        tenant_id: Tenant the trip is booked under
+        template: State from template_trip_state()
+    
+    Returns:
+        Stages answered from the user's memory
+    """
+    checkpoint_store.start(session_id, user_id, trip, tenant_id)
+    state = initial_trip_state(trip["num_travelers"], trip["legs"], trip["currency"], session_id, tenant_id, user_id)
+    reused = []
+    if template is not None:
+        state.update(template)
+    elif CHECKPOINT_ENABLED and not (trip["legs"] and len(trip["legs"]) > 1):
+        research = user_memory.research(user_id, trip["destination"], trip["travel_dates"])
+        for stage in _RESEARCH_STAGES if research else []:
+            key = CHECKPOINT_STAGES[stage][0]
+            checkpoint_store.save_stage(session_id, stage, {key: research[key]})
+            state[key] = research[key]
+            reused.append(stage)
+    
+    await session_service.create_session(
+        app_name=APP_NAME,
+        user_id=user_id,
+        session_id=session_id,
+        state=state
+    )
+    session_directory.register(session_id, user_id, tenant_id)
+    return reused
+
+
+async def remember_trip(session_id: str, trip: dict, user_id: str, tenant_id: Optional[str] = None):
+    """Add a completed trip, read from its session, to its user's memory."""
+    if not user_memory.remembers(user_id):
+        return
+    session = await session_service.get_session(app_name=APP_NAME, user_id=user_id, session_id=session_id)
+    if session is not None:
+        user_memory.remember_trip(user_id, trip, session.state, tenant_id)
+
+
+def build_trip_query(
     user_query: str,
     destination: str,
     travel_dates: str,
     num_days: int,
     num_travelers: int,
     accommodation_level: str = "mid-range",
-    auto_approve: bool = True
-) -> dict:
-    """Main workflow function for Vertex Voyages travel planning.
+    legs: Optional[list] = None,
+    currency: str = BASE_CURRENCY
+) -> types.Content:
+    """Build the coordinator message for a trip request.
     
     Args:
         user_query: Natural language travel request
@@ -63,35 +229,12 @@ async def plan_trip(
         num_days: Number of days for the trip
         num_travelers: Number of travelers
         accommodation_level: "budget", "mid-range", or "luxury"
-        auto_approve: Auto-approve bookings for testing (True) or require manual approval (False)
+        legs: Legs from build_trip_legs() for multi-city trips
+        currency: Currency to quote prices in (ISO 4217 code)
     
     Returns:
-        Dictionary with complete travel plan and status
+        Content object with the user's request and trip details
     """
-    
-    print(f"\n{'='*70}")
-    print(f"🌍 VERTEX VOYAGES - Travel Planning System")
-    print(f"{'='*70}")
-    print(f"📍 Destination: {destination}")
-    print(f"📅 Dates: {travel_dates}")
-    print(f"👥 Travelers: {num_travelers}")
-    print(f"🏨 Level: {accommodation_level}")
-    print(f"{'='*70}\n")
-    
-    # Generate unique session ID
-    session_id = f"trip_{uuid.uuid4().hex[:8]}"
-    
-    # Create runner
-    runner = create_runner()
-    
-    # Create session
-    await session_service.create_session(
-        app_name=APP_NAME,
-        user_id=DEFAULT_USER_ID,
-        session_id=session_id
-    )
-    
-    # Prepare user message
     enhanced_query = f"""{user_query}
     
 Trip Details:
@@ -101,61 +244,329 @@ Trip Details:
 - Travelers: {num_travelers}
 - Accommodation: {accommodation_level}
 """
+    if legs and len(legs) > 1:
+        enhanced_query += "- Legs: " + " → ".join(
+            f"{leg['destination']} ({leg['num_days']} days)" for leg in legs
+        ) + "\n"
+    if currency.upper() != BASE_CURRENCY:
+        enhanced_query += f"- Currency: {currency.upper()}\n"
     
-    query_content = types.Content(
+    return types.Content(
         role="user",
         parts=[types.Part(text=enhanced_query)]
     )
+
+
+async def run_trip(
+    runner: Runner,
+    session_id: str,
+    query_content: types.Content,
+    decide_approval: Callable[[dict], Awaitable[bool]],
+    user_id: str = DEFAULT_USER_ID
+) -> AsyncGenerator:
+    """Run the planning workflow and yield every event as it happens.
     
-    events = []
+    If the booking step pauses for approval, decide_approval is awaited
+    with the approval details and the workflow resumes with its answer.
     
-    # STEP 1: Send initial request to coordinator
-    print("🚀 Starting travel planning workflow...\n")
+    Args:
+        runner: Runner created by create_runner()
+        session_id: Existing session to run the trip in
+        query_content: Message built by build_trip_query()
+        decide_approval: Async callback returning True to approve, or the
+            approval policy's decision when the policy settled the booking
+        user_id: Owner of the session
+    
+    Yields:
+        ADK events from the initial run and, if paused, the resumed run
+    """
+    approval_info = None
     
+    # STEP 1: Send initial request to coordinator
     async for event in runner.run_async(
-        user_id=DEFAULT_USER_ID,
+        user_id=user_id,
         session_id=session_id,
         new_message=query_content
     ):
-        events.append(event)
+        if approval_info is None:
+            approval_info = check_for_approval([event])
+        yield event
     
     # STEP 2: Check for approval request (long-running operation)
-    approval_info = check_for_approval(events)
-    
-    if approval_info:
-        print(f"\n{'='*70}")
-        print("⏸️  BOOKING APPROVAL REQUIRED")
-        print(f"{'='*70}")
-        print(f"💰 Trip cost exceeds $1,000 threshold")
-        print(f"🤔 Simulated Human Decision: {'APPROVE ✅' if auto_approve else 'REJECT ❌'}\n")
-        
-        # STEP 3: Resume with approval decision
-        async for event in runner.run_async(
-            user_id=DEFAULT_USER_ID,
-            session_id=session_id,
-            new_message=create_approval_response(approval_info, auto_approve),
-            invocation_id=approval_info["invocation_id"]
-        ):
-            if event.content and event.content.parts:
-                for part in event.content.parts:
-                    if part.text:
-                        print(f"🤖 Agent: {part.text}")
+    if approval_info is None:
+        return
+    
+    decision = await decide_approval(approval_info)
+    if isinstance(decision, dict):
+        approved = decision["action"] == "approve"
     else:
-        # No approval needed - print response
-        print_agent_response(events)
+        approved, decision = decision, None
+    
+    # STEP 3: Resume with approval decision
+    async for event in runner.run_async(
+        user_id=user_id,
+        session_id=session_id,
+        new_message=create_approval_response(approval_info, approved, decision),
+        invocation_id=approval_info["invocation_id"]
+    ):
+        yield event
+
+
+async def plan_trip(
+    user_query: str,
+    destination: str,
+    travel_dates: str,
+    num_days: int,
+    num_travelers: Optional[int] = None,
+    accommodation_level: Optional[str] = None,
+    auto_approve: bool = True,
+    legs: Optional[list] = None,
+    currency: Optional[str] = None,
+    user_id: str = DEFAULT_USER_ID,
+    tenant_id: Optional[str] = None
+) -> dict:
+    """Main workflow function for Vertex Voyages travel planning.
+    
+    Args:
+        user_query: Natural language travel request
+        destination: Destination name (e.g., "Paris, France")
+        travel_dates: Date range "YYYY-MM-DD to YYYY-MM-DD"
+        num_days: Number of days for the trip
+        num_travelers: Number of travelers
+        accommodation_level: "budget", "mid-range", or "luxury"
+        auto_approve: Auto-approve bookings for testing (True) or require manual approval (False)
+        legs: Optional multi-city legs in travel order, e.g.
+            [{"destination": "Tokyo, Japan", "num_days": 3},
+             {"destination": "Kyoto, Japan", "num_days": 2}].
+            When given, destination and num_days are derived from the legs.
+        currency: Currency for quotes and approvals, e.g. "EUR"
+        user_id: Traveler the trip belongs to. A returning user's trip
+            fills num_travelers, accommodation_level and currency from
+            their past trips when left out (defaults: 1, "mid-range", USD).
+        tenant_id: Tenant whose approval policy applies (default: the
+            tenant of the user's last trip, else the policy file's)
+    
+    Returns:
+        Dictionary with complete travel plan and status
+    """
+    prefilled = [
+        field for field, value in zip(PREFILLED_FIELDS, (num_travelers, accommodation_level, currency)) if value is None
+    ]
+    params = user_memory.prefill(user_id, {
+        "num_travelers": num_travelers, "accommodation_level": accommodation_level, "currency": currency
+    })
+    num_travelers, accommodation_level, currency = (params[field] for field in PREFILLED_FIELDS)
+    tenant_id = tenant_id or user_memory.preferences(user_id).get("tenant_id")
+    rate_table.rate(currency)  # raises UnknownCurrency before any model call
+    if legs:
+        legs = build_trip_legs(legs, travel_dates)
+        destination = " → ".join(leg["destination"] for leg in legs)
+        num_days = sum(leg["num_days"] for leg in legs)
     
-    print(f"\n{'='*70}")
-    print("✅ TRAVEL PLANNING COMPLETE")
-    print(f"{'='*70}\n")
+    ensure_logging()
+    
+    # Generate unique session ID
+    session_id = f"trip_{uuid.uuid4().hex[:8]}"
+    
+    with log_context(trip_id=session_id, session_id=session_id):
+        logger.info(Banner(
+            "🌍 VERTEX VOYAGES - Travel Planning System",
+            f"📍 Destination: {destination}",
+            f"📅 Dates: {travel_dates}",
+            f"👥 Travelers: {num_travelers}",
+            f"🏨 Level: {accommodation_level}",
+            f"💱 Currency: {currency.upper()}",
+            f"👤 User: {user_id}" + (f" ({tenant_id})" if tenant_id else "")
+        ), extra={"event": "trip.started", "fields": {
+            "user_id": user_id,
+            "tenant_id": tenant_id,
+            "destination": destination,
+            "travel_dates": travel_dates,
+            "num_travelers": num_travelers,
+            "accommodation_level": accommodation_level,
+            "currency": currency.upper()
+        }})
+        
+        # Catalogue trips start from a precomputed plan template
+        template = template_trip_state(
+            destination, travel_dates, num_days, num_travelers, accommodation_level, legs, currency
+        )
+        if template is not None:
+            logger.info(
+                f"⚡ Using plan template {template['plan_template']} - only the personalizer calls the model",
+                extra={"event": "trip.template", "fields": {"template": template["plan_template"]}}
+            )
+        
+        # Create runner
+        runner = create_runner() if template is None else create_template_runner()
+        
+        trip = {
+            "user_query": user_query,
+            "destination": destination,
+            "travel_dates": travel_dates,
+            "num_days": num_days,
+            "num_travelers": num_travelers,
+            "accommodation_level": accommodation_level,
+            "legs": legs,
+            "currency": currency
+        }
+        
+        # Create session
+        reused = await create_trip_session(session_id, trip, user_id, tenant_id, template)
+        if reused:
+            logger.info(
+                f"🧠 Reusing research from {user_id}'s earlier trip: {', '.join(reused)}",
+                extra={"event": "trip.memory", "fields": {"reused_stages": reused}}
+            )
+        
+        logger.info("🚀 Starting travel planning workflow...\n", extra={"event": "workflow.started"})
+        
+        try:
+            await _report_trip(runner, session_id, build_trip_query(**trip), auto_approve, user_id)
+            checkpoint_store.finish(session_id)
+            await remember_trip(session_id, trip, user_id, tenant_id)
+        finally:
+            await session_retention.release(APP_NAME, user_id, session_id)
+        searches = _log_searches(session_id)
+        
+        logger.info(Banner("✅ TRAVEL PLANNING COMPLETE"), extra={"event": "trip.completed"})
     
     return {
         "session_id": session_id,
         "status": "complete",
         "destination": destination,
-        "dates": travel_dates
+        "dates": travel_dates,
+        "searches": searches,
+        "template": template["plan_template"] if template else None,
+        "user_id": user_id,
+        "prefilled": {field: params[field] for field in prefilled},
+        "reused_stages": reused
     }
 
 
+async def resume_trip(session_id: str, auto_approve: bool = True) -> dict:
+    """Resume an interrupted trip from its last completed stage.
+    
+    The trip's session is rebuilt from its checkpoint and the workflow runs
+    again; every stage saved in the checkpoint answers from it instead of
+    calling its model, so only the unfinished stages do real work.
+    
+    Args:
+        session_id: Session ID of a trip started by plan_trip or the service
+        auto_approve: Auto-approve bookings for testing (True) or require manual approval (False)
+    
+    Returns:
+        Dictionary with complete travel plan and status
+    """
+    record = checkpoint_store.load(session_id)
+    if record is None or "trip" not in record:
+        raise KeyError(f"No checkpoint for trip {session_id}")
+    trip = record["trip"]
+    user_id = record["user_id"]
+    tenant_id = record.get("tenant_id")
+    ensure_logging()
+    
+    with log_context(trip_id=session_id, session_id=session_id):
+        logger.info(Banner(
+            f"♻️  VERTEX VOYAGES - Resuming {session_id}",
+            f"📍 Destination: {trip['destination']}",
+            f"✔️  Completed stages: {', '.join(record['stages']) or 'none'}"
+        ), extra={"event": "trip.resumed", "fields": {"completed_stages": record["stages"]}})
+        
+        # Start over from a fresh session holding the checkpointed state; a
+        # session left behind by a failed run has a half-finished history.
+        session_retention.hold(APP_NAME, user_id, session_id)
+        existing = await session_service.get_session(app_name=APP_NAME, user_id=user_id, session_id=session_id)
+        if existing is not None:
+            await session_service.delete_session(app_name=APP_NAME, user_id=user_id, session_id=session_id)
+        await session_service.create_session(
+            app_name=APP_NAME,
+            user_id=user_id,
+            session_id=session_id,
+            state={
+                **initial_trip_state(
+                    trip["num_travelers"], trip["legs"], trip["currency"], session_id, tenant_id, user_id
+                ),
+                **record["state"]
+            }
+        )
+        session_directory.register(session_id, user_id, tenant_id)
+        
+        try:
+            await _report_trip(create_runner(), session_id, build_trip_query(**trip), auto_approve, user_id)
+            checkpoint_store.finish(session_id)
+            await remember_trip(session_id, trip, user_id, tenant_id)
+        finally:
+            await session_retention.release(APP_NAME, user_id, session_id)
+        _log_searches(session_id)
+        
+        logger.info(Banner("✅ TRAVEL PLANNING COMPLETE"), extra={"event": "trip.completed"})
+    
+    return {
+        "session_id": session_id,
+        "status": "complete",
+        "destination": trip["destination"],
+        "dates": trip["travel_dates"],
+        "resumed_stages": record["stages"]
+    }
+
+
+def _log_searches(session_id: str) -> Optional[dict]:
+    """Log how many research searches a trip made and how they were served."""
+    searches = trip_search_stats(session_id)
+    if searches is not None:
+        logger.info(
+            f"🔎 Searches: {searches['requested']} requested, {searches['unique']} unique, "
+            f"{searches['backend']} sent to the search backend",
+            extra={"event": "trip.searches", "fields": searches}
+        )
+    return searches
+
+
+async def _report_trip(
+    runner: Runner,
+    session_id: str,
+    query_content: types.Content,
+    auto_approve: bool,
+    user_id: str = DEFAULT_USER_ID
+):
+    """Run a trip with a simulated approval decision and log its responses."""
+    paused = False
+    
+    async def decide_approval(approval_info):
+        nonlocal paused
+        paused = True
+        payload = approval_info.get("payload") or {}
+        threshold = payload.get("threshold")
+        if payload.get("rule"):
+            reason = f"📋 Approval rule {payload['rule']} sends this trip to review"
+        elif threshold is not None:
+            reason = f"💰 Trip cost exceeds the {threshold:,.0f} {BASE_CURRENCY} threshold and no approval policy covers it"
+        else:
+            reason = "💰 No approval policy covers this trip's cost"
+        logger.info(Banner(
+            "⏸️  BOOKING APPROVAL REQUIRED",
+            reason,
+            f"🤔 Simulated Human Decision: {'APPROVE ✅' if auto_approve else 'REJECT ❌'}"
+        ), extra={"event": "approval.decided", "fields": {
+            "approval_id": approval_info["approval_id"],
+            "approved": auto_approve
+        }})
+        return auto_approve
+    
+    events = []
+    
+    async for event in run_trip(runner, session_id, query_content, decide_approval, user_id):
+        if paused:
+            print_agent_response([event])
+        else:
+            events.append(event)
+    
+    if not paused:
+        # No approval needed - log response
+        print_agent_response(events)
+
+
 if __name__ == "__main__":
     import asyncio
     
@@ -170,4 +581,4 @@ if __name__ == "__main__":
         auto_approve=True
     ))
     
-    print(f"\n✅ Complete - Session ID: {result['session_id']}")
+    logger.info(f"\n✅ Complete - Session ID: {result['session_id']}")
@@ -0,0 +1,13 @@
+"""ADK plugins applied to the whole Vertex Voyages app."""
+
+from .event_compaction import EventArchive, EventCompactionPlugin
+from .checkpoints import CheckpointStore, CheckpointPlugin
+from .trace_logging import TraceLoggingPlugin
+
+__all__ = [
+    "EventArchive",
+    "EventCompactionPlugin",
+    "CheckpointStore",
+    "CheckpointPlugin",
+    "TraceLoggingPlugin"
+]
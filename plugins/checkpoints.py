@@ -0,0 +1,198 @@
+"""Durable per-stage checkpoints so interrupted trips resume where they stopped.
+
+CheckpointPlugin records each stage's outputs as soon as the stage
+finishes, in one small JSON file per trip that is rewritten atomically.
+When main.resume_trip replays a trip, its session state is seeded from
+the checkpoint and every completed stage is skipped: its before-agent
+callback answers with the saved output instead of calling the model.
+
+Stages run inside AgentTool child sessions, so checkpoints are keyed by
+the "trip_id" that main.initial_trip_state seeds into session state (and
+that AgentTool copies into each child session); trips without one are not
+checkpointed.
+
+BookingAgent is checkpointed once its approval is settled (approved or
+rejected, not while it waits for a human), so a resumed trip keeps the
+booking decision instead of evaluating the booking and drawing on a
+budget envelope again.
+"""
+
+import json
+import os
+import re
+import time
+from typing import Optional
+
+from google.genai import types
+from google.adk.agents import BaseAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.plugins.base_plugin import BasePlugin
+from config import CHECKPOINT_DIR
+from utils.metrics import metrics
+
+
+# Stage name -> state keys it produces. The first key is the stage's
+# output_key and marks it complete; the rest are written by its tools.
+# ResearchTeam is complete only once every researcher has answered: its
+# after-agent callback also runs when an interruption cancels a researcher.
+CHECKPOINT_STAGES = {
+    "ValidationAgent": ["validation_result", "validated_destination", "destination_safe", "safety_rating", "season_score"],
+    "DestinationResearcher": ["destination_research"],
+    "ActivityFinder": ["activity_research"],
+    "WeatherChecker": ["weather_research"],
+    "ResearchTeam": ["destination_research", "activity_research", "weather_research", "leg_research"],
+    "ItineraryBuilder": ["itinerary_draft", "optimized_itinerary"],
+    "BudgetCalculator": ["budget_analysis", "last_budget", "budget_breakdown", "last_budget_local"],
+    "OptimizerAgent": ["optimized_plan"],
+    "BookingAgent": ["booking_status", "booking_approved", "approval_reason"],
+}
+
+_COMPLETION_KEYS = {
+    "ResearchTeam": ["destination_research", "activity_research", "weather_research"],
+    "BookingAgent": ["booking_status", "booking_approved"],
+}
+
+# With trip_legs in state every researcher runs for one leg (see
+# ResearchFanoutAgent); their outputs are merged by ResearchTeam, which is
+# checkpointed instead.
+_LEG_RESEARCHERS = frozenset({"DestinationResearcher", "ActivityFinder", "WeatherChecker"})
+
+
+class CheckpointStore:
+    """One JSON checkpoint file per trip, replaced atomically on every save.
+
+    os.replace makes each save all-or-nothing, so a worker killed mid-write
+    leaves the previous checkpoint intact. Files are not fsynced: they
+    survive a crashed worker, not a crashed host.
+    """
+
+    def __init__(self, directory: str = CHECKPOINT_DIR):
+        self.directory = directory
+        self._records = {}
+
+    def start(self, trip_id: str, user_id: str, trip: dict, tenant_id: Optional[str] = None):
+        """Record a new trip, its owner and the request needed to replay it."""
+        self._records[trip_id] = {
+            "trip_id": trip_id,
+            "user_id": user_id,
+            "tenant_id": tenant_id,
+            "trip": trip,
+            "stages": [],
+            "state": {},
+            "started_at": time.time(),
+        }
+        self._write(trip_id)
+
+    def load(self, trip_id: str) -> Optional[dict]:
+        """The trip's checkpoint, or None if it has none (or finished)."""
+        record = self._records.get(trip_id)
+        if record is None:
+            try:
+                with open(self._path(trip_id), encoding="utf-8") as f:
+                    record = self._records[trip_id] = json.load(f)
+            except FileNotFoundError:
+                return None
+        return record
+
+    def completed(self, trip_id: str, stage: str) -> bool:
+        record = self.load(trip_id)
+        return record is not None and stage in record["stages"]
+
+    def save_stage(self, trip_id: str, stage: str, values: dict):
+        """Mark a stage complete along with the state values it produced."""
+        record = self.load(trip_id)
+        if record is None:
+            record = self._records[trip_id] = {"trip_id": trip_id, "stages": [], "state": {}}
+        if stage not in record["stages"]:
+            record["stages"].append(stage)
+        record["state"].update(values)
+        self._write(trip_id)
+
+    def finish(self, trip_id: str):
+        """Drop the checkpoint of a trip that ran to completion."""
+        self._records.pop(trip_id, None)
+        try:
+            os.remove(self._path(trip_id))
+        except FileNotFoundError:
+            pass
+
+    def release(self, trip_id: str):
+        """Forget the cached record of a trip that stopped; its file stays for resume_trip."""
+        self._records.pop(trip_id, None)
+
+    def pending(self) -> list:
+        """Trip ids with a checkpoint on disk, i.e. started but not finished."""
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(name[:-5] for name in os.listdir(self.directory) if name.endswith(".json"))
+
+    def _path(self, trip_id: str) -> str:
+        return os.path.join(self.directory, re.sub(r"[^\w.-]", "_", trip_id) + ".json")
+
+    def _write(self, trip_id: str):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(trip_id)
+        staging = f"{path}.{os.getpid()}.tmp"
+        with open(staging, "w", encoding="utf-8") as f:
+            json.dump(self._records[trip_id], f, default=str, ensure_ascii=False)
+        os.replace(staging, path)
+
+
+class CheckpointPlugin(BasePlugin):
+    """Saves stage outputs as stages finish and skips stages already saved.
+
+    Args:
+        store: CheckpointStore shared with main.resume_trip
+    """
+
+    def __init__(self, store: CheckpointStore, name: str = "checkpoints"):
+        super().__init__(name=name)
+        self.store = store
+
+    async def before_agent_callback(
+        self,
+        *,
+        agent: BaseAgent,
+        callback_context: CallbackContext
+    ) -> Optional[types.Content]:
+        """Answer for a completed stage from its checkpoint instead of running it."""
+        stage = self._stage(agent, callback_context)
+        if stage is None:
+            return None
+        trip_id, keys = stage
+        output = callback_context.state.get(keys[0])
+        if output is None or not self.store.completed(trip_id, agent.name):
+            return None
+        metrics.increment("checkpoint.skipped", stage=agent.name)
+        return types.Content(role="model", parts=[types.Part(text=str(output))])
+
+    async def after_agent_callback(
+        self,
+        *,
+        agent: BaseAgent,
+        callback_context: CallbackContext
+    ) -> Optional[types.Content]:
+        """Checkpoint a stage that produced its output."""
+        stage = self._stage(agent, callback_context)
+        if stage is None:
+            return None
+        trip_id, keys = stage
+        required = _COMPLETION_KEYS.get(agent.name, keys[:1])
+        # booking_approved is False for a rejected booking, which is still settled
+        done = all(callback_context.state.get(key) not in (None, "") for key in required)
+        if not done or self.store.completed(trip_id, agent.name):
+            return None
+        values = {key: callback_context.state.get(key) for key in keys if key in callback_context.state}
+        self.store.save_stage(trip_id, agent.name, values)
+        metrics.increment("checkpoint.saved", stage=agent.name)
+        return None
+
+    @staticmethod
+    def _stage(agent: BaseAgent, callback_context: CallbackContext):
+        keys = CHECKPOINT_STAGES.get(agent.name)
+        trip_id = callback_context.state.get("trip_id")
+        if keys is None or not trip_id:
+            return None
+        if agent.name in _LEG_RESEARCHERS and callback_context.state.get("trip_legs"):
+            return None
+        return trip_id, keys
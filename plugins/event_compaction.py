@@ -0,0 +1,225 @@
+"""Event compaction for long coordinator conversations.
+
+The coordinator calls each stage through an AgentTool, and every stage
+answers with a long report. Left alone, those reports stay in the
+coordinator's history and are resent on every later turn. Their full text
+already lives in session state under the stages' output keys, so the
+coordinator only needs a short digest.
+
+EventCompactionPlugin swaps each large AgentTool result for a summary, the
+state keys that hold the full output and an archive reference, before the
+function response event is recorded. The raw result goes to an
+EventArchive for audit. As a second line of defence, outgoing model
+requests have older oversized function responses and model narration
+trimmed, leaving the newest turn untouched.
+"""
+
+import json
+import os
+import re
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Optional
+
+from google.genai import types
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models.llm_request import LlmRequest
+from google.adk.plugins.base_plugin import BasePlugin
+from google.adk.tools import AgentTool
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.tool_context import ToolContext
+from config import (
+    COMPACTION_MIN_CHARS,
+    COMPACTION_SUMMARY_CHARS,
+    COMPACTION_ARCHIVE_DIR,
+    COMPACTION_ARCHIVE_SESSIONS
+)
+from utils.metrics import metrics
+
+
+def summarize_text(text: str, limit: int = COMPACTION_SUMMARY_CHARS) -> str:
+    """Leading non-blank lines of text, up to about limit characters."""
+    lines, size = [], 0
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if size + len(line) > limit:
+            lines.append(line[:max(0, limit - size)].rstrip() + "…" if not lines else "…")
+            break
+        lines.append(line)
+        size += len(line) + 1
+    return "\n".join(lines)
+
+
+def output_keys(agent) -> list:
+    """State keys written by an agent and its sub-agents, in tree order."""
+    keys = []
+    if getattr(agent, "output_key", None):
+        keys.append(agent.output_key)
+    for sub_agent in getattr(agent, "sub_agents", None) or []:
+        keys.extend(key for key in output_keys(sub_agent) if key not in keys)
+    return keys
+
+
+def _size(value: Any) -> int:
+    if isinstance(value, str):
+        return len(value)
+    return len(json.dumps(value, default=str, ensure_ascii=False))
+
+
+def _as_text(value: Any) -> str:
+    if isinstance(value, dict) and set(value) == {"result"}:
+        value = value["result"]
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, default=str, ensure_ascii=False, indent=1)
+
+
+class EventArchive:
+    """Full tool results removed from session history, kept for audit.
+
+    With a directory (COMPACTION_ARCHIVE_DIR by default), records are
+    appended to one JSONL file per session. Without one they are kept in
+    memory for the max_sessions most recently active sessions. Either way
+    they are dropped when SessionRetention evicts their session.
+    """
+
+    def __init__(self, directory: Optional[str] = COMPACTION_ARCHIVE_DIR, max_sessions: int = COMPACTION_ARCHIVE_SESSIONS):
+        self.directory = directory
+        self.max_sessions = max_sessions
+        self._sessions = OrderedDict()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def put(self, session_id: str, record: dict) -> str:
+        """Store a record and return its reference ("<session_id>/<id>")."""
+        ref = f"{session_id}/{uuid.uuid4().hex[:12]}"
+        record = {"ref": ref, "session_id": session_id, "archived_at": time.time(), **record}
+        if self.directory:
+            with open(self._path(session_id), "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, default=str, ensure_ascii=False) + "\n")
+        else:
+            self._sessions.setdefault(session_id, []).append(record)
+            self._sessions.move_to_end(session_id)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        return ref
+
+    def get(self, ref: str) -> Optional[dict]:
+        """Record for an archive reference, or None if unknown or expired."""
+        session_id = ref.rsplit("/", 1)[0]
+        return next((record for record in self.session_records(session_id) if record["ref"] == ref), None)
+
+    def session_records(self, session_id: str) -> list:
+        """All archived records of a session, oldest first."""
+        if not self.directory:
+            return list(self._sessions.get(session_id, []))
+        try:
+            with open(self._path(session_id), encoding="utf-8") as f:
+                return [json.loads(line) for line in f if line.strip()]
+        except FileNotFoundError:
+            return []
+
+    def drop_session(self, session_id: str):
+        """Forget a session's records and delete its file."""
+        self._sessions.pop(session_id, None)
+        if self.directory:
+            try:
+                os.remove(self._path(session_id))
+            except FileNotFoundError:
+                pass
+
+    def _path(self, session_id: str) -> str:
+        return os.path.join(self.directory, re.sub(r"[^\w.-]", "_", session_id) + ".jsonl")
+
+
+class EventCompactionPlugin(BasePlugin):
+    """Keeps verbose stage results out of the coordinator's history.
+
+    Args:
+        archive: Where raw results are kept; a fresh in-memory EventArchive by default
+        min_chars: Results at or above this size are compacted
+        summary_chars: Length of the digest left in history
+    """
+
+    def __init__(
+        self,
+        archive: Optional[EventArchive] = None,
+        min_chars: int = COMPACTION_MIN_CHARS,
+        summary_chars: int = COMPACTION_SUMMARY_CHARS,
+        name: str = "event_compaction"
+    ):
+        super().__init__(name=name)
+        self.archive = archive if archive is not None else EventArchive()
+        self.min_chars = min_chars
+        self.summary_chars = summary_chars
+
+    async def after_tool_callback(
+        self,
+        *,
+        tool: BaseTool,
+        tool_args: dict,
+        tool_context: ToolContext,
+        result: Any
+    ) -> Optional[dict]:
+        """Archive a large AgentTool result and record a compact one instead."""
+        if not isinstance(tool, AgentTool):
+            return None
+        size = _size(result)
+        if size < self.min_chars:
+            return None
+
+        ref = self.archive.put(tool_context.session.id, {
+            "kind": "tool_result",
+            "invocation_id": tool_context.invocation_id,
+            "function_call_id": tool_context.function_call_id,
+            "agent": tool_context.agent_name,
+            "tool": tool.name,
+            "args": tool_args,
+            "result": result,
+        })
+        compact = {
+            "summary": summarize_text(_as_text(result), self.summary_chars),
+            "state_keys": [key for key in output_keys(tool.agent) if key in tool_context.state],
+            "archive_ref": ref,
+        }
+        metrics.increment("compaction.tool_result", tool=tool.name)
+        metrics.observe("compaction.saved_chars", size - _size(compact), tool=tool.name)
+        return compact
+
+    async def before_model_callback(
+        self,
+        *,
+        callback_context: CallbackContext,
+        llm_request: LlmRequest
+    ) -> None:
+        """Trim oversized history in the outgoing request; the newest turn stays verbatim."""
+        if len(llm_request.contents) < 2:
+            return None
+        compacted = [self._compact_content(content) for content in llm_request.contents[:-1]]
+        llm_request.contents = compacted + llm_request.contents[-1:]
+        return None
+
+    def _compact_content(self, content: types.Content) -> types.Content:
+        parts = []
+        changed = False
+        for part in content.parts or []:
+            response = part.function_response
+            if response is not None and _size(response.response) >= self.min_chars:
+                parts.append(types.Part(function_response=types.FunctionResponse(
+                    id=response.id,
+                    name=response.name,
+                    response={"summary": summarize_text(_as_text(response.response), self.summary_chars)},
+                )))
+                changed = True
+            elif content.role == "model" and part.text and not part.thought and len(part.text) >= self.min_chars:
+                parts.append(types.Part(text=summarize_text(part.text, self.summary_chars)))
+                changed = True
+            else:
+                parts.append(part)
+        if not changed:
+            return content
+        metrics.increment("compaction.request_content")
+        return types.Content(role=content.role, parts=parts)
@@ -0,0 +1,116 @@
+"""Per-run trace of agents, model calls and tools, written through the queued structured logger.
+
+ADK's LoggingPlugin prints every event, model call and tool call
+synchronously to stdout. TraceLoggingPlugin records the same milestones
+from the public BasePlugin callbacks as one structured record each on the
+vertex_voyages.adk logger, at INFO. Records go through the background
+writer and carry the trip's log context; quiet mode (or a LOG_LEVEL above
+INFO) drops them at the isEnabledFor check, before anything is formatted.
+"""
+
+import logging
+from typing import Any, Optional
+
+from google.genai import types
+from google.adk.agents import BaseAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+from google.adk.models import LlmRequest, LlmResponse
+from google.adk.plugins.base_plugin import BasePlugin
+from google.adk.tools import BaseTool, ToolContext
+
+from utils.structured_log import get_logger
+
+
+logger = get_logger("adk")
+
+# Longest argument, result or content text kept in a trace record
+_MAX_CHARS = 300
+
+
+def _clip(value: Any) -> str:
+    text = str(value)
+    return text if len(text) <= _MAX_CHARS else text[:_MAX_CHARS] + "..."
+
+
+def _text(content: Optional[types.Content]) -> str:
+    if not content or not content.parts:
+        return ""
+    return _clip(" ".join(part.text for part in content.parts if part.text))
+
+
+class TraceLoggingPlugin(BasePlugin):
+    """Logs each run, agent, model call and tool call to vertex_voyages.adk at INFO."""
+
+    def __init__(self, name: str = "trace_logging"):
+        super().__init__(name=name)
+
+    async def before_run_callback(self, *, invocation_context: InvocationContext) -> None:
+        self._trace("run.started", f"🏃 Invocation started ({invocation_context.agent.name})",
+                    invocation_id=invocation_context.invocation_id,
+                    session_id=invocation_context.session.id,
+                    user_id=invocation_context.user_id)
+
+    async def on_event_callback(self, *, invocation_context: InvocationContext, event: Event) -> None:
+        calls = [call.name for call in event.get_function_calls()]
+        responses = [response.name for response in event.get_function_responses()]
+        self._trace("event", f"📢 Event from {event.author}",
+                    event_id=event.id, author=event.author, content=_text(event.content),
+                    function_calls=calls, function_responses=responses,
+                    final=event.is_final_response())
+
+    async def after_run_callback(self, *, invocation_context: InvocationContext) -> None:
+        self._trace("run.completed", f"✅ Invocation completed ({invocation_context.agent.name})",
+                    invocation_id=invocation_context.invocation_id)
+
+    async def before_agent_callback(self, *, agent: BaseAgent, callback_context: CallbackContext) -> None:
+        self._trace("agent.started", f"🤖 {agent.name} starting",
+                    agent=agent.name, invocation_id=callback_context.invocation_id)
+
+    async def after_agent_callback(self, *, agent: BaseAgent, callback_context: CallbackContext) -> None:
+        self._trace("agent.completed", f"🤖 {agent.name} completed",
+                    agent=agent.name, invocation_id=callback_context.invocation_id)
+
+    async def before_model_callback(self, *, callback_context: CallbackContext, llm_request: LlmRequest) -> None:
+        self._trace("model.request", f"🧠 {callback_context.agent_name} → {llm_request.model or 'default'}",
+                    agent=callback_context.agent_name, model=llm_request.model,
+                    tools=list(llm_request.tools_dict))
+
+    async def after_model_callback(self, *, callback_context: CallbackContext, llm_response: LlmResponse) -> None:
+        self._trace("model.response", f"🧠 {callback_context.agent_name} ← response",
+                    agent=callback_context.agent_name, content=_text(llm_response.content),
+                    error_code=llm_response.error_code,
+                    usage=llm_response.usage_metadata.model_dump(exclude_none=True)
+                    if llm_response.usage_metadata else None)
+
+    async def on_model_error_callback(
+        self, *, callback_context: CallbackContext, llm_request: LlmRequest, error: Exception
+    ) -> None:
+        self._trace("model.error", f"🧠 {callback_context.agent_name} model error: {error}",
+                    agent=callback_context.agent_name, error=str(error))
+
+    async def before_tool_callback(self, *, tool: BaseTool, tool_args: dict, tool_context: ToolContext) -> None:
+        self._trace("tool.started", f"🔧 {tool.name} called by {tool_context.agent_name}",
+                    tool=tool.name, agent=tool_context.agent_name,
+                    function_call_id=tool_context.function_call_id, args=_clip(tool_args))
+
+    async def after_tool_callback(
+        self, *, tool: BaseTool, tool_args: dict, tool_context: ToolContext, result: dict
+    ) -> None:
+        self._trace("tool.completed", f"🔧 {tool.name} returned",
+                    tool=tool.name, agent=tool_context.agent_name,
+                    function_call_id=tool_context.function_call_id, result=_clip(result))
+
+    async def on_tool_error_callback(
+        self, *, tool: BaseTool, tool_args: dict, tool_context: ToolContext, error: Exception
+    ) -> None:
+        self._trace("tool.error", f"🔧 {tool.name} failed: {error}",
+                    tool=tool.name, agent=tool_context.agent_name,
+                    function_call_id=tool_context.function_call_id, error=str(error))
+
+    @staticmethod
+    def _trace(event: str, message: str, **fields):
+        # Callbacks return None, so the trace never changes what the run does
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(message, extra={"event": f"adk.{event}", "fields": fields})
@@ -0,0 +1,10 @@
+"""Async HTTP planning service with Server-Sent Events streaming."""
+
+from .trips import TripManager, ServiceError
+from .http import PlanningServer
+
+__all__ = [
+    "TripManager",
+    "ServiceError",
+    "PlanningServer"
+]
@@ -0,0 +1,42 @@
+"""Run the planning service: python -m service [--host HOST] [--port PORT]."""
+
+import argparse
+import asyncio
+import signal
+
+from config import SERVICE_HOST, SERVICE_PORT, SERVICE_DRAIN_TIMEOUT
+from service.http import PlanningServer
+from utils.structured_log import ensure_logging, get_logger
+
+
+logger = get_logger("service")
+
+
+async def serve(host: str, port: int, drain_timeout: float):
+    """Serve until SIGINT/SIGTERM, then drain in-flight trips."""
+    ensure_logging()
+    server = PlanningServer(host=host, port=port)
+    await server.start()
+    logger.info(f"🌍 Vertex Voyages service listening on http://{server.host}:{server.port}")
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:
+            pass
+
+    await stop.wait()
+    logger.info(f"⏳ Draining in-flight trips (up to {drain_timeout:.0f}s)...")
+    await server.shutdown(drain_timeout)
+    logger.info("✅ Service stopped")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default=SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=SERVICE_PORT)
+    parser.add_argument("--drain-timeout", type=float, default=SERVICE_DRAIN_TIMEOUT)
+    args = parser.parse_args()
+    asyncio.run(serve(args.host, args.port, args.drain_timeout))
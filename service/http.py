@@ -0,0 +1,269 @@
+"""Minimal asyncio HTTP/1.1 front end for the planning service.
+
+Endpoints:
+    POST /trips                   Start planning a trip (for X-User-Id / X-Tenant-Id)
+    GET  /trips/{id}              Trip status
+    GET  /trips/{id}/events       Server-Sent Events stream of progress
+    POST /trips/{id}/approval     Resume a trip paused for approval (its user or tenant)
+    POST /approvals/evaluate      Settle the caller's paused trips from the approval policy
+    GET  /users/{id}/trips        Retained trips of a user (that user only)
+    GET  /users/{id}/preferences  What a user's past trips prefill (that user only)
+    GET  /tenants/{id}/trips      Retained trips of a tenant (that tenant only)
+
+Endpoints marked with an owner identify the caller by X-User-Id and
+X-Tenant-Id and answer 403 without them or for someone else's data.
+    GET  /stats                   Admission and completion counters
+    GET  /metrics                 Model latency and fallback metrics
+    GET  /memory                  Bytes held by retained sessions
+    POST /memory/snapshot         tracemalloc snapshot, diffed against the last
+"""
+
+import asyncio
+import json
+import re
+
+from config import SERVICE_HOST, SERVICE_PORT, SERVICE_DRAIN_TIMEOUT
+from service.trips import ServiceError, TripManager
+from utils.memory import memory_profiler
+from utils.metrics import metrics
+
+
+MAX_BODY_BYTES = 64 * 1024
+HEADER_TIMEOUT = 10.0  # seconds to receive the request head
+HEARTBEAT_INTERVAL = 15.0  # seconds between SSE keep-alive comments
+
+_REASONS = {
+    200: "OK", 202: "Accepted", 400: "Bad Request", 403: "Forbidden", 404: "Not Found",
+    405: "Method Not Allowed", 409: "Conflict", 413: "Payload Too Large",
+    429: "Too Many Requests", 500: "Internal Server Error", 503: "Service Unavailable",
+}
+_TRIP_PATH = re.compile(r"^/trips/([\w-]+)(/events|/approval)?$")
+_OWNER_PATH = re.compile(r"^/(users|tenants)/([\w.@-]+)/(trips|preferences)$")
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _header_int(headers: dict, name: str, default: int) -> int:
+    """Integer value of a request header; 400 if it is not one."""
+    value = headers.get(name)
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise HttpError(400, f"Invalid {name} header: {value!r}")
+
+
+def _caller(headers: dict) -> tuple:
+    """(user_id, tenant_id) of the caller; 403 if it sent neither."""
+    user_id, tenant_id = headers.get("x-user-id"), headers.get("x-tenant-id")
+    if not user_id and not tenant_id:
+        raise HttpError(403, "Send X-User-Id or X-Tenant-Id")
+    return user_id, tenant_id
+
+
+class PlanningServer:
+    """HTTP server exposing a TripManager."""
+
+    def __init__(self, manager: TripManager = None, host: str = SERVICE_HOST, port: int = SERVICE_PORT):
+        self.manager = manager or TripManager()
+        self.host = host
+        self.port = port
+        self._server = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def shutdown(self, drain_timeout: float = SERVICE_DRAIN_TIMEOUT):
+        """Stop accepting connections, then drain in-flight trips."""
+        if self._server is not None:
+            self._server.close()
+        await self.manager.drain(drain_timeout)
+        if self._server is not None:
+            await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            method, path, headers, body = await asyncio.wait_for(
+                self._read_request(reader), HEADER_TIMEOUT
+            )
+            peer = writer.get_extra_info("peername")
+            client_id = headers.get("x-client-id") or (peer[0] if peer else "unknown")
+            await self._route(method, path, headers, body, client_id, writer)
+        except HttpError as exc:
+            await self._send_json(writer, exc.status, {"error": str(exc)})
+        except ServiceError as exc:
+            extra = {"Retry-After": "1"} if exc.status in (429, 503) else None
+            await self._send_json(writer, exc.status, {"error": str(exc)}, extra)
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except Exception as exc:
+            await self._send_json(writer, 500, {"error": str(exc)})
+        finally:
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except (ConnectionError, RuntimeError):
+                pass
+
+    async def _read_request(self, reader: asyncio.StreamReader):
+        request_line = (await reader.readline()).decode("latin-1").strip()
+        if not request_line:
+            raise asyncio.IncompleteReadError(b"", None)
+        try:
+            method, target, _ = request_line.split(" ", 2)
+        except ValueError:
+            raise HttpError(400, "Malformed request line")
+
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1")
+            if line in ("\r\n", "\n", ""):
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        length = _header_int(headers, "content-length", 0)
+        if length < 0:
+            raise HttpError(400, f"Invalid content-length header: {length}")
+        if length > MAX_BODY_BYTES:
+            raise HttpError(413, "Request body too large")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), target.split("?", 1)[0], headers, body
+
+    async def _route(self, method, path, headers, body, client_id, writer):
+        if path == "/trips":
+            if method != "POST":
+                raise HttpError(405, "Use POST /trips")
+            params = self._parse_json(body)
+            for field, header in (("user_id", "x-user-id"), ("tenant_id", "x-tenant-id")):
+                if headers.get(header) and not params.get(field):
+                    params[field] = headers[header]
+            trip = await self.manager.start_trip(client_id, params)
+            await self._send_json(writer, 202, {
+                **trip.to_dict(),
+                "events_url": f"/trips/{trip.trip_id}/events",
+            })
+            return
+
+        if path == "/approvals/evaluate":
+            if method != "POST":
+                raise HttpError(405, "Use POST /approvals/evaluate")
+            user_id, tenant_id = _caller(headers)
+            await self._send_json(writer, 200, await self.manager.evaluate_pending(user_id, tenant_id))
+            return
+
+        if path == "/stats" and method == "GET":
+            await self._send_json(writer, 200, self.manager.stats())
+            return
+
+        if path == "/metrics" and method == "GET":
+            await self._send_json(writer, 200, metrics.snapshot())
+            return
+
+        if path == "/memory" and method == "GET":
+            await self._send_json(writer, 200, await self.manager.memory())
+            return
+
+        if path == "/memory/snapshot" and method == "POST":
+            await self._send_json(writer, 200, memory_profiler.snapshot())
+            return
+
+        match = _OWNER_PATH.match(path)
+        if match and method == "GET":
+            kind, owner, view = match.groups()
+            user_id, tenant_id = _caller(headers)
+            if owner != (user_id if kind == "users" else tenant_id):
+                raise HttpError(403, f"Not allowed to read {path}")
+            if view == "trips":
+                trips = self.manager.user_trips(**{"user_id" if kind == "users" else "tenant_id": owner})
+                await self._send_json(writer, 200, {"trips": trips})
+            elif kind == "users":
+                await self._send_json(writer, 200, self.manager.preferences(owner))
+            else:
+                raise HttpError(404, f"No route for {path}")
+            return
+
+        match = _TRIP_PATH.match(path)
+        if not match:
+            raise HttpError(404, f"No route for {path}")
+        trip_id, action = match.groups()
+
+        if action is None and method == "GET":
+            await self._send_json(writer, 200, self.manager.get(trip_id).to_dict())
+        elif action == "/events" and method == "GET":
+            last_event_id = _header_int(headers, "last-event-id", -1)
+            await self._stream_events(writer, trip_id, last_event_id)
+        elif action == "/approval" and method == "POST":
+            payload = self._parse_json(body)
+            if not isinstance(payload.get("approved"), bool):
+                raise HttpError(400, "Body must contain a boolean 'approved'")
+            self.manager.authorize(trip_id, *_caller(headers))
+            trip = await self.manager.submit_approval(trip_id, payload["approved"])
+            await self._send_json(writer, 200, trip.to_dict())
+        else:
+            raise HttpError(405, f"{method} not allowed on {path}")
+
+    async def _stream_events(self, writer: asyncio.StreamWriter, trip_id: str, last_event_id: int):
+        trip = self.manager.get(trip_id)
+        subscription = trip.subscribe(last_event_id)
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: text/event-stream\r\n"
+            b"Cache-Control: no-cache\r\n"
+            b"Connection: close\r\n\r\n"
+        )
+        try:
+            await writer.drain()
+            while True:
+                try:
+                    message = await asyncio.wait_for(subscription.get(), HEARTBEAT_INTERVAL)
+                except asyncio.TimeoutError:
+                    writer.write(b": keep-alive\n\n")
+                    await writer.drain()
+                    continue
+                if message is None:
+                    break
+                seq, event_type, data = message
+                writer.write(f"id: {seq}\nevent: {event_type}\ndata: {data}\n\n".encode("utf-8"))
+                # drain() applies TCP backpressure: a slow reader fills its
+                # bounded queue and is eventually dropped by Trip.publish.
+                await writer.drain()
+        finally:
+            trip.unsubscribe(subscription)
+
+    @staticmethod
+    def _parse_json(body: bytes) -> dict:
+        try:
+            payload = json.loads(body or b"{}")
+        except json.JSONDecodeError:
+            raise HttpError(400, "Body must be valid JSON")
+        if not isinstance(payload, dict):
+            raise HttpError(400, "Body must be a JSON object")
+        return payload
+
+    @staticmethod
+    async def _send_json(writer: asyncio.StreamWriter, status: int, payload: dict, extra_headers: dict = None):
+        body = json.dumps(payload).encode("utf-8")
+        head = [
+            f"HTTP/1.1 {status} {_REASONS.get(status, 'OK')}",
+            "Content-Type: application/json",
+            f"Content-Length: {len(body)}",
+            "Connection: close",
+        ]
+        head += [f"{name}: {value}" for name, value in (extra_headers or {}).items()]
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
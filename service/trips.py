@@ -0,0 +1,524 @@
+"""Trip lifecycle management for the planning service.
+
+Each trip runs the regular plan_trip workflow (main.run_trip) in its own
+task, in the session partition of the user who requested it ("user_id",
+DEFAULT_USER_ID if none). Progress is published to an append-only history
+that subscribers replay and then follow live through bounded queues.
+"""
+
+import asyncio
+import json
+import time
+import uuid
+from collections import OrderedDict, defaultdict
+
+from config import (
+    APP_NAME,
+    DEFAULT_USER_ID,
+    SERVICE_MAX_ACTIVE_TRIPS,
+    SERVICE_MAX_TRIPS_PER_CLIENT,
+    SERVICE_EVENT_QUEUE_SIZE,
+    SERVICE_SEND_TIMEOUT,
+    APPROVAL_TIMEOUT
+)
+from main import (
+    session_service,
+    checkpoint_store,
+    session_retention,
+    session_directory,
+    user_memory,
+    create_runner,
+    create_template_runner,
+    create_trip_session,
+    remember_trip,
+    build_trip_legs,
+    build_trip_query,
+    run_trip
+)
+from tools.approval_policy import approval_policy
+from tools.currency import rate_table, UnknownCurrency
+from tools.plan_templates import template_trip_state
+from tools.search import trip_search_stats
+from utils.memory import memory_profiler, session_memory
+from utils.structured_log import get_logger, log_context
+
+
+REQUIRED_FIELDS = ["user_query", "destination", "travel_dates", "num_days"]
+FINISHED_TRIP_RETENTION = 1000  # finished trips kept for late subscribers
+
+logger = get_logger("service.trips")
+
+
+class ServiceError(Exception):
+    """Base error carrying the HTTP status returned to the client."""
+
+    status = 500
+
+
+class InvalidTripRequest(ServiceError):
+    status = 400
+
+
+class TripNotFound(ServiceError):
+    status = 404
+
+
+class Forbidden(ServiceError):
+    status = 403
+
+
+class ApprovalNotPending(ServiceError):
+    status = 409
+
+
+class TooManyTrips(ServiceError):
+    status = 429
+
+
+class ServiceDraining(ServiceError):
+    status = 503
+
+
+def _owned_by(owner: tuple, user_id: str = None, tenant_id: str = None) -> bool:
+    """Whether a caller with these ids may act on something owned by (user_id, tenant_id)."""
+    return bool(user_id and user_id == owner[0]) or bool(tenant_id and tenant_id == owner[1])
+
+
+def summarize_event(event) -> dict:
+    """Reduce an ADK event to the fields streamed to clients.
+
+    Args:
+        event: Event object from agent execution
+
+    Returns:
+        JSON-serialisable dictionary describing the event
+    """
+    parts = event.content.parts if event.content and event.content.parts else []
+    return {
+        "author": event.author,
+        "text": [part.text for part in parts if part.text],
+        "function_calls": [part.function_call.name for part in parts if part.function_call],
+        "function_responses": [part.function_response.name for part in parts if part.function_response],
+        "final": event.is_final_response(),
+    }
+
+
+class Subscription:
+    """Bounded queue feeding one SSE client."""
+
+    def __init__(self, maxsize: int):
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = False
+
+    async def get(self):
+        """Next (seq, event_type, data) tuple, or None when the stream ends."""
+        return await self.queue.get()
+
+    def close(self):
+        """End the stream, discarding anything the client has not read."""
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+
+class Trip:
+    """State of a single planning run."""
+
+    def __init__(
+        self,
+        trip_id: str,
+        client_id: str,
+        params: dict,
+        user_id: str = DEFAULT_USER_ID,
+        tenant_id: str = None
+    ):
+        self.trip_id = trip_id
+        self.client_id = client_id
+        self.params = params
+        self.user_id = user_id
+        self.tenant_id = tenant_id
+        self.request = None  # plan_trip parameters the trip runs with
+        self.reused_stages = []
+        self.status = "running"
+        self.history = []
+        self.subscribers = set()
+        self.approval = None
+        self.approval_request = None
+        self.approval_decision = None
+        self.task = None
+        self.template = None  # "key/season/days" of the plan template the trip started from
+        self.created_at = time.monotonic()
+        self.finished_at = None
+
+    async def publish(self, event_type: str, data: dict, send_timeout: float = SERVICE_SEND_TIMEOUT):
+        """Append an event to the history and push it to every subscriber.
+
+        A subscriber whose queue stays full for send_timeout is
+        disconnected instead of stalling the trip. It can reconnect with
+        Last-Event-ID and replay what it missed from the history.
+        """
+        message = (len(self.history), event_type, json.dumps(data, default=str))
+        self.history.append(message)
+        for subscription in list(self.subscribers):
+            try:
+                await asyncio.wait_for(subscription.queue.put(message), send_timeout)
+            except asyncio.TimeoutError:
+                subscription.dropped = True
+                self.subscribers.discard(subscription)
+                subscription.close()
+
+    def subscribe(self, last_event_id: int = -1, maxsize: int = SERVICE_EVENT_QUEUE_SIZE) -> Subscription:
+        """Create a subscription that first replays events after last_event_id."""
+        backlog = self.history[last_event_id + 1:]
+        subscription = Subscription(maxsize=max(maxsize, len(backlog) + 1))
+        for message in backlog:
+            subscription.queue.put_nowait(message)
+        if self.finished_at is None:
+            self.subscribers.add(subscription)
+        else:
+            subscription.queue.put_nowait(None)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self.subscribers.discard(subscription)
+
+    def close(self):
+        self.finished_at = time.monotonic()
+        for subscription in list(self.subscribers):
+            if subscription.queue.full():
+                subscription.close()
+            else:
+                subscription.queue.put_nowait(None)
+        self.subscribers.clear()
+
+    def to_dict(self) -> dict:
+        return {
+            "trip_id": self.trip_id,
+            "user_id": self.user_id,
+            "tenant_id": self.tenant_id,
+            "status": self.status,
+            "destination": self.params.get("destination"),
+            "template": self.template,
+            "reused_stages": self.reused_stages,
+            "events": len(self.history),
+            "awaiting_approval": self.approval is not None and not self.approval.done(),
+        }
+
+
+class TripManager:
+    """Admits, runs, and drains trips for the HTTP service.
+
+    Admission is bounded globally (max_active_trips) and per client
+    (max_trips_per_client); requests beyond either limit are rejected
+    with TooManyTrips so callers can back off and retry.
+    """
+
+    def __init__(
+        self,
+        runner=None,
+        max_active_trips: int = SERVICE_MAX_ACTIVE_TRIPS,
+        max_trips_per_client: int = SERVICE_MAX_TRIPS_PER_CLIENT,
+        approval_timeout: float = APPROVAL_TIMEOUT
+    ):
+        self._runner = runner
+        self._template_runner = None
+        self.max_active_trips = max_active_trips
+        self.max_trips_per_client = max_trips_per_client
+        self.approval_timeout = approval_timeout
+        self._trips = {}
+        self._finished = OrderedDict()
+        self._active = set()
+        self._per_client = defaultdict(int)
+        self._draining = False
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    @property
+    def runner(self):
+        if self._runner is None:
+            self._runner = create_runner()
+        return self._runner
+
+    @property
+    def template_runner(self):
+        if self._template_runner is None:
+            self._template_runner = create_template_runner()
+        return self._template_runner
+
+    @property
+    def draining(self) -> bool:
+        return self._draining
+
+    def get(self, trip_id: str) -> Trip:
+        trip = self._trips.get(trip_id)
+        if trip is None:
+            raise TripNotFound(f"Unknown trip: {trip_id}")
+        return trip
+
+    async def start_trip(self, client_id: str, params: dict) -> Trip:
+        """Admit a trip request and start planning it in the background.
+
+        Args:
+            client_id: Caller identity used for per-client limits
+            params: plan_trip keyword arguments (auto_approve is ignored);
+                fields a returning user leaves out are prefilled from
+                their past trips
+
+        Returns:
+            The running Trip
+        """
+        if self._draining:
+            self.rejected += 1
+            raise ServiceDraining("Service is draining; retry on another instance")
+        if params.get("legs"):
+            params = self._with_legs(params)
+        user_id = params.get("user_id") or DEFAULT_USER_ID
+        tenant_id = params.get("tenant_id") or user_memory.preferences(user_id).get("tenant_id")
+        params = user_memory.prefill(user_id, params)
+        missing = [field for field in REQUIRED_FIELDS if field not in params]
+        if missing:
+            raise InvalidTripRequest(f"Missing fields: {', '.join(missing)}")
+        for field in ("num_days", "num_travelers"):
+            params[field] = self._count(params, field)
+        try:
+            rate_table.rate(params["currency"])
+        except (UnknownCurrency, AttributeError):
+            raise InvalidTripRequest(f"Unsupported currency: {params.get('currency')}")
+        if len(self._active) >= self.max_active_trips:
+            self.rejected += 1
+            raise TooManyTrips("Service at capacity")
+        if self._per_client[client_id] >= self.max_trips_per_client:
+            self.rejected += 1
+            raise TooManyTrips(f"Client {client_id} has {self.max_trips_per_client} trips in flight")
+
+        trip_id = f"trip_{uuid.uuid4().hex[:8]}"
+        trip = Trip(trip_id, client_id, params, user_id, tenant_id)
+        self._trips[trip_id] = trip
+        self._active.add(trip)
+        self._per_client[client_id] += 1
+
+        try:
+            trip.request = {
+                "user_query": params["user_query"],
+                "destination": params["destination"],
+                "travel_dates": params["travel_dates"],
+                "num_days": params["num_days"],
+                "num_travelers": params["num_travelers"],
+                "accommodation_level": params["accommodation_level"],
+                "legs": params.get("legs"),
+                "currency": params["currency"]
+            }
+            template = template_trip_state(**{
+                key: value for key, value in trip.request.items() if key != "user_query"
+            })
+            if template is not None:
+                trip.template = template["plan_template"]
+            # The checkpoint stays on disk unless the trip completes, for main.resume_trip
+            trip.reused_stages = await create_trip_session(trip_id, trip.request, user_id, tenant_id, template)
+        except Exception:
+            self._release(trip)
+            del self._trips[trip_id]
+            checkpoint_store.finish(trip_id)
+            raise
+
+        # The task copies the current context, so everything it logs carries the trip ids
+        with log_context(trip_id=trip_id, session_id=trip_id, client_id=client_id):
+            trip.task = asyncio.create_task(self._run(trip))
+        return trip
+
+    def authorize(self, trip_id: str, user_id: str = None, tenant_id: str = None) -> Trip:
+        """The trip, if the caller is its user or in its tenant; Forbidden otherwise."""
+        trip = self.get(trip_id)
+        owner = session_directory.owner(trip_id) or (trip.user_id, trip.tenant_id)
+        if not _owned_by(owner, user_id, tenant_id):
+            raise Forbidden(f"Trip {trip_id} belongs to another user")
+        return trip
+
+    def user_trips(self, user_id: str = None, tenant_id: str = None) -> list:
+        """Retained trips of a user or a tenant, oldest first."""
+        return [
+            self._trips[session_id].to_dict()
+            for session_id in session_directory.sessions(user_id, tenant_id)
+            if session_id in self._trips
+        ]
+
+    def preferences(self, user_id: str) -> dict:
+        """What a user's past trips say about the next one (see UserMemory.preferences)."""
+        return {"user_id": user_id, **user_memory.preferences(user_id)}
+
+    async def submit_approval(self, trip_id: str, approved: bool) -> Trip:
+        """Resolve a trip paused on adk_request_confirmation."""
+        trip = self.get(trip_id)
+        if trip.approval is None or trip.approval.done():
+            raise ApprovalNotPending(f"Trip {trip_id} is not awaiting approval")
+        trip.approval.set_result(bool(approved))
+        return trip
+
+    async def evaluate_pending(self, user_id: str = None, tenant_id: str = None) -> dict:
+        """Run every trip awaiting approval through the approval policy at once.
+
+        The policy file is reloaded first, so a rule or envelope added for
+        a queue of paused trips settles them in one call. Trips the policy
+        still sends to review stay paused.
+
+        Args:
+            user_id: Only settle this user's trips (and tenant_id's, if given)
+            tenant_id: Only settle this tenant's trips (and user_id's, if given)
+
+        Returns:
+            Dictionary with the decision per trip_id and counts per action
+        """
+        approval_policy.reload()
+        scoped = user_id is not None or tenant_id is not None
+        pending = [
+            trip for trip in self._active
+            if trip.approval is not None and not trip.approval.done() and trip.approval_request
+            and (not scoped or _owned_by((trip.user_id, trip.tenant_id), user_id, tenant_id))
+        ]
+        decisions = approval_policy.evaluate_batch([trip.approval_request for trip in pending])
+        counts = {"approve": 0, "reject": 0, "review": 0}
+        for trip, decision in zip(pending, decisions):
+            counts[decision["action"]] += 1
+            if decision["action"] != "review":
+                trip.approval_decision = decision
+                trip.approval.set_result(decision["action"] == "approve")
+        return {
+            "evaluated": len(pending),
+            **counts,
+            "decisions": {trip.trip_id: decision for trip, decision in zip(pending, decisions)},
+        }
+
+    async def drain(self, timeout: float):
+        """Stop admitting trips and wait for in-flight ones to finish.
+
+        Trips still running after timeout are cancelled.
+        """
+        self._draining = True
+        tasks = [trip.task for trip in self._active if trip.task]
+        if not tasks:
+            return
+        _, pending = await asyncio.wait(tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {
+            "active": len(self._active),
+            "awaiting_approval": sum(1 for trip in self._active if trip.status == "awaiting_approval"),
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "draining": self._draining,
+        }
+
+    async def memory(self, top: int = 10) -> dict:
+        """Bytes held by retained sessions, after evicting any past the retention limits."""
+        await session_retention.evict()
+        return {
+            "sessions": session_memory(session_service, top),
+            "retention": session_retention.stats(),
+            "directory": session_directory.stats(),
+            "retained_trips": len(self._trips),
+            "tracing": memory_profiler.tracing,
+        }
+
+    @staticmethod
+    def _count(params: dict, field: str) -> int:
+        """A positive whole-number field of a request, e.g. num_days."""
+        value = params[field]
+        text = str(value).strip()
+        if isinstance(value, bool) or not text.isdecimal() or int(text) < 1:
+            raise InvalidTripRequest(f"{field} must be a whole number of at least 1, not {value!r}")
+        return int(text)
+
+    @staticmethod
+    def _with_legs(params: dict) -> dict:
+        """Derive destination and num_days for a multi-city request."""
+        if "travel_dates" not in params:
+            raise InvalidTripRequest("Missing fields: travel_dates")
+        try:
+            legs = build_trip_legs(params["legs"], params["travel_dates"])
+        except (KeyError, TypeError, ValueError):
+            raise InvalidTripRequest("Each leg needs a destination and num_days")
+        return {
+            **params,
+            "legs": legs,
+            "destination": " → ".join(leg["destination"] for leg in legs),
+            "num_days": sum(leg["num_days"] for leg in legs),
+        }
+
+    async def _run(self, trip: Trip):
+        request = trip.request
+        query_content = build_trip_query(**request)
+
+        async def decide_approval(approval_info):
+            return await self._await_approval(trip, approval_info)
+
+        await trip.publish("trip.started", trip.to_dict())
+        logger.info("Trip started: %s", request["destination"], extra={"event": "trip.started"})
+        try:
+            runner = self.runner if trip.template is None else self.template_runner
+            async for event in run_trip(runner, trip.trip_id, query_content, decide_approval, trip.user_id):
+                await trip.publish("agent.event", summarize_event(event))
+            trip.status = "complete"
+            self.completed += 1
+            checkpoint_store.finish(trip.trip_id)
+            await remember_trip(trip.trip_id, request, trip.user_id, trip.tenant_id)
+            await trip.publish("trip.completed", trip.to_dict())
+            logger.info("Trip complete", extra={
+                "event": "trip.completed",
+                "fields": {"searches": trip_search_stats(trip.trip_id)}
+            })
+        except asyncio.CancelledError:
+            trip.status = "cancelled"
+            self.failed += 1
+            logger.warning("Trip cancelled", extra={"event": "trip.cancelled"})
+            raise
+        except Exception as exc:
+            trip.status = "failed"
+            self.failed += 1
+            logger.exception("Trip failed: %s", exc, extra={"event": "trip.failed"})
+            await trip.publish("trip.failed", {"trip_id": trip.trip_id, "error": str(exc)})
+        finally:
+            self._release(trip)
+            trip.close()
+            self._retain(trip)
+            await session_retention.release(APP_NAME, trip.user_id, trip.trip_id)
+
+    async def _await_approval(self, trip: Trip, approval_info: dict):
+        trip.status = "awaiting_approval"
+        trip.approval = asyncio.get_running_loop().create_future()
+        trip.approval_request = approval_info.get("payload")
+        trip.approval_decision = None
+        await trip.publish("approval.required", {
+            "trip_id": trip.trip_id,
+            "approval_id": approval_info["approval_id"],
+            "request": trip.approval_request,
+        })
+        try:
+            approved = await asyncio.wait_for(trip.approval, self.approval_timeout)
+        except asyncio.TimeoutError:
+            approved = False
+        trip.status = "running"
+        trip.approval_request = None
+        await trip.publish("approval.resolved", {
+            "trip_id": trip.trip_id,
+            "approved": approved,
+            "policy": trip.approval_decision,
+        })
+        # The resumed tool records the policy's reason rather than a human's
+        return trip.approval_decision or approved
+
+    def _release(self, trip: Trip):
+        self._active.discard(trip)
+        self._per_client[trip.client_id] -= 1
+        if self._per_client[trip.client_id] <= 0:
+            del self._per_client[trip.client_id]
+
+    def _retain(self, trip: Trip):
+        self._finished[trip.trip_id] = trip
+        while len(self._finished) > FINISHED_TRIP_RETENTION:
+            expired_id, _ = self._finished.popitem(last=False)
+            self._trips.pop(expired_id, None)
@@ -3,9 +3,13 @@
 from .budget_calculator import calculate_trip_budget
 from .destination_validator import validate_destination
 from .booking_approval import request_booking_approval
+from .itinerary_optimizer import optimize_itinerary
+from .search import web_search
 
 __all__ = [
     "calculate_trip_budget",
     "destination_validator",
-    "request_booking_approval"
+    "request_booking_approval",
+    "optimize_itinerary",
+    "web_search"
 ]
@@ -0,0 +1,214 @@
+"""Standing approval policies, checked before a booking pauses for a human.
+
+Every booking above a fixed threshold used to pause the workflow and
+resume it with another run_async pass. A policy file (APPROVAL_POLICY_FILE)
+records what would have been approved anyway:
+
+- thresholds per tenant and per user (the user's wins, then the tenant's,
+  then the default, which is APPROVAL_THRESHOLD unless the file sets it)
+- rules matched in order (user, tenant, default) on destination, traveler
+  count and cost, with the action "approve", "reject" or "review"
+- budget envelopes: pre-approved amounts a tenant or user draws down until
+  they run out or expire
+
+A booking's first matching rule decides it when the rule rejects or sends
+it to review, so a rule like "groups of 9 or more need review" applies
+under the threshold too. Otherwise it is approved within its threshold,
+else by a matching "approve" rule, else from an envelope with enough
+left; only what remains goes to human review. Policies are compiled once per (user, tenant) into sets and
+tuples, so an evaluation is a few comparisons. Amounts are in
+BASE_CURRENCY. Envelope balances are kept in memory by this process.
+
+An envelope debits each booking once: requests carry a booking_id (the
+trip's session), and evaluating the same booking again - a repeated tool
+call, a resumed trip, evaluate_pending followed by the resumed tool -
+replaces its earlier draw instead of adding another.
+"""
+
+import json
+from datetime import date
+from typing import Optional
+
+from config import APPROVAL_POLICY_FILE, APPROVAL_THRESHOLD
+from utils.cache import TTLCache
+from utils.metrics import metrics
+
+
+ACTIONS = ("approve", "reject", "review")
+
+
+def destination_keys(destination: str) -> list:
+    """City keys of a destination, one per leg: "Tokyo, Japan → Kyoto" -> ["tokyo", "kyoto"]."""
+    return [leg.split(",")[0].strip().lower() for leg in destination.split("→") if leg.strip()]
+
+
+class Envelope:
+    """A pre-approved budget, optionally limited to destinations and a date."""
+
+    def __init__(self, spec: dict):
+        self.id = spec["id"]
+        self.amount = float(spec["amount"])
+        self.remaining = float(spec.get("remaining", self.amount))
+        self.destinations = frozenset(d.lower() for d in spec["destinations"]) if spec.get("destinations") else None
+        self.expires = date.fromisoformat(spec["expires"]) if spec.get("expires") else None
+        # booking_id -> amount drawn, so re-evaluating a booking debits it once
+        self.draws = {}
+
+    def covers(self, cities: list, total: float, today: date, booking_id: Optional[str] = None) -> bool:
+        if self.expires is not None and today > self.expires:
+            return False
+        if self.destinations is not None and not all(city in self.destinations for city in cities):
+            return False
+        return total <= self.remaining + self.draws.get(booking_id, 0.0)
+
+    def draw(self, total: float, booking_id: Optional[str] = None):
+        """Debit total, replacing the booking's earlier draw if it has one."""
+        self.remaining += self.draws.pop(booking_id, 0.0) - total
+        if booking_id is not None:
+            self.draws[booking_id] = total
+
+
+class _Rule:
+    def __init__(self, spec: dict):
+        if spec.get("action") not in ACTIONS:
+            raise ValueError(f"Approval rule {spec.get('id')!r} needs an action in {ACTIONS}")
+        self.id = spec.get("id", spec["action"])
+        self.action = spec["action"]
+        self.destinations = frozenset(d.lower() for d in spec["destinations"]) if spec.get("destinations") else None
+        self.min_travelers = spec.get("min_travelers", 0)
+        self.max_travelers = spec.get("max_travelers", float("inf"))
+        self.min_total = spec.get("min_total", 0.0)
+        self.max_total = spec.get("max_total", float("inf"))
+
+    def matches(self, cities: list, travelers: int, total: float) -> bool:
+        return (
+            self.min_travelers <= travelers <= self.max_travelers
+            and self.min_total <= total <= self.max_total
+            and (self.destinations is None or all(city in self.destinations for city in cities))
+        )
+
+
+class CompiledPolicy:
+    """The effective policy of one (user, tenant): threshold, rules, envelopes."""
+
+    def __init__(self, threshold: float, rules: tuple, envelopes: tuple):
+        self.threshold = threshold
+        self.rules = rules
+        self.envelopes = envelopes
+
+    def evaluate(self, cities: list, travelers: int, total: float, today: date,
+                 booking_id: Optional[str] = None) -> dict:
+        rule = next((rule for rule in self.rules if rule.matches(cities, travelers, total)), None)
+        # Reject and review rules override the threshold; approve rules only matter above it
+        if rule is not None and (rule.action != "approve" or total > self.threshold):
+            return {"action": rule.action, "reason": f"rule_{rule.action}", "rule": rule.id,
+                    "threshold": self.threshold}
+        if total <= self.threshold:
+            return {"action": "approve", "reason": "within_threshold", "threshold": self.threshold}
+        for envelope in self.envelopes:
+            if envelope.covers(cities, total, today, booking_id):
+                envelope.draw(total, booking_id)
+                return {"action": "approve", "reason": "budget_envelope", "envelope": envelope.id,
+                        "envelope_remaining": round(envelope.remaining, 2), "threshold": self.threshold}
+        return {"action": "review", "reason": "above_threshold", "threshold": self.threshold}
+
+
+class ApprovalPolicy:
+    """Approval policies from a spec with "default", "tenants" and "users" sections.
+
+    Args:
+        spec: Parsed policy file (see data/approval_policies.json)
+        today: Date envelopes are checked against when a call passes none
+            (default the real date); benchmarks/evaluate.py pins it
+    """
+
+    def __init__(self, spec: Optional[dict] = None, today: Optional[date] = None):
+        spec = spec or {}
+        self.today = today
+        self.default = spec.get("default", {})
+        self.tenants = spec.get("tenants", {})
+        self.users = spec.get("users", {})
+        # Envelopes are shared by everyone drawing on them, so build each once;
+        # compiled policies are cheap to rebuild and bounded by recent users
+        self._envelopes = {}
+        self._compiled = TTLCache(maxsize=4096, ttl=3600.0)
+
+    @classmethod
+    def from_file(cls, path: str = APPROVAL_POLICY_FILE) -> "ApprovalPolicy":
+        try:
+            with open(path, encoding="utf-8") as f:
+                return cls(json.load(f))
+        except FileNotFoundError:
+            return cls()
+
+    def reload(self, path: str = APPROVAL_POLICY_FILE):
+        """Re-read the policy file; envelopes already drawn down keep their balance."""
+        fresh = ApprovalPolicy.from_file(path)
+        self.default, self.tenants, self.users = fresh.default, fresh.tenants, fresh.users
+        self._compiled.clear()
+
+    def policy_for(self, user_id: Optional[str] = None, tenant_id: Optional[str] = None) -> CompiledPolicy:
+        """Compiled policy of a user; the user's own "tenant" applies if tenant_id is None."""
+        key = (user_id, tenant_id)
+        policy = self._compiled.get(key)
+        if policy is None:
+            policy = self._compile(user_id, tenant_id)
+            self._compiled.set(key, policy)
+        return policy
+
+    def evaluate(self, request: dict, today: Optional[date] = None) -> dict:
+        """Decide one booking without asking a human if the policy allows.
+
+        Args:
+            request: Dictionary with destination, num_travelers and
+                total_cost_usd, plus optional user_id, tenant_id and
+                booking_id (envelopes debit each booking_id once)
+            today: Date envelopes are checked against (default self.today, else today)
+
+        Returns:
+            Dictionary with action ("approve", "reject" or "review"),
+            reason, and the rule or envelope that decided it
+        """
+        policy = self.policy_for(request.get("user_id"), request.get("tenant_id"))
+        decision = policy.evaluate(
+            destination_keys(request.get("destination", "")),
+            int(request.get("num_travelers", 1)),
+            float(request["total_cost_usd"]),
+            today or self.today or date.today(),
+            request.get("booking_id"),
+        )
+        metrics.increment("approval.policy", action=decision["action"], reason=decision["reason"])
+        return decision
+
+    def evaluate_batch(self, requests: list, today: Optional[date] = None) -> list:
+        """Decide many pending bookings in one call, in order (envelopes draw down in turn)."""
+        today = today or self.today or date.today()
+        return [self.evaluate(request, today) for request in requests]
+
+    def _compile(self, user_id: Optional[str], tenant_id: Optional[str]) -> CompiledPolicy:
+        user = self.users.get(user_id, {}) if user_id else {}
+        tenant_id = tenant_id or user.get("tenant")
+        tenant = self.tenants.get(tenant_id, {}) if tenant_id else {}
+        levels = [(f"user:{user_id}", user), (f"tenant:{tenant_id}", tenant), ("default", self.default)]
+
+        threshold = next(
+            (float(level["threshold"]) for _, level in levels if "threshold" in level),
+            APPROVAL_THRESHOLD,
+        )
+        rules = tuple(_Rule(spec) for _, level in levels for spec in level.get("rules", []))
+        envelopes = tuple(
+            self._envelope(owner, spec)
+            for owner, level in levels[:2]
+            for spec in level.get("envelopes", [])
+        )
+        return CompiledPolicy(threshold, rules, envelopes)
+
+    def _envelope(self, owner: str, spec: dict) -> Envelope:
+        key = (owner, spec["id"])
+        if key not in self._envelopes:
+            self._envelopes[key] = Envelope(spec)
+        return self._envelopes[key]
+
+
+# Shared by every tool call in the process
+approval_policy = ApprovalPolicy.from_file()
@@ -1,7 +1,9 @@
 """Booking approval tool for long-running operations."""
 
 from google.adk.tools import ToolContext
-from config import APPROVAL_THRESHOLD
+from config import BASE_CURRENCY
+from tools.approval_policy import approval_policy
+from tools.currency import rate_table, format_money
 
 
 def request_booking_approval(
@@ -10,72 +12,122 @@ def request_booking_approval(
     num_travelers: int,
     tool_context: ToolContext
 ) -> dict:
-    """Requests human approval for expensive bookings (>$1000).
-    
-    This is a long-running operation that pauses the agent workflow
-    and waits for human confirmation before proceeding.
-    
+    """Requests human approval for bookings the approval policy cannot decide.
+
+    The traveler's standing policy (threshold, rules, budget envelopes) is
+    checked first; only bookings it sends to review pause the agent
+    workflow and wait for human confirmation.
+
     Args:
-        total_cost: Total trip cost in USD
+        total_cost: Total trip cost in the trip's currency (as quoted by the budget)
         destination: Destination name
         num_travelers: Number of travelers
         tool_context: Context for pause/resume functionality
-    
+
     Returns:
         Dictionary with approval status
     """
-    
-    # SCENARIO 1: Cost under threshold - auto-approve
-    if total_cost <= APPROVAL_THRESHOLD:
-        tool_context.state["booking_approved"] = True
-        tool_context.state["approval_reason"] = "auto_approved"
-        return {
-            "status": "approved",
-            "reason": "auto_approved",
-            "message": f"Booking auto-approved (${total_cost:.2f} ≤ ${APPROVAL_THRESHOLD})",
-            "total_cost": total_cost
-        }
-    
-    # SCENARIO 2: First call - request approval and PAUSE
+    # Policies are set in BASE_CURRENCY; compare in it, quote in the trip's currency
+    currency = tool_context.state.get("currency", BASE_CURRENCY)
+    total_base = round(rate_table.convert(total_cost, currency, BASE_CURRENCY), 2)
+    total = format_money(total_cost, currency)
+
     if not tool_context.tool_confirmation:
         approval_details = {
             "destination": destination,
             "num_travelers": num_travelers,
             "total_cost": total_cost,
-            "threshold": APPROVAL_THRESHOLD
+            "currency": currency,
+            "total_cost_usd": total_base,
+            "user_id": tool_context.state.get("user_id") or tool_context.user_id,
+            "tenant_id": tool_context.state.get("tenant_id"),
+            # Envelopes debit a booking once however often it is evaluated
+            "booking_id": tool_context.state.get("trip_id") or tool_context.session.id
         }
-        
+        decision = approval_policy.evaluate(approval_details)
+        threshold = format_money(rate_table.convert(decision["threshold"], BASE_CURRENCY, currency), currency)
+
+        # SCENARIO 1: Cost under threshold - auto-approve
+        if decision["reason"] == "within_threshold":
+            tool_context.state["booking_approved"] = True
+            tool_context.state["approval_reason"] = "auto_approved"
+            return {
+                "status": "approved",
+                "reason": "auto_approved",
+                "message": f"Booking auto-approved ({total} ≤ {threshold})",
+                "total_cost": total_cost,
+                "currency": currency
+            }
+
+        # SCENARIO 2: Standing policy rule or budget envelope decides - no pause
+        if decision["action"] != "review":
+            return _policy_result(decision, total_cost, currency, total, tool_context)
+
+        # SCENARIO 3: First call - request approval and PAUSE
+        # (above the threshold, or a review rule matched)
+        approval_details["threshold"] = decision["threshold"]
+        if decision.get("rule"):
+            approval_details["rule"] = decision["rule"]
+            why = f"policy rule {decision['rule']}"
+        else:
+            why = f"{total} > {threshold}"
+        tool_context.state["approval_reason"] = "awaiting_approval"
         tool_context.request_confirmation(
-            hint=f"⚠️ High-cost booking detected!\n"
+            hint=f"⚠️ Booking needs review ({why})!\n"
                  f"Destination: {destination}\n"
                  f"Travelers: {num_travelers}\n"
-                 f"Total Cost: ${total_cost:.2f}\n"
-                 f"Threshold: ${APPROVAL_THRESHOLD}\n\n"
+                 f"Total Cost: {total}\n"
+                 f"Threshold: {threshold}\n\n"
                  f"Do you approve this booking?",
             payload=approval_details
         )
-        
+
         return {
             "status": "pending",
-            "message": f"Booking requires approval (${total_cost:.2f} > ${APPROVAL_THRESHOLD})",
+            "message": f"Booking requires approval ({why})",
             "awaiting_confirmation": True
         }
-    
-    # SCENARIO 3: Resumed after human response
+
+    # SCENARIO 4: Resumed after the policy settled the paused booking
+    # (TripManager.evaluate_pending passes its decision as the payload)
+    decision = tool_context.tool_confirmation.payload
+    if isinstance(decision, dict) and decision.get("action") in ("approve", "reject"):
+        return _policy_result(decision, total_cost, currency, total, tool_context)
+
+    # SCENARIO 5: Resumed after human response
     if tool_context.tool_confirmation.confirmed:
         tool_context.state["booking_approved"] = True
         tool_context.state["approval_reason"] = "human_approved"
         return {
             "status": "approved",
             "reason": "human_approved",
-            "message": f"Booking approved by user for ${total_cost:.2f}",
-            "total_cost": total_cost
+            "message": f"Booking approved by user for {total}",
+            "total_cost": total_cost,
+            "currency": currency
         }
     else:
         tool_context.state["booking_approved"] = False
         tool_context.state["approval_reason"] = "rejected"
         return {
             "status": "rejected",
-            "message": f"Booking rejected by user for ${total_cost:.2f}",
-            "total_cost": total_cost
+            "message": f"Booking rejected by user for {total}",
+            "total_cost": total_cost,
+            "currency": currency
         }
+
+
+def _policy_result(decision: dict, total_cost: float, currency: str, total: str, tool_context: ToolContext) -> dict:
+    """Record a booking the approval policy decided, with the rule or envelope that did."""
+    approved = decision["action"] == "approve"
+    reason = "policy_approved" if approved else "policy_rejected"
+    source = decision.get("rule") or f"budget envelope {decision['envelope']}"
+    tool_context.state["booking_approved"] = approved
+    tool_context.state["approval_reason"] = reason
+    return {
+        "status": "approved" if approved else "rejected",
+        "reason": reason,
+        "message": f"Booking {'approved' if approved else 'rejected'} by policy ({source}) for {total}",
+        "total_cost": total_cost,
+        "currency": currency,
+        "policy": decision
+    }
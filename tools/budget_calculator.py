@@ -1,80 +1,152 @@
 """Budget calculation tool for travel planning."""
 
 from google.adk.tools import ToolContext
+from config import BASE_CURRENCY
+from tools.currency import rate_table, format_money
 
 
-def calculate_trip_budget(
+# Mock pricing database in BASE_CURRENCY (in production, this would call a real API)
+BASE_COSTS = {
+    "paris": {"budget": 80, "mid-range": 150, "luxury": 350},
+    "tokyo": {"budget": 70, "mid-range": 140, "luxury": 400},
+    "bali": {"budget": 40, "mid-range": 90, "luxury": 250},
+    "new york": {"budget": 100, "mid-range": 200, "luxury": 500},
+    "istanbul": {"budget": 50, "mid-range": 100, "luxury": 220},
+}
+DEFAULT_COSTS = {"budget": 60, "mid-range": 120, "luxury": 300}
+COST_SHARES = {"accommodation": 0.4, "food": 0.3, "activities": 0.2, "transport": 0.1}
+
+
+def daily_cost(destination: str, accommodation_level: str) -> float:
+    """Per-person daily cost for a destination and accommodation level."""
+    # Normalize destination
+    dest_key = destination.lower().split(",")[0].strip()
+
+    # Find matching destination
+    for key in BASE_COSTS:
+        if key in dest_key or dest_key in key:
+            return BASE_COSTS[key].get(accommodation_level.lower(), 150)
+
+    # Default for unknown destinations
+    return DEFAULT_COSTS[accommodation_level.lower()]
+
+
+def estimate_legs(legs: list, num_travelers: int, accommodation_level: str) -> dict:
+    """Price every leg of a trip in one pass.
+
+    Args:
+        legs: List of {"destination": str, "num_days": int}
+        num_travelers: Number of people traveling
+        accommodation_level: "budget", "mid-range", or "luxury"
+
+    Returns:
+        Dictionary with per-leg breakdowns and the combined breakdown
+    """
+    combined = dict.fromkeys(COST_SHARES, 0.0)
+    priced_legs = []
+    for leg in legs:
+        person_days = leg["num_days"] * num_travelers
+        rate = daily_cost(leg["destination"], accommodation_level)
+        breakdown = {item: rate * share * person_days for item, share in COST_SHARES.items()}
+        breakdown["total"] = sum(breakdown.values())
+        for item in COST_SHARES:
+            combined[item] += breakdown[item]
+        priced_legs.append({"destination": leg["destination"], "num_days": leg["num_days"], **breakdown})
+    combined["total"] = sum(combined[item] for item in COST_SHARES)
+    return {"legs": priced_legs, "combined": combined}
+
+
+def quote_trip_budget(
     destination: str,
     num_days: int,
     num_travelers: int,
     accommodation_level: str,
-    tool_context: ToolContext
+    legs: list = None,
+    currency: str = BASE_CURRENCY
 ) -> dict:
-    """Calculates estimated trip budget based on destination and preferences.
-    
+    """Price a trip and quote it in a currency, without touching session state.
+
     Args:
         destination: City or country name (e.g., "Paris, France")
         num_days: Number of days for the trip
         num_travelers: Number of people traveling
         accommodation_level: "budget", "mid-range", or "luxury"
-        tool_context: Context for storing state
-    
+        legs: Multi-city legs; the trip is one leg when None
+        currency: Currency to quote in
+
     Returns:
-        Dictionary with budget breakdown and total cost
+        Dictionary with the tool "result", the BASE_CURRENCY "combined"
+        breakdown and the quoted "local" breakdown
     """
-    
-    # Mock pricing database (in production, this would call a real API)
-    base_costs = {
-        "paris": {"budget": 80, "mid-range": 150, "luxury": 350},
-        "tokyo": {"budget": 70, "mid-range": 140, "luxury": 400},
-        "bali": {"budget": 40, "mid-range": 90, "luxury": 250},
-        "new york": {"budget": 100, "mid-range": 200, "luxury": 500},
-        "istanbul": {"budget": 50, "mid-range": 100, "luxury": 220},
-    }
-    
-    # Normalize destination
-    dest_key = destination.lower().split(",")[0].strip()
-    
-    # Find matching destination
-    daily_cost = None
-    for key in base_costs:
-        if key in dest_key or dest_key in key:
-            daily_cost = base_costs[key].get(accommodation_level.lower(), 150)
-            break
-    
-    if daily_cost is None:
-        # Default for unknown destinations
-        daily_cost = {"budget": 60, "mid-range": 120, "luxury": 300}[accommodation_level.lower()]
-    
-    # Calculate breakdown
-    accommodation = daily_cost * 0.4 * num_days * num_travelers
-    food = daily_cost * 0.3 * num_days * num_travelers
-    activities = daily_cost * 0.2 * num_days * num_travelers
-    transport = daily_cost * 0.1 * num_days * num_travelers
-    
-    total = accommodation + food + activities + transport
-    
-    # Store in session state
-    tool_context.state["last_budget"] = total
-    tool_context.state["budget_breakdown"] = {
-        "accommodation": accommodation,
-        "food": food,
-        "activities": activities,
-        "transport": transport,
-        "total": total
-    }
-    
-    return {
+    legs = legs or [{"destination": destination, "num_days": num_days}]
+    estimate = estimate_legs(legs, num_travelers, accommodation_level)
+    combined = estimate["combined"]
+    local = rate_table.convert_breakdown(combined, currency)
+
+    result = {
         "status": "success",
         "destination": destination,
         "num_days": num_days,
         "num_travelers": num_travelers,
         "accommodation_level": accommodation_level,
         "breakdown": {
-            "accommodation": f"${accommodation:.2f}",
-            "food": f"${food:.2f}",
-            "activities": f"${activities:.2f}",
-            "local_transport": f"${transport:.2f}"
+            "accommodation": format_money(local["accommodation"], currency),
+            "food": format_money(local["food"], currency),
+            "activities": format_money(local["activities"], currency),
+            "local_transport": format_money(local["transport"], currency)
         },
-        "total_estimated_cost": f"${total:.2f}"
+        "total_estimated_cost": format_money(local["total"], currency)
     }
+    if currency != BASE_CURRENCY:
+        result["currency"] = currency
+        result["exchange_rate"] = rate_table.rate(currency)
+        result["total_usd"] = format_money(combined["total"])
+    if len(legs) > 1:
+        result["legs"] = [
+            {
+                "destination": leg["destination"],
+                "num_days": leg["num_days"],
+                "total": format_money(rate_table.convert(leg["total"], BASE_CURRENCY, currency), currency)
+            }
+            for leg in estimate["legs"]
+        ]
+    return {"result": result, "combined": combined, "local": local}
+
+
+def calculate_trip_budget(
+    destination: str,
+    num_days: int,
+    num_travelers: int,
+    accommodation_level: str,
+    tool_context: ToolContext
+) -> dict:
+    """Calculates estimated trip budget based on destination and preferences.
+
+    For multi-city trips planned with legs, every leg is priced in the same
+    call and the total covers the whole trip. Amounts are quoted in the
+    trip's currency (session state "currency", USD by default).
+
+    Args:
+        destination: City or country name (e.g., "Paris, France")
+        num_days: Number of days for the trip
+        num_travelers: Number of people traveling
+        accommodation_level: "budget", "mid-range", or "luxury"
+        tool_context: Context for storing state
+
+    Returns:
+        Dictionary with budget breakdown and total cost
+    """
+    quote = quote_trip_budget(
+        destination,
+        num_days,
+        num_travelers,
+        accommodation_level,
+        tool_context.state.get("trip_legs"),
+        tool_context.state.get("currency", BASE_CURRENCY)
+    )
+
+    # Store in session state (BASE_CURRENCY, plus the quoted total)
+    tool_context.state["last_budget"] = quote["combined"]["total"]
+    tool_context.state["budget_breakdown"] = quote["combined"]
+    tool_context.state["last_budget_local"] = quote["local"]["total"]
+    return quote["result"]
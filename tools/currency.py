@@ -0,0 +1,182 @@
+"""Currency conversion backed by a memory-mapped exchange rate table.
+
+Rates are maintained in EXCHANGE_RATES_SOURCE (JSON, units per USD) and
+compiled into a small fixed-layout binary file, EXCHANGE_RATES_FILE. Every
+worker process maps that file read-only, so all workers share one copy in
+the page cache. A refresh writes a new file next to it and swaps it in with
+os.replace; readers notice the new inode on their next periodic stat check
+and remap, without a restart and without ever seeing a half-written table.
+"""
+
+import json
+import mmap
+import os
+import struct
+import time
+
+from config import (
+    BASE_CURRENCY,
+    EXCHANGE_RATES_SOURCE,
+    EXCHANGE_RATES_FILE,
+    RATE_CHECK_INTERVAL
+)
+
+
+_MAGIC = b"VVFX"
+_VERSION = 1
+_HEADER = struct.Struct("<4sII")  # magic, version, entry count
+_ENTRY = struct.Struct("<3sxd")  # ISO 4217 code, units per BASE_CURRENCY
+_RATE = struct.Struct("<d")
+
+CURRENCY_SYMBOLS = {
+    "USD": "$", "EUR": "€", "GBP": "£", "JPY": "¥", "CNY": "CN¥",
+    "INR": "₹", "AUD": "A$", "CAD": "C$", "CHF": "CHF ", "SGD": "S$",
+    "IDR": "Rp", "TRY": "₺", "KRW": "₩", "BRL": "R$", "MXN": "MX$",
+}
+ZERO_DECIMAL_CURRENCIES = {"JPY", "KRW", "IDR"}
+
+
+class UnknownCurrency(ValueError):
+    """Raised for a currency code missing from the rate table."""
+
+
+def compile_rate_table(source: str = EXCHANGE_RATES_SOURCE, target: str = EXCHANGE_RATES_FILE) -> int:
+    """Compile the JSON rate source into the binary table and swap it in atomically.
+
+    Args:
+        source: JSON file with "base" and "rates" (units per base currency)
+        target: Binary table read by RateTable
+
+    Returns:
+        Number of currencies written
+    """
+    with open(source, encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("base", BASE_CURRENCY) != BASE_CURRENCY:
+        raise ValueError(f"Rate source must be quoted against {BASE_CURRENCY}")
+    rates = {code.upper(): float(rate) for code, rate in data["rates"].items()}
+    rates.setdefault(BASE_CURRENCY, 1.0)
+    invalid = [code for code, rate in rates.items() if len(code) != 3 or not rate > 0]
+    if invalid:
+        raise ValueError(f"Invalid rates for: {', '.join(invalid)}")
+
+    payload = _HEADER.pack(_MAGIC, _VERSION, len(rates)) + b"".join(
+        _ENTRY.pack(code.encode("ascii"), rate) for code, rate in sorted(rates.items())
+    )
+    staging = f"{target}.{os.getpid()}.tmp"
+    with open(staging, "wb") as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(staging, target)
+    return len(rates)
+
+
+class RateTable:
+    """Read-only view of the binary rate table that follows atomic refreshes.
+
+    At most once per check_interval a lookup stats the table (and its JSON
+    source). A changed file is remapped; a source newer than the table is
+    recompiled first. Between checks a lookup is a dict hit and one
+    struct read from the shared mapping.
+    """
+
+    def __init__(
+        self,
+        path: str = EXCHANGE_RATES_FILE,
+        source: str = EXCHANGE_RATES_SOURCE,
+        check_interval: float = RATE_CHECK_INTERVAL
+    ):
+        self.path = path
+        self.source = source
+        self.check_interval = check_interval
+        self._view = None  # (mmap, {code: offset}) swapped as one reference
+        self._identity = None
+        self._checked_at = 0.0
+        self.reloads = 0
+
+    def rate(self, currency: str) -> float:
+        """Units of currency per one BASE_CURRENCY."""
+        mapping, offsets = self._current()
+        offset = offsets.get(currency.upper())
+        if offset is None:
+            raise UnknownCurrency(f"Unsupported currency: {currency}")
+        return _RATE.unpack_from(mapping, offset)[0]
+
+    def currencies(self) -> list:
+        """Codes available in the current table."""
+        return sorted(self._current()[1])
+
+    def convert(self, amount: float, from_currency: str, to_currency: str) -> float:
+        """Convert an amount between two currencies through BASE_CURRENCY."""
+        if from_currency.upper() == to_currency.upper():
+            return amount
+        return amount / self.rate(from_currency) * self.rate(to_currency)
+
+    def convert_breakdown(self, breakdown: dict, currency: str) -> dict:
+        """Convert a BASE_CURRENCY breakdown: one rate lookup, then one multiply per item.
+
+        Breakdowns hold five amounts, so a plain dict pass is all the
+        "vectorising" there is; there is no array path.
+        """
+        rate = self.rate(currency)
+        return {item: amount * rate for item, amount in breakdown.items()}
+
+    def refresh(self):
+        """Check for a new table now instead of waiting for the next interval."""
+        self._checked_at = 0.0
+        self._current()
+
+    def _current(self) -> tuple:
+        now = time.monotonic()
+        if self._view is not None and now - self._checked_at < self.check_interval:
+            return self._view
+        self._checked_at = now
+
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            stat = None
+        try:
+            source_mtime = os.stat(self.source).st_mtime_ns
+        except FileNotFoundError:
+            source_mtime = None
+        if source_mtime is not None and (stat is None or source_mtime > stat.st_mtime_ns):
+            compile_rate_table(self.source, self.path)
+            stat = os.stat(self.path)
+        if stat is None:
+            raise FileNotFoundError(f"No exchange rate table at {self.path}")
+
+        identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if self._view is None or identity != self._identity:
+            self._view = self._map()
+            self._identity = identity
+            self.reloads += 1
+        return self._view
+
+    def _map(self) -> tuple:
+        with open(self.path, "rb") as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count = _HEADER.unpack_from(mapping, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"{self.path} is not a version {_VERSION} rate table")
+        offsets = {}
+        for index in range(count):
+            position = _HEADER.size + index * _ENTRY.size
+            code = _ENTRY.unpack_from(mapping, position)[0].decode("ascii")
+            offsets[code] = position + 4  # the rate follows the code and its pad byte
+        # The previous mapping is left to the garbage collector so readers
+        # still holding it finish their lookup safely.
+        return mapping, offsets
+
+
+def format_money(amount: float, currency: str = BASE_CURRENCY) -> str:
+    """Format an amount the way tool results show prices, e.g. "$4900.00" or "¥735000"."""
+    currency = currency.upper()
+    symbol = CURRENCY_SYMBOLS.get(currency, f"{currency} ")
+    decimals = 0 if currency in ZERO_DECIMAL_CURRENCIES else 2
+    return f"{symbol}{amount:.{decimals}f}"
+
+
+# Shared by every tool in the process
+rate_table = RateTable()
@@ -1,6 +1,86 @@
 """Destination validation tool for travel planning."""
 
 from google.adk.tools import ToolContext
+from tools.seasonality import SeasonalityIndex
+
+
+# Mock validation database (in production, use real travel advisory APIs).
+# Warnings naming a "Mon-Mon" window are checked against the travel dates.
+DESTINATION_INFO = {
+    "paris": {
+        "safe": True,
+        "safety_rating": 4.2,
+        "best_months": ["Apr", "May", "Sep", "Oct"],
+        "warnings": []
+    },
+    "tokyo": {
+        "safe": True,
+        "safety_rating": 4.8,
+        "best_months": ["Mar", "Apr", "Oct", "Nov"],
+        "warnings": ["Typhoon season: Aug-Sep"]
+    },
+    "bali": {
+        "safe": True,
+        "safety_rating": 4.5,
+        "best_months": ["Apr", "May", "Jun", "Sep"],
+        "warnings": ["Rainy season: Nov-Mar"]
+    },
+    "new york": {
+        "safe": True,
+        "safety_rating": 4.0,
+        "best_months": ["Apr", "May", "Sep", "Oct"],
+        "warnings": ["Very cold winters: Dec-Feb"]
+    },
+    "istanbul": {
+        "safe": True,
+        "safety_rating": 4.3,
+        "best_months": ["Apr", "May", "Sep", "Oct"],
+        "warnings": []
+    }
+}
+UNKNOWN_DESTINATION = {
+    "safe": True,
+    "safety_rating": 3.5,
+    "best_months": [],
+    "warnings": ["Limited information available - verify travel advisories"]
+}
+
+season_index = SeasonalityIndex(DESTINATION_INFO)
+
+
+def destination_report(destination: str, travel_dates: str) -> dict:
+    """Safety rating, warnings and seasonal fit of a trip, without touching session state.
+
+    Args:
+        destination: City or country name (e.g., "Bali, Indonesia")
+        travel_dates: Date range in format "YYYY-MM-DD to YYYY-MM-DD"
+
+    Returns:
+        Dictionary returned by validate_destination
+    """
+    return _report(destination, travel_dates, season_index.match(destination))
+
+
+def _report(destination: str, travel_dates: str, key) -> dict:
+    info = DESTINATION_INFO[key] if key else UNKNOWN_DESTINATION
+    matched_dest = key.title() if key else "Unknown"
+    season = season_index.evaluate(destination, travel_dates)
+
+    result = {
+        "status": "success",
+        "destination": destination,
+        "matched_location": matched_dest,
+        "is_safe": info["safe"],
+        "safety_rating": f"{info['safety_rating']}/5.0",
+        "best_months_to_visit": info["best_months"],
+        "travel_warnings": info["warnings"],
+        "recommendation": "Approved for travel" if info["safe"] else "Check travel advisories",
+        "travel_dates": travel_dates,
+        "season": season
+    }
+    if season.get("suitability") in ("fair", "poor"):
+        result["better_dates"] = season_index.rank_alternative_dates(destination, travel_dates)
+    return result
 
 
 def validate_destination(
@@ -16,77 +96,19 @@ def validate_destination(
         tool_context: Context for storing state
     
     Returns:
-        Dictionary with validation status, safety rating, and recommendations
+        Dictionary with validation status, safety rating, seasonal fit of
+        the dates, and recommendations
     """
     
-    # Mock validation database (in production, use real travel advisory APIs)
-    destination_info = {
-        "paris": {
-            "safe": True,
-            "safety_rating": 4.2,
-            "best_months": ["Apr", "May", "Sep", "Oct"],
-            "warnings": []
-        },
-        "tokyo": {
-            "safe": True,
-            "safety_rating": 4.8,
-            "best_months": ["Mar", "Apr", "Oct", "Nov"],
-            "warnings": ["Typhoon season: Aug-Sep"]
-        },
-        "bali": {
-            "safe": True,
-            "safety_rating": 4.5,
-            "best_months": ["Apr", "May", "Jun", "Sep"],
-            "warnings": ["Rainy season: Nov-Mar"]
-        },
-        "new york": {
-            "safe": True,
-            "safety_rating": 4.0,
-            "best_months": ["Apr", "May", "Sep", "Oct"],
-            "warnings": ["Very cold winters"]
-        },
-        "istanbul": {
-            "safe": True,
-            "safety_rating": 4.3,
-            "best_months": ["Apr", "May", "Sep", "Oct"],
-            "warnings": []
-        }
-    }
-    
-    # Normalize destination
-    dest_key = destination.lower().split(",")[0].strip()
-    
-    # Find matching destination
-    info = None
-    matched_dest = "Unknown"
-    for key in destination_info:
-        if key in dest_key or dest_key in key:
-            info = destination_info[key]
-            matched_dest = key.title()
-            break
-    
-    if info is None:
-        # Default for unknown destinations
-        info = {
-            "safe": True,
-            "safety_rating": 3.5,
-            "best_months": [],
-            "warnings": ["Limited information available - verify travel advisories"]
-        }
+    key = season_index.match(destination)
+    info = DESTINATION_INFO[key] if key else UNKNOWN_DESTINATION
+    result = _report(destination, travel_dates, key)
     
     # Store in session state
     tool_context.state["validated_destination"] = destination
     tool_context.state["destination_safe"] = info["safe"]
     tool_context.state["safety_rating"] = info["safety_rating"]
+    if "score" in result["season"]:
+        tool_context.state["season_score"] = result["season"]["score"]
     
-    return {
-        "status": "success",
-        "destination": destination,
-        "matched_location": matched_dest,
-        "is_safe": info["safe"],
-        "safety_rating": f"{info['safety_rating']}/5.0",
-        "best_months_to_visit": info["best_months"],
-        "travel_warnings": info["warnings"],
-        "recommendation": "Approved for travel" if info["safe"] else "Check travel advisories",
-        "travel_dates": travel_dates
-    }
+    return result
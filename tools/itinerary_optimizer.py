@@ -0,0 +1,434 @@
+"""Itinerary optimization tool: clusters attractions into days and orders them.
+
+Attractions come from the local POI dataset (POI_DATA_FILE). Each city's
+selected attractions are grouped into one cluster per day with k-medoids
+on great-circle distance, each day is routed with nearest-neighbour plus
+2-opt, and the route is fitted into morning, afternoon and evening slots.
+Everything is deterministic, so the same trip always gets the same plan.
+"""
+
+import json
+import math
+import re
+from functools import lru_cache
+
+from google.adk.tools import ToolContext
+from config import POI_DATA_FILE
+
+
+EARTH_RADIUS_KM = 6371.0
+SLOTS = [("morning", 9.0, 12.0), ("afternoon", 13.0, 17.0), ("evening", 18.0, 21.0)]
+DAY_FILL = 0.75  # share of slot hours planned; the rest absorbs travel and meals
+CITY_SPEED_KMH = 15.0  # door-to-door average including transit waits
+TRANSFER_HOURS = 0.25  # fixed overhead per move between attractions
+MEDOID_CANDIDATES = 8  # members nearest the cluster mean tried as its medoid
+MAX_ITERATIONS = 20
+
+_DURATION_PATTERN = re.compile(
+    r"^\s*[-*\d.]*\s*\**([^:*\n]+?)\**\s*:.*?\(Duration:\s*([\d.]+)(?:\s*-\s*([\d.]+))?\s*hours?\)",
+    re.IGNORECASE | re.MULTILINE
+)
+
+
+def _unit_vector(lat: float, lon: float) -> tuple:
+    phi, lam = math.radians(lat), math.radians(lon)
+    return (math.cos(phi) * math.cos(lam), math.cos(phi) * math.sin(lam), math.sin(phi))
+
+
+def _chord2(a: tuple, b: tuple) -> float:
+    """Squared chord between two unit vectors; ranks points like haversine distance."""
+    dx, dy, dz = a[0] - b[0], a[1] - b[1], a[2] - b[2]
+    return dx * dx + dy * dy + dz * dz
+
+
+def _arc(a: tuple, b: tuple) -> float:
+    """Great-circle angle in radians (the haversine distance on a unit sphere)."""
+    return 2.0 * math.asin(min(1.0, math.sqrt(_chord2(a, b)) / 2.0))
+
+
+def haversine_km(a: dict, b: dict) -> float:
+    """Great-circle distance between two POIs in kilometres."""
+    return EARTH_RADIUS_KM * _arc(a["vector"], b["vector"])
+
+
+def _normalize(name: str) -> str:
+    return re.sub(r"[^a-z0-9 ]", "", name.lower().replace("&", " and ")).strip()
+
+
+@lru_cache(maxsize=4)
+def load_pois(path: str = POI_DATA_FILE) -> dict:
+    """Load the POI dataset, keyed by lower-case city name.
+
+    Each POI carries name, lat, lon, duration_hours, an optional preferred
+    slot, and a precomputed unit vector used for distance comparisons.
+    """
+    with open(path, encoding="utf-8") as f:
+        raw = json.load(f)
+    return {city.lower(): prepare_pois(pois) for city, pois in raw.items()}
+
+
+def prepare_pois(pois: list) -> list:
+    """Add the unit vector and normalised name used by the planner to raw POIs."""
+    return [
+        {**poi, "vector": _unit_vector(poi["lat"], poi["lon"]), "key": _normalize(poi["name"])}
+        for poi in pois
+    ]
+
+
+def find_city_pois(destination: str, path: str = POI_DATA_FILE) -> list:
+    """POIs for a destination such as "Kyoto, Japan", or [] if the city is unknown."""
+    dest_key = destination.lower().split(",")[0].strip()
+    pois = load_pois(path)
+    for city in pois:
+        if city in dest_key or dest_key in city:
+            return pois[city]
+    return []
+
+
+def parse_activity_durations(activity_research: str) -> dict:
+    """Read "- Name: ... (Duration: X hours)" lines written by ActivityFinder.
+
+    Ranges such as "2-3 hours" use their midpoint.
+
+    Returns:
+        Dictionary mapping normalised activity name to hours
+    """
+    durations = {}
+    for match in _DURATION_PATTERN.finditer(activity_research or ""):
+        low = float(match.group(2))
+        high = float(match.group(3)) if match.group(3) else low
+        durations[_normalize(match.group(1))] = (low + high) / 2
+    return durations
+
+
+def _match_activity(poi_key: str, durations: dict):
+    """Name of the researched activity that refers to this POI, if any."""
+    if poi_key in durations:
+        return poi_key
+    poi_tokens = set(poi_key.split())
+    for name in durations:
+        if not name:
+            continue
+        if name in poi_key or poi_key in name:
+            return name
+        tokens = set(name.split())
+        if len(poi_tokens & tokens) * 2 >= max(len(poi_tokens), len(tokens)):
+            return name
+    return None
+
+
+def _select(pois: list, durations: dict, hours: float) -> tuple:
+    """Pick attractions up to the available hours.
+
+    Researched activities go first, then the dataset's own order (most
+    popular first). Returns (selected, skipped, matched activity names).
+    """
+    matched, ranked = set(), []
+    for index, poi in enumerate(pois):
+        name = _match_activity(poi["key"], durations) if durations else None
+        if name is not None:
+            matched.add(name)
+            poi = {**poi, "duration_hours": durations[name]}
+        ranked.append((name is None, index, poi))
+    ranked.sort(key=lambda item: item[:2])
+
+    selected, skipped, used = [], [], 0.0
+    for _, _, poi in ranked:
+        if used + poi["duration_hours"] <= hours:
+            selected.append(poi)
+            used += poi["duration_hours"]
+        else:
+            skipped.append(poi)
+    return selected, skipped, matched
+
+
+def _mean_vector(points: list) -> tuple:
+    n = len(points)
+    return tuple(sum(p[axis] for p in points) / n for axis in range(3))
+
+
+def _distance_sum(centre: tuple, points: list) -> float:
+    """Sum of chord lengths from centre to points.
+
+    Within a city the chord and the great-circle arc differ by under one
+    part in a million, so the chord stands in for haversine without asin.
+    """
+    cx, cy, cz = centre
+    total = 0.0
+    for x, y, z in points:
+        total += math.sqrt(max(0.0, 2.0 - 2.0 * (x * cx + y * cy + z * cz)))
+    return total
+
+
+def k_medoids(vectors: list, k: int) -> list:
+    """Cluster unit vectors into k groups around actual data points.
+
+    Initialised deterministically (the point nearest the centroid, then
+    repeatedly the point farthest from all medoids). Assignment compares
+    squared chords, which order points exactly like haversine distance;
+    the medoid update only scores the members nearest the cluster mean,
+    which keeps each iteration close to linear in the number of points.
+
+    Returns:
+        List of k lists of indices into vectors; index 0 of each is its medoid
+    """
+    n = len(vectors)
+    k = min(k, n)
+    if k <= 0:
+        return []
+
+    centroid = _mean_vector(vectors)
+    medoids = [min(range(n), key=lambda i: _chord2(vectors[i], centroid))]
+    nearest = [_chord2(v, vectors[medoids[0]]) for v in vectors]
+    while len(medoids) < k:
+        far = max(range(n), key=nearest.__getitem__)
+        medoids.append(far)
+        nearest = [min(d, _chord2(v, vectors[far])) for d, v in zip(nearest, vectors)]
+
+    for _ in range(MAX_ITERATIONS):
+        clusters = [[] for _ in medoids]
+        medoid_vectors = [vectors[m] for m in medoids]
+        for i, (x, y, z) in enumerate(vectors):
+            # Largest dot product == smallest chord, without the subtractions
+            best, best_dot = 0, -2.0
+            for c, (mx, my, mz) in enumerate(medoid_vectors):
+                dot = x * mx + y * my + z * mz
+                if dot > best_dot:
+                    best, best_dot = c, dot
+            clusters[best].append(i)
+
+        updated = []
+        for medoid, members in zip(medoids, clusters):
+            if not members:
+                updated.append(medoid)
+                continue
+            points = [vectors[i] for i in members]
+            mean = _mean_vector(points)
+            candidates = sorted(members, key=lambda i: _chord2(vectors[i], mean))[:MEDOID_CANDIDATES]
+            updated.append(min(candidates, key=lambda c: _distance_sum(vectors[c], points)))
+        if updated == medoids:
+            break
+        medoids = updated
+
+    return [[m] + [i for i in members if i != m] for m, members in zip(medoids, clusters)]
+
+
+def _rebalance(clusters: list, vectors: list, loads: list, capacity: float) -> list:
+    """Move attractions out of overfull days into the nearest day with room."""
+    totals = [sum(loads[i] for i in members) for members in clusters]
+    for _ in range(len(vectors)):
+        over = max(range(len(clusters)), key=totals.__getitem__)
+        if totals[over] <= capacity or len(clusters[over]) <= 1:
+            break
+        best = None
+        own = vectors[clusters[over][0]]
+        for i in clusters[over][1:]:
+            for target, members in enumerate(clusters):
+                if target == over or totals[target] + loads[i] > capacity:
+                    continue
+                cost = _chord2(vectors[i], vectors[members[0]]) - _chord2(vectors[i], own)
+                if best is None or cost < best[0]:
+                    best = (cost, i, target)
+        if best is None:
+            break
+        _, i, target = best
+        clusters[over].remove(i)
+        clusters[target].append(i)
+        totals[over] -= loads[i]
+        totals[target] += loads[i]
+    return clusters
+
+
+def order_route(pois: list) -> list:
+    """Order one day's attractions as a short open walk.
+
+    Nearest-neighbour from the attraction farthest from the day's centre,
+    then 2-opt segment reversals until no reversal shortens the route.
+    """
+    if len(pois) <= 2:
+        return list(pois)
+    centre = _mean_vector([p["vector"] for p in pois])
+    remaining = list(pois)
+    current = max(remaining, key=lambda p: _chord2(p["vector"], centre))
+    remaining.remove(current)
+    route = [current]
+    while remaining:
+        current = min(remaining, key=lambda p: _chord2(p["vector"], route[-1]["vector"]))
+        remaining.remove(current)
+        route.append(current)
+
+    def d(a, b):
+        return _arc(route[a]["vector"], route[b]["vector"])
+
+    improved = True
+    while improved:
+        improved = False
+        for i in range(len(route) - 1):
+            for j in range(i + 1, len(route)):
+                before = (d(i - 1, i) if i > 0 else 0.0) + (d(j, j + 1) if j + 1 < len(route) else 0.0)
+                after = (d(i - 1, j) if i > 0 else 0.0) + (d(i, j + 1) if j + 1 < len(route) else 0.0)
+                if after < before - 1e-12:
+                    route[i:j + 1] = reversed(route[i:j + 1])
+                    improved = True
+    return route
+
+
+def _travel_hours(a: dict, b: dict) -> float:
+    return TRANSFER_HOURS + haversine_km(a, b) / CITY_SPEED_KMH
+
+
+def _clock(hours: float) -> str:
+    minutes = int(round(hours * 60))
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def fit_slots(route: list, first_slot: int = 0) -> tuple:
+    """Place an ordered route into the morning, afternoon and evening slots.
+
+    Attractions marked for a slot keep to it (morning ones lead the day,
+    evening ones close it). An activity longer than its slot may start at
+    the slot's opening and run over the following break.
+
+    Returns:
+        (slots dict of "HH:MM-HH:MM Name" entries, attractions that did not fit)
+    """
+    mornings = [p for p in route if p.get("slot") == "morning"]
+    evenings = [p for p in route if p.get("slot") == "evening"]
+    ordered = mornings + [p for p in route if p.get("slot") not in ("morning", "evening")] + evenings
+
+    plan = {name: [] for name, _, _ in SLOTS}
+    leftover = []
+    # Evening hours held back for the attractions that only suit the evening
+    reserved = sum(p["duration_hours"] for p in evenings)
+    index, clock, previous = first_slot, SLOTS[first_slot][1], None
+    for poi in ordered:
+        if poi.get("slot") == "evening":
+            index = max(index, 2)
+            reserved -= poi["duration_hours"]
+        ready = clock + (_travel_hours(previous, poi) if previous else 0.0)
+        while index < len(SLOTS):
+            name, opens, closes = SLOTS[index]
+            if index == len(SLOTS) - 1:
+                closes -= reserved
+            start = max(ready, opens)
+            end = start + poi["duration_hours"]
+            if end <= closes or (start <= opens and poi["duration_hours"] > closes - opens):
+                break
+            index += 1
+        if index >= len(SLOTS):
+            leftover.append(poi)
+            index = len(SLOTS) - 1
+            continue
+        plan[name].append(f"{_clock(start)}-{_clock(end)} {poi['name']}")
+        clock, previous = end, poi
+    return plan, leftover
+
+
+def plan_days(pois: list, num_days: int, durations: dict = None, arrival_day: bool = False) -> dict:
+    """Build a day-by-day plan for one city.
+
+    Args:
+        pois: The city's POIs (from find_city_pois)
+        num_days: Days spent in the city
+        durations: Normalised activity name -> hours from ActivityFinder
+        arrival_day: Whether the first morning is spent travelling in
+
+    Returns:
+        Dictionary with "days" (slots, area and travel_km per day),
+        "optional" attractions that did not fit and "matched" activity names
+    """
+    day_hours = sum(closes - opens for _, opens, closes in SLOTS)
+    available = day_hours * num_days - (SLOTS[0][2] - SLOTS[0][1] if arrival_day else 0.0)
+    selected, skipped, matched = _select(pois, durations or {}, available * DAY_FILL)
+
+    vectors = [p["vector"] for p in selected]
+    clusters = k_medoids(vectors, num_days)
+    loads = [p["duration_hours"] + TRANSFER_HOURS for p in selected]
+    clusters = _rebalance(clusters, vectors, loads, day_hours * DAY_FILL)
+
+    # Visit the day clusters as a nearest-neighbour chain of their medoids
+    ordered_clusters = []
+    remaining = [c for c in clusters if c]
+    while remaining:
+        anchor = vectors[ordered_clusters[-1][0]] if ordered_clusters else _mean_vector(vectors)
+        nearest = min(remaining, key=lambda c: _chord2(vectors[c[0]], anchor))
+        remaining.remove(nearest)
+        ordered_clusters.append(nearest)
+    if arrival_day and ordered_clusters:
+        # The lightest cluster fits best on a half day
+        lightest = min(ordered_clusters, key=lambda c: sum(loads[i] for i in c))
+        ordered_clusters.remove(lightest)
+        ordered_clusters.insert(0, lightest)
+
+    days, optional = [], [p["name"] for p in skipped]
+    for day in range(num_days):
+        members = ordered_clusters[day] if day < len(ordered_clusters) else []
+        route = order_route([selected[i] for i in members])
+        first_slot = 1 if arrival_day and day == 0 else 0
+        slots, leftover = fit_slots(route, first_slot) if route else ({name: [] for name, _, _ in SLOTS}, [])
+        if first_slot:
+            slots["morning"] = ["Travel to the city and check in"]
+        optional.extend(p["name"] for p in leftover)
+        placed = [p for p in route if p not in leftover]
+        days.append({
+            "area": f"Around {selected[members[0]]['name']}" if members else "Free day",
+            "travel_km": round(sum(haversine_km(a, b) for a, b in zip(placed, placed[1:])), 1),
+            **slots,
+        })
+    return {"days": days, "optional": optional, "matched": matched}
+
+
+def optimize_itinerary(destination: str, num_days: int, tool_context: ToolContext) -> dict:
+    """Builds an optimized day-by-day itinerary from the local attraction dataset.
+
+    Nearby attractions are grouped into the same day, each day is ordered
+    to minimise walking and transit, and activities are placed into
+    morning, afternoon and evening slots using the durations found by
+    ActivityFinder. Multi-city trips are planned leg by leg.
+
+    Args:
+        destination: City or country name (e.g., "Paris, France")
+        num_days: Number of days for the trip
+        tool_context: Context for reading research and storing state
+
+    Returns:
+        Dictionary with the planned days, optional extras and any cities
+        that have no attraction data (plan those days manually)
+    """
+    legs = tool_context.state.get("trip_legs") or [
+        {"destination": destination, "num_days": num_days}
+    ]
+    durations = parse_activity_durations(tool_context.state.get("activity_research", ""))
+
+    days, optional, missing, matched = [], [], [], set()
+    for index, leg in enumerate(legs):
+        pois = find_city_pois(leg["destination"])
+        if not pois:
+            missing.append(leg["destination"])
+            days.extend({"city": leg["destination"], "status": "no_data"} for _ in range(leg["num_days"]))
+            continue
+        plan = plan_days(pois, leg["num_days"], durations, arrival_day=index > 0)
+        days.extend({"city": leg["destination"], **day} for day in plan["days"])
+        optional.extend(plan["optional"])
+        matched |= plan["matched"]
+
+    for number, day in enumerate(days, start=1):
+        day["day"] = number
+
+    if len(missing) == len(legs):
+        return {
+            "status": "no_data",
+            "message": f"No attraction data for {destination}; plan the days from the research.",
+        }
+
+    result = {
+        "status": "success",
+        "destination": destination,
+        "days": days,
+        "optional": optional[:10],
+        "unplaced_activities": sorted(set(durations) - matched),
+    }
+    if missing:
+        result["cities_without_data"] = missing
+    tool_context.state["optimized_itinerary"] = days
+    return result
@@ -0,0 +1,356 @@
+"""Precomputed plan templates for the catalogue destinations.
+
+Most trips go to the destinations in the catalogue that validate_destination
+and calculate_trip_budget share. For each of them, an offline job
+(python -m agents.templates) runs the research team once per season. It
+then plans an itinerary skeleton for every trip length up to
+TEMPLATE_MAX_DAYS and writes everything to PLAN_TEMPLATES_FILE. The file
+holds a small header, an offset table and one zlib-compressed JSON record
+per (destination, season). Workers map it read-only and decode a record
+the first time it is used.
+
+At request time template_trip_state() fills a trip's session state from its
+template. The parts that depend on the exact request are computed live:
+the budget (quote_trip_budget), the season check for the actual dates
+(destination_report) and the currency. The state has the same keys the
+full pipeline writes, so the booking step, the service and
+benchmarks/evaluate.py read a templated trip like any other. Multi-city
+trips, other destinations and longer trips take the full pipeline, and so
+do trips whose template is stale: built more than TEMPLATE_MAX_AGE_DAYS
+ago, or for another year than the trip's (its research and seasonal tips
+were checked against that year).
+"""
+
+import json
+import mmap
+import os
+import struct
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from config import (
+    BASE_CURRENCY, MODEL_BACKEND, PLAN_TEMPLATES_ENABLED, PLAN_TEMPLATES_FILE, TEMPLATE_MAX_AGE_DAYS, TEMPLATE_MAX_DAYS
+)
+from tools.budget_calculator import BASE_COSTS, quote_trip_budget
+from tools.destination_validator import DESTINATION_INFO, destination_report, season_index
+from tools.itinerary_optimizer import find_city_pois, parse_activity_durations, plan_days
+from tools.seasonality import month_mask, parse_date_range
+from utils.metrics import metrics
+
+
+# Meteorological seasons by the month a trip starts in
+SEASONS = {
+    "winter": ["Dec", "Jan", "Feb"],
+    "spring": ["Mar", "Apr", "May"],
+    "summer": ["Jun", "Jul", "Aug"],
+    "autumn": ["Sep", "Oct", "Nov"],
+}
+# Catalogue destinations with pricing, and the names research is run under
+CATALOGUE = {
+    "paris": "Paris, France",
+    "tokyo": "Tokyo, Japan",
+    "bali": "Bali, Indonesia",
+    "new york": "New York, USA",
+    "istanbul": "Istanbul, Turkey",
+}
+TEMPLATE_DESTINATIONS = [key for key in DESTINATION_INFO if key in BASE_COSTS]
+
+_MAGIC = b"VVPT"
+_VERSION = 1
+_HEADER = struct.Struct("<4sII")  # magic, version, record count
+_ENTRY = struct.Struct("<24s8sII")  # destination key, season, offset, length
+_SLOTS = (("morning", "Morning (9:00-12:00)"), ("afternoon", "Afternoon (13:00-17:00)"), ("evening", "Evening (18:00-21:00)"))
+_SEASON_OF_MONTH = {month_mask([month]).bit_length(): season for season, months in SEASONS.items() for month in months}
+
+
+def season_of(travel_dates: str) -> Optional[str]:
+    """Season a trip starts in, or None if its dates cannot be parsed."""
+    parsed = parse_date_range(travel_dates)
+    if parsed is None:
+        return None
+    return _SEASON_OF_MONTH[parsed[0].month]
+
+
+def is_stale(template: dict, travel_dates: str, max_age_days: int = TEMPLATE_MAX_AGE_DAYS) -> bool:
+    """Whether a template is too old for a trip: built over max_age_days ago or for another year."""
+    built_at = datetime.fromisoformat(template["built_at"])
+    if datetime.now(timezone.utc) - built_at > timedelta(days=max_age_days):
+        return True
+    parsed = parse_date_range(travel_dates)
+    return "year" in template and parsed is not None and parsed[0].year != template["year"]
+
+
+def season_dates(season: str, year: int, num_days: int = 4) -> str:
+    """Travel dates of a representative trip in a season, mid-way through it."""
+    month = month_mask([SEASONS[season][1]]).bit_length()
+    return f"{year}-{month:02d}-10 to {year}-{month:02d}-{10 + num_days:02d}"
+
+
+def season_tips(destination: str, season: str, year: int) -> list:
+    """Seasonal advice for a catalogue destination from its best months and warnings."""
+    months = SEASONS[season]
+    first = month_mask([months[0]]).bit_length()
+    last = month_mask([months[-1]]).bit_length()
+    dates = f"{year}-{first:02d}-01 to {year + (last < first)}-{last:02d}-28"
+    fit = season_index.evaluate(destination, dates)
+    info = DESTINATION_INFO[season_index.match(destination)]
+
+    tips = [f"{season.title()} is {'an' if fit['suitability'] == 'excellent' else 'a'} "
+            f"{fit['suitability']} time to visit"
+            + (f", especially {', '.join(fit['best_months_overlap'])}" if fit["best_months_overlap"] else "")]
+    if not fit["best_months_overlap"] and info["best_months"]:
+        tips.append(f"Best months to visit: {', '.join(info['best_months'])}")
+    tips.extend(f"⚠️ {warning}" for warning in fit["active_warnings"])
+    return tips
+
+
+def build_template_record(key: str, season: str, research: dict, year: int) -> dict:
+    """Template of one destination and season from its research.
+
+    Args:
+        key: Catalogue key (e.g., "paris")
+        season: Key of SEASONS
+        research: Research outputs by RESEARCH_OUTPUT_KEYS
+        year: Year the seasonal advice is checked against
+
+    Returns:
+        Record with the research, seasonal tips and an itinerary skeleton
+        (days and optional extras) per trip length up to TEMPLATE_MAX_DAYS
+    """
+    destination = CATALOGUE.get(key, key.title())
+    pois = find_city_pois(destination)
+    durations = parse_activity_durations(research.get("activity_research", ""))
+    skeletons = {}
+    for num_days in range(1, TEMPLATE_MAX_DAYS + 1):
+        plan = plan_days(pois, num_days, durations) if pois else {"days": [], "optional": []}
+        skeletons[str(num_days)] = {"days": plan["days"], "optional": plan["optional"][:10]}
+    return {
+        "destination": key,
+        "name": destination,
+        "season": season,
+        "research": research,
+        "tips": season_tips(destination, season, year),
+        "skeletons": skeletons,
+        "year": year,
+        "built_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "backend": MODEL_BACKEND,
+    }
+
+
+def compile_plan_templates(records: list, target: str = PLAN_TEMPLATES_FILE) -> int:
+    """Write template records to the binary index and swap it in atomically.
+
+    Args:
+        records: Records from build_template_record
+        target: Index file read by PlanTemplateIndex
+
+    Returns:
+        Number of records written
+    """
+    blobs = [
+        zlib.compress(json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), 9)
+        for record in records
+    ]
+    offset = _HEADER.size + _ENTRY.size * len(records)
+    entries = []
+    for record, blob in zip(records, blobs):
+        entries.append(_ENTRY.pack(
+            record["destination"].encode("utf-8"), record["season"].encode("ascii"), offset, len(blob)
+        ))
+        offset += len(blob)
+
+    os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+    staging = f"{target}.{os.getpid()}.tmp"
+    with open(staging, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, len(records)))
+        f.write(b"".join(entries))
+        f.write(b"".join(blobs))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(staging, target)
+    return len(records)
+
+
+class PlanTemplateIndex:
+    """Read-only view of the template index, decoded one record at a time.
+
+    A missing file is an empty index, so trips fall back to the full
+    pipeline until the precompute job has run.
+
+    Args:
+        path: Index written by compile_plan_templates
+    """
+
+    def __init__(self, path: str = PLAN_TEMPLATES_FILE):
+        self.path = path
+        self._view = None  # (mmap, {(key, season): (offset, length)})
+        self._records = {}
+
+    def __len__(self) -> int:
+        return len(self._entries())
+
+    def keys(self) -> list:
+        return sorted(self._entries())
+
+    def get(self, key: str, season: str) -> Optional[dict]:
+        """Template of a catalogue key and season, or None."""
+        record = self._records.get((key, season))
+        if record is None:
+            entry = self._entries().get((key, season))
+            if entry is None:
+                return None
+            offset, length = entry
+            record = json.loads(zlib.decompress(self._view[0][offset:offset + length]))
+            self._records[(key, season)] = record
+        return record
+
+    def reload(self):
+        """Map the index again, e.g. after the precompute job rewrote it."""
+        self._view = None
+        self._records = {}
+
+    def _entries(self) -> dict:
+        if self._view is None:
+            self._view = self._map()
+        return self._view[1]
+
+    def _map(self) -> tuple:
+        try:
+            with open(self.path, "rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return None, {}
+                mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            return None, {}
+        magic, version, count = _HEADER.unpack_from(mapping, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"{self.path} is not a version {_VERSION} plan template index")
+        entries = {}
+        for index in range(count):
+            key, season, offset, length = _ENTRY.unpack_from(mapping, _HEADER.size + index * _ENTRY.size)
+            entries[(key.rstrip(b"\0").decode("utf-8"), season.rstrip(b"\0").decode("ascii"))] = (offset, length)
+        return mapping, entries
+
+
+def format_itinerary(days: list) -> str:
+    """Day-by-day plan in the ItineraryBuilder format ("**Day N:**" then slots)."""
+    lines = []
+    for day in days:
+        lines.append(f"**Day {day['day']}:**")
+        for slot, label in _SLOTS:
+            lines.append(f"- {label}: {', '.join(day.get(slot) or []) or 'Free time'}")
+        lines.append(f"- Area: {day['area']} ({day['travel_km']} km between stops)")
+    return "\n".join(lines)
+
+
+def format_budget(result: dict) -> str:
+    """Budget breakdown of a quote_trip_budget result as BudgetCalculator presents it."""
+    breakdown = result["breakdown"]
+    lines = [
+        "**Budget Breakdown:**",
+        f"- Accommodation: {breakdown['accommodation']}",
+        f"- Food: {breakdown['food']}",
+        f"- Activities: {breakdown['activities']}",
+        f"- Local transport: {breakdown['local_transport']}",
+        f"- **Total estimated cost: {result['total_estimated_cost']}**",
+    ]
+    if "total_usd" in result:
+        lines.append(f"- Total in USD: {result['total_usd']}")
+    return "\n".join(lines)
+
+
+def format_validation(report: dict) -> str:
+    """Validation summary of a destination_report result."""
+    season = report["season"]
+    fit = season.get("suitability", "unknown")
+    if season.get("active_warnings"):
+        fit += f" ({'; '.join(season['active_warnings'])})"
+    lines = [
+        "**Destination Validation:**",
+        f"- Safety Rating: {report['safety_rating']}",
+        f"- Best Months: {', '.join(report['best_months_to_visit']) or 'Unknown'}",
+        f"- Season Fit: {fit}",
+        f"- Warnings: {', '.join(report['travel_warnings']) or 'None'}",
+        f"- Recommendation: {report['recommendation']}",
+    ]
+    if report.get("better_dates"):
+        lines.append(f"- Better dates: {', '.join(d['travel_dates'] for d in report['better_dates'])}")
+    return "\n".join(lines)
+
+
+def template_trip_state(
+    destination: str,
+    travel_dates: str,
+    num_days: int,
+    num_travelers: int,
+    accommodation_level: str = "mid-range",
+    legs: Optional[list] = None,
+    currency: str = BASE_CURRENCY,
+    index: Optional[PlanTemplateIndex] = None
+) -> Optional[dict]:
+    """Session state of a trip assembled from its template, or None without one.
+
+    Args:
+        destination: Destination name (e.g., "Paris, France")
+        travel_dates: Date range "YYYY-MM-DD to YYYY-MM-DD"
+        num_days: Number of days for the trip
+        num_travelers: Number of travelers
+        accommodation_level: "budget", "mid-range", or "luxury"
+        legs: Multi-city legs (these trips have no template)
+        currency: Currency the budget is quoted in
+        index: Template index (default plan_templates)
+
+    Returns:
+        State with the validation, research, itinerary and budget keys
+        the full pipeline writes, plus "plan_tips" and "plan_template"
+    """
+    if not PLAN_TEMPLATES_ENABLED or (legs and len(legs) > 1) or not 1 <= num_days <= TEMPLATE_MAX_DAYS:
+        return None
+    key = season_index.match(destination)
+    season = season_of(travel_dates)
+    if key not in TEMPLATE_DESTINATIONS or season is None:
+        return None
+    template = (index or plan_templates).get(key, season)
+    if template is None:
+        metrics.increment("templates.miss", destination=key, season=season)
+        return None
+    if is_stale(template, travel_dates):
+        metrics.increment("templates.stale", destination=key, season=season)
+        return None
+    skeleton = template["skeletons"].get(str(num_days))
+    if not skeleton or not skeleton["days"]:
+        return None
+    metrics.increment("templates.hit", destination=key, season=season)
+
+    currency = currency.upper()
+    report = destination_report(destination, travel_dates)
+    quote = quote_trip_budget(destination, num_days, num_travelers, accommodation_level, currency=currency)
+    days = [{"city": destination, "day": number, **day} for number, day in enumerate(skeleton["days"], start=1)]
+    itinerary = format_itinerary(days)
+    if skeleton["optional"]:
+        itinerary += f"\n\n**Optional extras:** {', '.join(skeleton['optional'][:3])}"
+
+    info = DESTINATION_INFO[key]
+    state = {
+        "validated_destination": destination,
+        "destination_safe": info["safe"],
+        "safety_rating": info["safety_rating"],
+        "validation_result": format_validation(report),
+        **template["research"],
+        "optimized_itinerary": days,
+        "itinerary_draft": itinerary,
+        "last_budget": quote["combined"]["total"],
+        "budget_breakdown": quote["combined"],
+        "last_budget_local": quote["local"]["total"],
+        "budget_analysis": format_budget(quote["result"]),
+        "plan_tips": "\n".join(f"- {tip}" for tip in template["tips"]),
+        "plan_template": f"{key}/{season}/{num_days}",
+    }
+    if "score" in report["season"]:
+        state["season_score"] = report["season"]["score"]
+    return state
+
+
+# Shared by plan_trip and the service; empty until the precompute job runs
+plan_templates = PlanTemplateIndex()
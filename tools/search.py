@@ -0,0 +1,373 @@
+"""Web search for the research agents, with query dedup and a disk cache.
+
+Research agents search for near-identical things: the three researchers of
+one trip overlap, WeatherChecker asks for "weather" and "climate" of the
+same month, and every trip to the same city repeats the last one. Queries
+are normalised to a key (lower-cased, synonyms and month names folded,
+filler words dropped, words sorted) so those collapse into one search.
+Results are kept in a small in-memory cache in front of a SQLite file
+shared by worker processes, with a TTL per topic; identical searches
+already in flight share one backend call. SQLite is read and written off
+the event loop; the in-memory cache is only touched on it.
+
+Backends are the local stand-in (answers from the repo's own destination
+data, for tests and the simulated model) and Google's Custom Search JSON
+API. With SEARCH_BACKEND = "google" the agents keep Gemini's built-in
+google_search grounding instead and this module is not used.
+"""
+
+import asyncio
+import calendar
+import json
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+import urllib.parse
+import urllib.request
+from typing import Optional
+
+from google.adk.tools import ToolContext, google_search
+from config import (
+    GOOGLE_API_KEY,
+    GOOGLE_CSE_ID,
+    SEARCH_BACKEND,
+    SEARCH_CACHE_FILE,
+    SEARCH_CACHE_TTL,
+    SEARCH_WEATHER_TTL,
+    SEARCH_MAX_RESULTS
+)
+from tools.destination_validator import DESTINATION_INFO, season_index
+from tools.itinerary_optimizer import find_city_pois
+from utils.cache import TTLCache
+from utils.metrics import metrics
+
+
+_PHRASES = {
+    "things to do": "activities",
+    "what to do": "activities",
+    "must see": "attractions",
+    "points of interest": "attractions",
+}
+_SYNONYMS = {
+    "climate": "weather", "forecast": "weather", "temperature": "weather", "temperatures": "weather",
+    "rainfall": "weather", "conditions": "weather",
+    "sights": "attractions", "sightseeing": "attractions", "landmarks": "attractions", "attraction": "attractions",
+    "tours": "activities", "experiences": "activities", "activity": "activities",
+}
+_MONTHS = {name.lower(): abbr.lower() for name, abbr in zip(calendar.month_name[1:], calendar.month_abbr[1:])}
+_MONTHS.update({abbr.lower(): abbr.lower() for abbr in calendar.month_abbr[1:]})
+_MONTHS["sept"] = "sep"
+_STOPWORDS = {
+    "a", "an", "the", "in", "on", "at", "for", "of", "to", "and", "or", "with", "during", "near",
+    "best", "top", "popular", "average", "typical", "guide", "what", "is", "are", "like",
+}
+
+
+def normalize_query(query: str) -> str:
+    """Canonical form of a query; equivalent phrasings map to the same key.
+
+    For example "Tokyo weather April average" and "tokyo climate in april"
+    both become "apr tokyo weather".
+    """
+    text = unicodedata.normalize("NFKD", query).encode("ascii", "ignore").decode().lower()
+    text = re.sub(r"[^a-z0-9 ]+", " ", text)
+    for phrase, replacement in _PHRASES.items():
+        text = text.replace(phrase, replacement)
+    words = set()
+    for word in text.split():
+        word = _MONTHS.get(word) or _SYNONYMS.get(word, word)
+        if word not in _STOPWORDS:
+            words.add(word)
+    return " ".join(sorted(words))
+
+
+def query_ttl(key: str) -> float:
+    """Seconds results for a normalised query stay fresh."""
+    return SEARCH_WEATHER_TTL if "weather" in key.split() else SEARCH_CACHE_TTL
+
+
+class SearchCache:
+    """Search results by normalised query: LRU in memory over a SQLite file.
+
+    The in-memory LRU is not thread-safe and is used from the event loop
+    only (peek, remember). SQLite access (load, store) is serialised by a
+    lock, so SearchService runs it in worker threads. get and set do both,
+    for callers on a single thread.
+
+    Args:
+        path: SQLite file shared by all worker processes
+        memory_size: Entries kept in the in-process LRU
+    """
+
+    def __init__(self, path: str = SEARCH_CACHE_FILE, memory_size: int = 1024):
+        self.path = path
+        self._memory = TTLCache(maxsize=memory_size, ttl=min(SEARCH_CACHE_TTL, SEARCH_WEATHER_TTL))
+        self._db = None
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[list]:
+        results = self.peek(key)
+        if results is None:
+            row = self.load(key)
+            if row is not None:
+                results = self.remember(key, *row)
+        return results
+
+    def set(self, key: str, query: str, results: list, ttl: float):
+        self.remember(key, results, ttl)
+        self.store(key, query, results, ttl)
+
+    def peek(self, key: str) -> Optional[list]:
+        """Results held in memory, or None."""
+        return self._memory.get(key)
+
+    def remember(self, key: str, results: list, ttl: float) -> list:
+        """Hold results in memory for ttl seconds, at most the memory cache's TTL.
+
+        Rows promoted from SQLite pass their remaining lifetime, so they are
+        never served past their expiry.
+        """
+        self._memory.set(key, results, min(ttl, self._memory.ttl))
+        return results
+
+    def load(self, key: str) -> Optional[tuple]:
+        """(results, seconds left) of an unexpired SQLite row, or None."""
+        now = time.time()
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT results, expires_at FROM searches WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1] - now
+
+    def store(self, key: str, query: str, results: list, ttl: float):
+        """Write results to SQLite, fresh for ttl seconds."""
+        with self._lock, self._connection():
+            self._connection().execute(
+                "INSERT OR REPLACE INTO searches (key, query, results, expires_at) VALUES (?, ?, ?, ?)",
+                (key, query, json.dumps(results, ensure_ascii=False), time.time() + ttl),
+            )
+
+    def purge(self) -> int:
+        """Delete expired rows; returns how many were removed."""
+        with self._lock, self._connection():
+            return self._connection().execute("DELETE FROM searches WHERE expires_at <= ?", (time.time(),)).rowcount
+
+    def clear(self):
+        self._memory.clear()
+        with self._lock, self._connection():
+            self._connection().execute("DELETE FROM searches")
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._db is None:
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS searches "
+                "(key TEXT PRIMARY KEY, query TEXT, results TEXT, expires_at REAL)"
+            )
+        return self._db
+
+
+class LocalSearchBackend:
+    """Offline stand-in for a search engine, answering from the repo's data.
+
+    Attractions and activities come from the POI dataset, weather from the
+    destination advisories. Unknown cities get a single generic result.
+
+    Args:
+        latency: Seconds each search takes, to mimic a real backend
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls = 0
+
+    async def search(self, query: str, num: int) -> list:
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        key = normalize_query(query)
+        words = key.split()
+        city = season_index.match(query)
+        pois = find_city_pois(query)
+        if "weather" in words and city:
+            info = DESTINATION_INFO[city]
+            results = [{
+                "title": f"{city.title()} climate and best time to visit",
+                "snippet": f"Best months: {', '.join(info['best_months'])}. " + " ".join(info["warnings"]),
+                "url": f"https://travel.example/{city.replace(' ', '-')}/weather",
+            }]
+        elif pois:
+            results = [{
+                "title": poi["name"],
+                "snippet": f"{poi['name']} - allow about {poi['duration_hours']:g} hours"
+                           + (f", best in the {poi['slot']}" if poi.get("slot") else "") + ".",
+                "url": f"https://travel.example/poi/{re.sub(r'[^a-z0-9]+', '-', poi['name'].lower()).strip('-')}",
+            } for poi in pois]
+        else:
+            results = [{
+                "title": query,
+                "snippet": f"No local data for \"{query}\"; verify with an official tourism source.",
+                "url": "https://travel.example/search?q=" + urllib.parse.quote(query),
+            }]
+        return results[:num]
+
+
+class CustomSearchBackend:
+    """Google Custom Search JSON API (needs GOOGLE_API_KEY and GOOGLE_CSE_ID)."""
+
+    ENDPOINT = "https://www.googleapis.com/customsearch/v1"
+
+    def __init__(self, api_key: str = GOOGLE_API_KEY, engine_id: str = GOOGLE_CSE_ID, timeout: float = 10.0):
+        if not api_key or not engine_id:
+            raise ValueError("The cse search backend needs GOOGLE_API_KEY and GOOGLE_CSE_ID")
+        self.api_key = api_key
+        self.engine_id = engine_id
+        self.timeout = timeout
+        self.calls = 0
+
+    async def search(self, query: str, num: int) -> list:
+        self.calls += 1
+        params = urllib.parse.urlencode({"key": self.api_key, "cx": self.engine_id, "q": query, "num": min(num, 10)})
+        data = await asyncio.to_thread(self._fetch, f"{self.ENDPOINT}?{params}")
+        return [
+            {"title": item.get("title", ""), "snippet": item.get("snippet", ""), "url": item.get("link", "")}
+            for item in data.get("items", [])
+        ]
+
+    def _fetch(self, url: str) -> dict:
+        with urllib.request.urlopen(url, timeout=self.timeout) as response:
+            return json.load(response)
+
+
+class SearchService:
+    """Deduplicating, caching front end to a search backend.
+
+    Args:
+        backend: Object with an async search(query, num) -> list
+        cache: Result cache; a SearchCache on SEARCH_CACHE_FILE by default
+        max_results: Results returned per query
+    """
+
+    def __init__(self, backend, cache: Optional[SearchCache] = None, max_results: int = SEARCH_MAX_RESULTS):
+        self.backend = backend
+        self.cache = cache if cache is not None else SearchCache()
+        self.max_results = max_results
+        self._inflight = {}
+        self._trips = TTLCache(maxsize=4096, ttl=24 * 3600)
+
+    async def search(self, query: str, trip_id: Optional[str] = None) -> dict:
+        """Results for a query from cache, a search already in flight, or the backend."""
+        key = normalize_query(query) or query.strip().lower()
+        results = self.cache.peek(key)
+        if results is None:
+            row = await asyncio.to_thread(self.cache.load, key)
+            if row is not None:
+                results = self.cache.remember(key, *row)
+        if results is not None:
+            source = "cache"
+        else:
+            # The backend call runs in its own task, so cancelling one trip
+            # does not cancel the others waiting on the same query; it is
+            # cancelled only once nobody waits for it any more
+            flight = self._inflight.get(key)
+            if flight is None:
+                source = "backend"
+                flight = {"task": asyncio.create_task(self._fetch(key, query)), "waiters": 0}
+                flight["task"].add_done_callback(lambda task: self._landed(key, flight))
+                self._inflight[key] = flight
+            else:
+                source = "shared"
+            flight["waiters"] += 1
+            try:
+                results = await asyncio.shield(flight["task"])
+            finally:
+                flight["waiters"] -= 1
+                if not flight["waiters"] and not flight["task"].done():
+                    flight["task"].cancel()
+                    if self._inflight.get(key) is flight:
+                        del self._inflight[key]
+
+        metrics.increment("search.query", source=source)
+        if trip_id:
+            stats = self._trips.get(trip_id)
+            if stats is None:
+                stats = {"requested": 0, "backend": 0, "cache": 0, "shared": 0, "unique": set()}
+                self._trips.set(trip_id, stats)
+            stats["requested"] += 1
+            stats[source] += 1
+            stats["unique"].add(key)
+        return {"status": "success", "query": query, "results": results, "source": source}
+
+    async def _fetch(self, key: str, query: str) -> list:
+        results = await self.backend.search(query, self.max_results)
+        self.cache.remember(key, results, query_ttl(key))
+        await asyncio.to_thread(self.cache.store, key, query, results, query_ttl(key))
+        return results
+
+    def _landed(self, key: str, flight: dict):
+        if self._inflight.get(key) is flight:
+            del self._inflight[key]
+        if not flight["task"].cancelled():
+            flight["task"].exception()  # retrieved here so a failure nobody awaited is not reported as unhandled
+
+    def trip_stats(self, trip_id: str) -> dict:
+        """Searches made for a trip: requested, unique queries and how each was served."""
+        stats = self._trips.get(trip_id)
+        if stats is None:
+            return {"requested": 0, "unique": 0, "backend": 0, "cache": 0, "shared": 0}
+        return {**stats, "unique": len(stats["unique"])}
+
+
+def create_search_backend(name: str = SEARCH_BACKEND):
+    """Search backend for a SEARCH_BACKEND name ("local" or "cse")."""
+    if name == "cse":
+        return CustomSearchBackend()
+    if name == "local":
+        return LocalSearchBackend()
+    raise ValueError(f"Unknown search backend: {name}")
+
+
+_search_service = None
+
+
+def get_search_service() -> SearchService:
+    """Process-wide SearchService for SEARCH_BACKEND, created on first use."""
+    global _search_service
+    if _search_service is None:
+        _search_service = SearchService(create_search_backend())
+    return _search_service
+
+
+def trip_search_stats(trip_id: str) -> Optional[dict]:
+    """Search counts for a trip, or None with built-in google_search grounding."""
+    if SEARCH_BACKEND == "google":
+        return None
+    return get_search_service().trip_stats(trip_id)
+
+
+async def web_search(query: str, tool_context: ToolContext) -> dict:
+    """Searches the web for travel information.
+
+    Repeated or equivalent queries are answered from cache, so search once
+    per topic with a specific query.
+
+    Args:
+        query: Search query, e.g. "Kyoto weather November"
+        tool_context: Context identifying the trip
+
+    Returns:
+        Dictionary with the query, a list of results (title, snippet, url)
+        and where they came from
+    """
+    return await get_search_service().search(query, trip_id=tool_context.state.get("trip_id"))
+
+
+def create_search_tool():
+    """Search tool for the research agents: built-in grounding or web_search."""
+    return google_search if SEARCH_BACKEND == "google" else web_search
@@ -0,0 +1,226 @@
+"""Seasonality index: scores travel dates against each destination's seasons.
+
+Months are bits in a 12-bit mask (bit 0 = January). Every catalogue
+destination stores a mask of its best months and one per warning window
+such as "Typhoon season: Aug-Sep". A trip's date range is parsed once into
+the mask of months it touches, so checking a trip is a couple of ANDs and
+a popcount, and scores for every possible mask are precomputed per
+destination for the batch API.
+"""
+
+import calendar
+import re
+from datetime import date
+from functools import lru_cache
+
+
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+ALL_MONTHS = (1 << 12) - 1
+POPCOUNT = [bin(mask).count("1") for mask in range(ALL_MONTHS + 1)]
+MEMO_SIZE = 65536  # distinct destination / date strings remembered by score_batch
+
+_MONTH_INDEX = {name.lower(): index for index, name in enumerate(MONTHS)}
+_WINDOW_PATTERN = re.compile(r"\b([A-Z][a-z]{2})\s*-\s*([A-Z][a-z]{2})\b")
+_DATE_PATTERN = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})")
+
+
+def month_mask(months: list) -> int:
+    """Mask for month abbreviations such as ["Apr", "May"]."""
+    mask = 0
+    for month in months:
+        mask |= 1 << _MONTH_INDEX[month[:3].lower()]
+    return mask
+
+
+def mask_months(mask: int) -> list:
+    """Month abbreviations set in a mask, in calendar order."""
+    return [name for index, name in enumerate(MONTHS) if mask >> index & 1]
+
+
+def window_mask(text: str) -> int:
+    """Mask for every "Mon-Mon" window in a warning, wrapping over new year.
+
+    "Rainy season: Nov-Mar" covers Nov, Dec, Jan, Feb and Mar. Warnings
+    without a window give 0.
+    """
+    mask = 0
+    for first, last in _WINDOW_PATTERN.findall(text):
+        if first.lower() not in _MONTH_INDEX or last.lower() not in _MONTH_INDEX:
+            continue
+        index, end = _MONTH_INDEX[first.lower()], _MONTH_INDEX[last.lower()]
+        while True:
+            mask |= 1 << index
+            if index == end:
+                break
+            index = (index + 1) % 12
+    return mask
+
+
+@lru_cache(maxsize=8192)
+def parse_date_range(travel_dates: str):
+    """Parse "YYYY-MM-DD to YYYY-MM-DD" into (start, end, month mask).
+
+    A single date is a one-day trip. Returns None if no date is found or
+    the range runs backwards.
+    """
+    found = _DATE_PATTERN.findall(travel_dates or "")
+    if not found:
+        return None
+    try:
+        start = date(*map(int, found[0]))
+        end = date(*map(int, found[-1]))
+    except ValueError:
+        return None
+    if end < start:
+        return None
+
+    months = (end.year - start.year) * 12 + end.month - start.month + 1
+    if months >= 12:
+        return start, end, ALL_MONTHS
+    mask = 0
+    for offset in range(months):
+        mask |= 1 << ((start.month - 1 + offset) % 12)
+    return start, end, mask
+
+
+def _score(mask: int, best: int, warn: int) -> float:
+    """Share of the trip's months in season minus the share under warnings."""
+    if not mask:
+        return 0.0
+    return (POPCOUNT[mask & best] - POPCOUNT[mask & warn]) / POPCOUNT[mask]
+
+
+def _shift_months(day: date, months: int) -> date:
+    month = day.month - 1 + months
+    year, month = day.year + month // 12, month % 12 + 1
+    return date(year, month, min(day.day, calendar.monthrange(year, month)[1]))
+
+
+class SeasonalityIndex:
+    """Month bitmasks for a destination catalogue.
+
+    Args:
+        catalogue: Mapping of destination key to info with "best_months"
+            and "warnings" (as in destination_validator.DESTINATION_INFO)
+    """
+
+    def __init__(self, catalogue: dict):
+        self.keys = list(catalogue)
+        self.best = {}
+        self.windows = {}
+        self.warn = {}
+        self._tables = {}
+        for key, info in catalogue.items():
+            windows = [(text, window_mask(text)) for text in info.get("warnings", [])]
+            self.best[key] = month_mask(info.get("best_months", []))
+            self.windows[key] = [(text, mask) for text, mask in windows if mask]
+            self.warn[key] = 0
+            for _, mask in self.windows[key]:
+                self.warn[key] |= mask
+            self._tables[key] = [
+                _score(mask, self.best[key], self.warn[key]) for mask in range(ALL_MONTHS + 1)
+            ]
+        self._unknown_table = [0.0] * (ALL_MONTHS + 1)
+        self._destination_tables = {}
+        self._date_masks = {}
+
+    def match(self, destination: str):
+        """Catalogue key for a destination such as "Tokyo, Japan", or None."""
+        dest_key = (destination or "").lower().split(",")[0].strip()
+        for key in self.keys:
+            if key in dest_key or dest_key in key:
+                return key
+        return None
+
+    def evaluate(self, destination: str, travel_dates: str) -> dict:
+        """Season check for one trip.
+
+        Returns:
+            Dictionary with the score (-1 to 1), suitability, the trip's
+            months, which of them are best months, and the warnings in
+            effect. "status" is "unknown_dates" if the range cannot be
+            parsed and "unknown_destination" outside the catalogue.
+        """
+        parsed = parse_date_range(travel_dates)
+        if parsed is None:
+            return {"status": "unknown_dates"}
+        _, _, mask = parsed
+        key = self.match(destination)
+        if key is None:
+            return {"status": "unknown_destination", "travel_months": mask_months(mask)}
+
+        score = self._tables[key][mask]
+        return {
+            "status": "success",
+            "score": round(score, 2),
+            "suitability": suitability(score),
+            "travel_months": mask_months(mask),
+            "best_months_overlap": mask_months(mask & self.best[key]),
+            "active_warnings": [text for text, window in self.windows[key] if window & mask],
+        }
+
+    def score_batch(self, pairs) -> list:
+        """Scores for many (destination, travel_dates) pairs.
+
+        Destination lookups and date parsing are memoised per distinct
+        string, so repeated pairs cost two dictionary hits and a list
+        index. Unknown destinations or unparseable dates score 0.0.
+        """
+        tables, masks = self._destination_tables, self._date_masks
+        scores = []
+        for destination, travel_dates in pairs:
+            table = tables.get(destination)
+            if table is None:
+                if len(tables) >= MEMO_SIZE:
+                    tables.clear()
+                key = self.match(destination)
+                table = tables[destination] = self._tables[key] if key else self._unknown_table
+            mask = masks.get(travel_dates)
+            if mask is None:
+                if len(masks) >= MEMO_SIZE:
+                    masks.clear()
+                parsed = parse_date_range(travel_dates)
+                mask = masks[travel_dates] = parsed[2] if parsed else 0
+            scores.append(table[mask])
+        return scores
+
+    def rank_alternative_dates(self, destination: str, travel_dates: str, limit: int = 3) -> list:
+        """Better-scoring trips of the same length starting 1-11 months later.
+
+        Returns:
+            Up to limit {"travel_dates", "score", "suitability"} dictionaries,
+            best first, that beat the requested dates' score
+        """
+        parsed = parse_date_range(travel_dates)
+        if parsed is None or self.match(destination) is None:
+            return []
+        start, end, _ = parsed
+        length = end - start
+        candidates = []
+        for months in range(1, 12):
+            shifted = _shift_months(start, months)
+            candidates.append(f"{shifted.isoformat()} to {(shifted + length).isoformat()}")
+
+        current, *scores = self.score_batch(
+            [(destination, travel_dates)] + [(destination, dates) for dates in candidates]
+        )
+        ranked = sorted(
+            (pair for pair in zip(scores, range(len(candidates))) if pair[0] > current),
+            key=lambda pair: (-pair[0], pair[1])
+        )
+        return [
+            {"travel_dates": candidates[index], "score": round(score, 2), "suitability": suitability(score)}
+            for score, index in ranked[:limit]
+        ]
+
+
+def suitability(score: float) -> str:
+    """Label for a season score."""
+    if score >= 0.5:
+        return "excellent"
+    if score > 0:
+        return "good"
+    if score == 0:
+        return "fair"
+    return "poor"
+
@@ -1,6 +1,12 @@
 """Helper utilities for approval workflow and response handling."""
 
+import logging
+
 from google.genai import types
+from utils.structured_log import get_logger
+
+
+logger = get_logger("agent")
 
 
 def check_for_approval(events):
@@ -19,19 +25,23 @@ def check_for_approval(events):
                     part.function_call
                     and part.function_call.name == "adk_request_confirmation"
                 ):
+                    confirmation = (part.function_call.args or {}).get("toolConfirmation") or {}
                     return {
                         "approval_id": part.function_call.id,
                         "invocation_id": event.invocation_id,
+                        "payload": confirmation.get("payload"),
                     }
     return None
 
 
-def create_approval_response(approval_info, approved: bool):
+def create_approval_response(approval_info, approved: bool, decision: dict = None):
     """Create approval response message.
     
     Args:
         approval_info: Dictionary with approval_id and invocation_id
         approved: Boolean indicating approval decision
+        decision: Approval policy decision, when the policy (not a human)
+            settled the booking; the resumed tool records it
     
     Returns:
         Content object with function response
@@ -39,7 +49,7 @@ def create_approval_response(approval_info, approved: bool):
     confirmation_response = types.FunctionResponse(
         id=approval_info["approval_id"],
         name="adk_request_confirmation",
-        response={"confirmed": approved},
+        response={"confirmed": approved, "payload": decision} if decision else {"confirmed": approved},
     )
     return types.Content(
         role="user", 
@@ -48,13 +58,18 @@ def create_approval_response(approval_info, approved: bool):
 
 
 def print_agent_response(events):
-    """Print agent's text responses from events.
+    """Log agent's text responses from events.
     
     Args:
         events: List of event objects from agent execution
     """
+    if not logger.isEnabledFor(logging.INFO):
+        return
     for event in events:
         if event.content and event.content.parts:
             for part in event.content.parts:
                 if part.text:
-                    print(f"🤖 Agent: {part.text}")
+                    logger.info(
+                        "🤖 Agent: %s", part.text,
+                        extra={"event": "agent.response", "fields": {"author": event.author}}
+                    )
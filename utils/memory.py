@@ -0,0 +1,232 @@
+"""Memory instrumentation and bounded session retention for long-running workers.
+
+Workers share main.session_service for days. Without a limit every
+finished trip keeps its session (all events plus state blobs such as
+budget_breakdown) and its archived stage results for the life of the
+process. SessionRetention keeps only the most recent finished sessions
+and evicts the rest; session_memory and MemoryProfiler show where the
+bytes are.
+"""
+
+import sys
+import time
+import tracemalloc
+import types
+from collections import OrderedDict, deque
+
+from config import SESSION_RETENTION_MAX, SESSION_RETENTION_TTL, TRACEMALLOC_FRAMES
+from utils.metrics import metrics
+
+
+_ATOMIC = (str, bytes, bytearray, int, float, complex, bool, type(None))
+_SHARED = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+_TRACE_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def deep_sizeof(obj) -> int:
+    """Approximate bytes held by obj and everything it references, each counted once.
+
+    Classes, modules and functions are shared by the whole process and
+    are not counted.
+    """
+    seen = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        item = stack.pop()
+        if id(item) in seen or isinstance(item, _SHARED):
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, _ATOMIC):
+            continue
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset, deque)):
+            stack.extend(item)
+        elif hasattr(item, "__dict__"):
+            stack.append(vars(item))
+    return total
+
+
+def session_memory(session_service, top: int = 10) -> dict:
+    """Sessions held by an InMemorySessionService and the bytes each retains.
+
+    Args:
+        session_service: InMemorySessionService to inspect
+        top: Number of largest sessions to list
+
+    Returns:
+        Dictionary with session, event and byte totals and the largest
+        sessions (session_id, user_id, events, bytes)
+    """
+    rows = []
+    for users in getattr(session_service, "sessions", {}).values():
+        for user_id, sessions in users.items():
+            for session_id, session in sessions.items():
+                rows.append({
+                    "session_id": session_id,
+                    "user_id": user_id,
+                    "events": len(session.events),
+                    "bytes": deep_sizeof(session.events) + deep_sizeof(session.state),
+                })
+    rows.sort(key=lambda row: row["bytes"], reverse=True)
+    return {
+        "sessions": len(rows),
+        "events": sum(row["events"] for row in rows),
+        "bytes": sum(row["bytes"] for row in rows),
+        "largest": rows[:top],
+    }
+
+
+class MemoryProfiler:
+    """tracemalloc snapshots taken on demand, each compared with the last.
+
+    Tracing slows every allocation, so it starts with the first snapshot
+    and runs until stop().
+
+    Args:
+        frames: Stack frames recorded per allocation
+    """
+
+    def __init__(self, frames: int = TRACEMALLOC_FRAMES):
+        self.frames = frames
+        self._previous = None
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def snapshot(self, top: int = 10) -> dict:
+        """Take a snapshot and list the source lines holding the most memory.
+
+        The first snapshot after tracing starts only covers allocations
+        made since; later ones also report the change since the previous
+        snapshot, which is where a leak shows up.
+
+        Args:
+            top: Number of source lines to list
+
+        Returns:
+            Dictionary with traced and peak bytes and the top source lines
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._previous = None
+        snapshot = tracemalloc.take_snapshot().filter_traces(_TRACE_FILTERS)
+        traced, peak = tracemalloc.get_traced_memory()
+
+        if self._previous is None:
+            lines = [
+                {"where": str(stat.traceback[0]), "bytes": stat.size, "count": stat.count}
+                for stat in snapshot.statistics("lineno")[:top]
+            ]
+        else:
+            lines = [
+                {
+                    "where": str(stat.traceback[0]),
+                    "bytes": stat.size,
+                    "bytes_diff": stat.size_diff,
+                    "count": stat.count,
+                    "count_diff": stat.count_diff,
+                }
+                for stat in snapshot.compare_to(self._previous, "lineno")[:top]
+            ]
+        compared = self._previous is not None
+        self._previous = snapshot
+        return {"traced_bytes": traced, "peak_bytes": peak, "compared": compared, "top": lines}
+
+    def stop(self):
+        """Stop tracing and forget the last snapshot."""
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._previous = None
+
+
+class SessionRetention:
+    """Keeps a bounded number of finished sessions in the session service.
+
+    Sessions are released when their trip ends, whether it completed,
+    failed or was cancelled. Finished sessions are kept for max_sessions
+    sessions or ttl seconds, whichever comes first, then deleted with their
+    archive records (and file) and their SessionDirectory entry. Limits are
+    checked on every release. A released trip's checkpoint also leaves
+    memory; its file stays on disk for resume_trip.
+
+    Args:
+        session_service: Service holding the sessions
+        archive: EventArchive whose records go with a session
+        checkpoints: CheckpointStore whose cached record is released
+        directory: SessionDirectory the evicted sessions are removed from
+        max_sessions: Finished sessions kept; 0 evicts each on release
+        ttl: Seconds a finished session is kept
+    """
+
+    def __init__(
+        self,
+        session_service,
+        archive=None,
+        checkpoints=None,
+        directory=None,
+        max_sessions: int = SESSION_RETENTION_MAX,
+        ttl: float = SESSION_RETENTION_TTL
+    ):
+        self.session_service = session_service
+        self.archive = archive
+        self.checkpoints = checkpoints
+        self.directory = directory
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.evicted = 0
+        self._finished = OrderedDict()
+
+    def hold(self, app_name: str, user_id: str, session_id: str):
+        """Exempt a finished session that runs again (resume_trip) from eviction."""
+        self._finished.pop((app_name, user_id, session_id), None)
+
+    async def release(self, app_name: str, user_id: str, session_id: str):
+        """Mark a session finished and evict finished sessions past the limits."""
+        key = (app_name, user_id, session_id)
+        self._finished[key] = time.monotonic()
+        self._finished.move_to_end(key)
+        if self.checkpoints is not None:
+            self.checkpoints.release(session_id)
+        await self.evict()
+
+    async def evict(self) -> int:
+        """Delete finished sessions over max_sessions or older than ttl; returns how many."""
+        cutoff = time.monotonic() - self.ttl
+        evicted = 0
+        while self._finished:
+            key, finished_at = next(iter(self._finished.items()))
+            if len(self._finished) <= self.max_sessions and finished_at > cutoff:
+                break
+            del self._finished[key]
+            app_name, user_id, session_id = key
+            await self.session_service.delete_session(app_name=app_name, user_id=user_id, session_id=session_id)
+            if self.archive is not None:
+                self.archive.drop_session(session_id)
+            if self.directory is not None:
+                self.directory.remove(session_id)
+            evicted += 1
+        if evicted:
+            self.evicted += evicted
+            metrics.increment("memory.sessions_evicted", evicted)
+        return evicted
+
+    def stats(self) -> dict:
+        return {
+            "finished_sessions": len(self._finished),
+            "max_sessions": self.max_sessions,
+            "ttl": self.ttl,
+            "evicted": self.evicted,
+        }
+
+
+# Shared by the service and benchmarks; tracing is off until the first snapshot
+memory_profiler = MemoryProfiler()
@@ -0,0 +1,98 @@
+"""Latency statistics and counters shared by benchmarks and runtime instrumentation."""
+
+from collections import defaultdict, deque
+
+
+def percentile(values, pct: float) -> float:
+    """Nearest-rank percentile of a list of numbers.
+
+    Args:
+        values: Iterable of numbers
+        pct: Percentile between 0 and 100
+
+    Returns:
+        The percentile value, or 0.0 for an empty input
+    """
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize_latencies(values) -> dict:
+    """Summarize latency samples in seconds.
+
+    Args:
+        values: Iterable of latencies in seconds
+
+    Returns:
+        Dictionary with count, mean, p50, p95, p99 and max
+    """
+    values = list(values)
+    if not values:
+        return {"count": 0, "mean": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    return {
+        "count": len(values),
+        "mean": sum(values) / len(values),
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": max(values),
+    }
+
+
+class MetricsRegistry:
+    """In-process counters and bounded latency samples keyed by labels."""
+
+    def __init__(self, max_samples: int = 2048):
+        self.max_samples = max_samples
+        self._counters = defaultdict(int)
+        self._latencies = defaultdict(lambda: deque(maxlen=self.max_samples))
+
+    @staticmethod
+    def _key(name: str, labels: dict) -> tuple:
+        return (name,) + tuple(sorted(labels.items()))
+
+    def increment(self, name: str, amount: int = 1, **labels):
+        """Add amount to the counter name{labels}."""
+        self._counters[self._key(name, labels)] += amount
+
+    def observe(self, name: str, seconds: float, **labels):
+        """Record one latency sample for name{labels}."""
+        self._latencies[self._key(name, labels)].append(seconds)
+
+    def samples(self, name: str, **labels) -> list:
+        """Latency samples of every name series matching labels."""
+        wanted = set(labels.items())
+        return [
+            value
+            for key, values in self._latencies.items()
+            if key[0] == name and wanted <= set(key[1:])
+            for value in values
+        ]
+
+    def count(self, name: str, **labels) -> int:
+        """Total of the counter name, summed over series matching labels."""
+        return sum(
+            value for key, value in self._counters.items()
+            if key[0] == name and set(labels.items()) <= set(key[1:])
+        )
+
+    def snapshot(self) -> dict:
+        """JSON-serialisable view of every counter and latency summary."""
+        def label(key):
+            labels = ",".join(f"{k}={v}" for k, v in key[1:])
+            return f"{key[0]}{{{labels}}}" if labels else key[0]
+
+        return {
+            "counters": {label(key): value for key, value in sorted(self._counters.items())},
+            "latencies": {label(key): summarize_latencies(values) for key, values in sorted(self._latencies.items())},
+        }
+
+    def reset(self):
+        self._counters.clear()
+        self._latencies.clear()
+
+
+metrics = MetricsRegistry()
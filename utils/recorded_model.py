@@ -0,0 +1,159 @@
+"""Record model responses once and replay them offline.
+
+benchmarks/evaluate.py runs a fixed corpus of trips against responses
+recorded from a real (or simulated) model, so a change to caching,
+compaction or tiering is judged on the same answers every time. With
+MODEL_RECORDING set, create_model() wraps each agent's model in a
+RecordedModel. While an evaluation case runs, current_cassette holds its
+Cassette: in "record" mode calls go to the real model and are saved, in
+"replay" mode they are answered from the file without a model. Outside a
+case the wrapper passes calls straight through.
+
+Calls are keyed by agent, the first user message of the request (the trip
+details, or the request an AgentTool sent) and how many tool results the
+request carries, so parallel agents and repeated tool rounds replay in
+the right place whatever order they run in.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import AsyncGenerator, Optional
+
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from config import MODEL_BACKEND
+from utils.simulated_model import estimate_prompt_tokens
+
+
+# Cassette of the evaluation case running in this context, if any
+current_cassette: ContextVar[Optional["Cassette"]] = ContextVar("current_cassette", default=None)
+
+
+class UnrecordedCall(KeyError):
+    """Raised on replay when a model call has no recorded response."""
+
+
+def _first_user_text(llm_request: LlmRequest) -> str:
+    for content in llm_request.contents:
+        if content.role == "user" and content.parts:
+            text = "\n".join(part.text for part in content.parts if part.text)
+            if text:
+                return text
+    return ""
+
+
+def call_key(agent_name: str, llm_request: LlmRequest) -> str:
+    """Replay key of a model call: agent, first user message and tool round."""
+    digest = hashlib.sha1(_first_user_text(llm_request).encode("utf-8")).hexdigest()[:12]
+    rounds = sum(
+        1
+        for content in llm_request.contents
+        for part in (content.parts or [])
+        if part.function_response
+    )
+    return f"{agent_name}:{digest}:{rounds}"
+
+
+class Cassette:
+    """Model calls of one evaluation case, saved to or read from a JSON file.
+
+    Args:
+        path: Recording file of the case
+        mode: "record" to call the model and save its responses, "replay"
+            to answer from the file
+        latency_scale: Replayed calls sleep their recorded latency times
+            this factor (0 answers at once)
+    """
+
+    def __init__(self, path: str, mode: str = "replay", latency_scale: float = 1.0):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Cassette mode must be 'record' or 'replay', not {mode!r}")
+        self.path = path
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self.calls = {}
+        if mode == "replay":
+            with open(path, encoding="utf-8") as f:
+                self.calls = json.load(f)["calls"]
+        self._played = {}
+        self.stats = {"model_calls": 0, "prompt_tokens": 0, "output_tokens": 0, "model_seconds": 0.0}
+
+    def play(self, key: str) -> dict:
+        """Next recorded call for key; raises UnrecordedCall when there is none."""
+        index = self._played.get(key, 0)
+        recorded = self.calls.get(key, [])
+        if index >= len(recorded):
+            raise UnrecordedCall(f"No recorded response for model call {key} (call {index + 1}) in {self.path}")
+        self._played[key] = index + 1
+        return recorded[index]
+
+    def record(self, key: str, latency: float, responses: list):
+        self.calls.setdefault(key, []).append({
+            "latency": round(latency, 4),
+            "responses": [response.model_dump(mode="json", exclude_none=True) for response in responses],
+        })
+
+    def count(self, llm_request: LlmRequest, latency: float, responses: list):
+        """Add one call to the case's model calls, tokens and model time."""
+        self.stats["model_calls"] += 1
+        self.stats["prompt_tokens"] += estimate_prompt_tokens(llm_request)
+        self.stats["output_tokens"] += sum(
+            (response.usage_metadata.candidates_token_count or 0) if response.usage_metadata else 0
+            for response in responses
+        )
+        self.stats["model_seconds"] += latency
+
+    def save(self):
+        """Write recorded calls to the case's file (record mode only)."""
+        if self.mode != "record":
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        recording = {
+            "backend": MODEL_BACKEND,
+            "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "calls": dict(sorted(self.calls.items())),
+        }
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(recording, f, indent=1, ensure_ascii=False)
+            f.write("\n")
+
+
+class RecordedModel(BaseLlm):
+    """Agent model that records or replays its calls while a cassette is set."""
+
+    inner: BaseLlm
+    agent_name: str = ""
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        cassette = current_cassette.get()
+        if cassette is None:
+            async for response in self.inner.generate_content_async(llm_request, stream):
+                yield response
+            return
+
+        key = call_key(self.agent_name, llm_request)
+        if cassette.mode == "replay":
+            recorded = cassette.play(key)
+            responses = [LlmResponse.model_validate(response) for response in recorded["responses"]]
+            cassette.count(llm_request, recorded["latency"], responses)
+            if cassette.latency_scale > 0:
+                await asyncio.sleep(recorded["latency"] * cassette.latency_scale)
+        else:
+            started = time.perf_counter()
+            responses = [
+                response async for response in self.inner.generate_content_async(llm_request, stream)
+            ]
+            latency = time.perf_counter() - started
+            cassette.record(key, latency, responses)
+            cassette.count(llm_request, latency, responses)
+
+        for response in responses:
+            yield response
@@ -0,0 +1,259 @@
+"""Offline stand-in for Gemini used by load tests and local development.
+
+The simulated model never leaves the process. It recognises each Vertex
+Voyages agent from its request, calls that agent's tools with arguments
+parsed from the trip details, and answers with short canned text after a
+configurable latency.
+"""
+
+import asyncio
+import calendar
+import random
+import re
+from typing import AsyncGenerator
+
+from google.genai import types
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+
+
+COORDINATOR_STEPS = ["ValidationAgent", "ResearchTeam", "PlanningPipeline", "BookingAgent"]
+
+_AGENT_NAME_PATTERN = re.compile(r'Your internal name is "([^"]+)"')
+_TOTAL_PATTERN = re.compile(r"total_estimated_cost\W+[^\d'\"]*?([\d,]+(?:\.\d+)?)")
+
+
+def parse_trip_details(text: str) -> dict:
+    """Extract the "Trip Details" block written by plan_trip.
+
+    Args:
+        text: Message text containing the trip details
+
+    Returns:
+        Dictionary with destination, travel_dates, num_days,
+        num_travelers and accommodation_level
+    """
+    def find(label, default):
+        match = re.search(rf"{label}:\s*(.+)", text)
+        return match.group(1).strip() if match else default
+
+    return {
+        "destination": find("Destination", "Unknown"),
+        "travel_dates": find("Dates", "2026-01-01 to 2026-01-05"),
+        "num_days": int(re.sub(r"\D", "", find("Duration", "3")) or 3),
+        "num_travelers": int(re.sub(r"\D", "", find("Travelers", "1")) or 1),
+        "accommodation_level": find("Accommodation", "mid-range").split()[0].lower(),
+    }
+
+
+def _text_of(content) -> str:
+    if not content or not content.parts:
+        return ""
+    return "\n".join(part.text for part in content.parts if part.text)
+
+
+def _prompt_text(content) -> str:
+    """Everything in a content the model is billed for: text, tool calls and tool results."""
+    if not content or not content.parts:
+        return ""
+    pieces = []
+    for part in content.parts:
+        if part.text:
+            pieces.append(part.text)
+        elif part.function_call:
+            pieces.append(f"{part.function_call.name}({part.function_call.args})")
+        elif part.function_response:
+            pieces.append(f"{part.function_response.name}: {part.function_response.response}")
+    return "\n".join(pieces)
+
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def estimate_prompt_tokens(llm_request: LlmRequest) -> int:
+    """Prompt tokens of a request, estimated at four characters per token."""
+    return _estimate_tokens("\n".join(_prompt_text(c) for c in llm_request.contents))
+
+
+class SimulatedGemini(BaseLlm):
+    """Deterministic mock of a Gemini model with simulated latency."""
+
+    model: str = "gemini-simulated"
+    latency_mean: float = 0.05
+    latency_sigma: float = 0.5
+    response_chars: int = 0
+
+    @classmethod
+    def supported_models(cls) -> list[str]:
+        return [r"gemini-simulated.*"]
+
+    def sample_latency(self) -> float:
+        """Draw one call latency in seconds from a lognormal profile."""
+        if self.latency_mean <= 0:
+            return 0.0
+        mu = -0.5 * self.latency_sigma ** 2
+        return self.latency_mean * random.lognormvariate(mu, self.latency_sigma)
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        await asyncio.sleep(self.sample_latency())
+
+        content = self._respond(llm_request)
+        text = _text_of(content)
+        if text and len(text) < self.response_chars:
+            content = self._text(self._pad(text))
+        prompt_tokens = estimate_prompt_tokens(llm_request)
+        yield LlmResponse(
+            content=content,
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=prompt_tokens,
+                candidates_token_count=_estimate_tokens(_text_of(content) or "call"),
+                total_token_count=prompt_tokens + _estimate_tokens(_text_of(content) or "call"),
+            ),
+        )
+
+    def _respond(self, llm_request: LlmRequest) -> types.Content:
+        system_instruction = str(llm_request.config.system_instruction or "") if llm_request.config else ""
+        match = _AGENT_NAME_PATTERN.search(system_instruction)
+        agent_name = match.group(1) if match else "Agent"
+
+        user_texts = [_text_of(c) for c in reversed(llm_request.contents) if c.role == "user" and _text_of(c)]
+        user_text = next(iter(user_texts), "")
+        # Later pipeline stages see earlier stages' output as the last user
+        # turn; the trip itself is in the request that carried its details
+        trip = parse_trip_details(next((text for text in user_texts if "Trip Details:" in text), user_text))
+        responses = [
+            part.function_response
+            for c in llm_request.contents
+            for part in (c.parts or [])
+            if part.function_response
+        ]
+        tools = set(llm_request.tools_dict)
+
+        if "ValidationAgent" in tools:
+            called = {r.name for r in responses}
+            for step in COORDINATOR_STEPS:
+                if step not in called:
+                    return self._call(step, {"request": user_text})
+            return self._text(
+                f"**🌍 Vertex Voyages Travel Plan**\n\n"
+                f"**Destination:** {trip['destination']}\n"
+                f"**Dates:** {trip['travel_dates']}\n"
+                f"**Travelers:** {trip['num_travelers']}"
+            )
+
+        if "web_search" in tools:
+            searched = sum(1 for r in responses if r.name == "web_search")
+            queries = self._search_queries(agent_name, trip)
+            if searched < len(queries):
+                return self._call("web_search", {"query": queries[searched]})
+            return self._text(self._canned_text(agent_name, trip))
+
+        if responses:
+            if responses[-1].name == "optimize_itinerary":
+                return self._text(self._narrate_itinerary(responses[-1].response, trip))
+            if agent_name == "PlanPersonalizer":
+                return self._text(
+                    f"**🌍 Vertex Voyages Travel Plan**\n\n"
+                    f"**Destination:** {trip['destination']}\n"
+                    f"**Dates:** {trip['travel_dates']}\n"
+                    f"**Travelers:** {trip['num_travelers']}\n\n"
+                    f"**💳 Booking Status:** {(responses[-1].response or {}).get('status', 'pending')}"
+                )
+            return self._text(f"**{agent_name}:** {responses[-1].response}")
+
+        if "validate_destination" in tools:
+            return self._call("validate_destination", {
+                "destination": trip["destination"],
+                "travel_dates": trip["travel_dates"],
+            })
+        if "optimize_itinerary" in tools:
+            return self._call("optimize_itinerary", {
+                "destination": trip["destination"],
+                "num_days": trip["num_days"],
+            })
+        if "calculate_trip_budget" in tools:
+            return self._call("calculate_trip_budget", {
+                "destination": trip["destination"],
+                "num_days": trip["num_days"],
+                "num_travelers": trip["num_travelers"],
+                "accommodation_level": trip["accommodation_level"],
+            })
+        if "request_booking_approval" in tools:
+            total = _TOTAL_PATTERN.search(system_instruction)
+            return self._call("request_booking_approval", {
+                "total_cost": float(total.group(1).replace(",", "")) if total else 0.0,
+                "destination": trip["destination"],
+                "num_travelers": trip["num_travelers"],
+            })
+
+        return self._text(self._canned_text(agent_name, trip))
+
+    @staticmethod
+    def _search_queries(agent_name: str, trip: dict) -> list:
+        """Searches a researcher makes, including WeatherChecker's near-duplicate pair."""
+        destination = trip["destination"]
+        month = re.match(r"\d{4}-(\d{2})", trip["travel_dates"])
+        month = calendar.month_name[int(month.group(1))] if month else "this season"
+        if agent_name == "WeatherChecker":
+            return [f"{destination} weather {month} average", f"{destination} climate {month}"]
+        if agent_name == "ActivityFinder":
+            return [f"things to do in {destination}"]
+        return [f"top attractions in {destination}"]
+
+    def _canned_text(self, agent_name: str, trip: dict) -> str:
+        destination = trip["destination"]
+        if agent_name == "ActivityFinder":
+            return (
+                "**Recommended Activities:**\n"
+                f"- Old Town Walking Tour: Guided walk through {destination} (Duration: 3 hours)\n"
+                "- Food Market Tasting: Local street food (Duration: 2 hours)\n"
+                "- Museum Visit: Art and history highlights (Duration: 2 hours)"
+            )
+        if agent_name == "ItineraryBuilder":
+            return "\n".join(
+                f"**Day {day}:**\n"
+                f"- Morning (9:00-12:00): Sightseeing in {destination}\n"
+                "- Afternoon (13:00-17:00): Local activity\n"
+                "- Evening (18:00-21:00): Dinner"
+                for day in range(1, trip["num_days"] + 1)
+            )
+        return f"**{agent_name}:** Simulated findings for {destination}."
+
+    def _narrate_itinerary(self, response: dict, trip: dict) -> str:
+        days = (response or {}).get("days")
+        if not days:
+            return self._canned_text("ItineraryBuilder", trip)
+        lines = []
+        for day in days:
+            lines.append(f"**Day {day['day']}:**")
+            for slot, label in (("morning", "Morning (9:00-12:00)"),
+                                ("afternoon", "Afternoon (13:00-17:00)"),
+                                ("evening", "Evening (18:00-21:00)")):
+                plan = ", ".join(day.get(slot) or []) or f"Free time in {day.get('city', trip['destination'])}"
+                lines.append(f"- {label}: {plan}")
+        return "\n".join(lines)
+
+    def _pad(self, text: str) -> str:
+        """Extend an answer with filler detail lines to about response_chars."""
+        lines = [text]
+        size = len(text)
+        while size < self.response_chars:
+            line = f"- Detail {len(lines)}: additional notes on timing, costs, transport and local tips."
+            lines.append(line)
+            size += len(line) + 1
+        return "\n".join(lines)
+
+    @staticmethod
+    def _call(name: str, args: dict) -> types.Content:
+        return types.Content(
+            role="model",
+            parts=[types.Part(function_call=types.FunctionCall(name=name, args=args))],
+        )
+
+    @staticmethod
+    def _text(text: str) -> types.Content:
+        return types.Content(role="model", parts=[types.Part(text=text)])
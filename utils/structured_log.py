@@ -0,0 +1,141 @@
+"""Queue-backed structured logging with trip correlation IDs.
+
+Logging calls only build a record and put it on an in-memory queue; a
+QueueListener thread formats and writes it, so a slow stdout never blocks
+the event loop. Records carry the fields of the innermost log_context()
+(trip_id, session_id, ...), which follow asyncio tasks through
+contextvars. Output is plain text (the console banners) or JSON lines for
+log shipping. In quiet mode everything below WARNING is dropped at the
+isEnabledFor check, before a record is created.
+"""
+
+import atexit
+import contextlib
+import contextvars
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+
+from config import LOG_FORMAT, LOG_LEVEL, LOG_QUIET
+
+
+ROOT_LOGGER = "vertex_voyages"
+RULE = "=" * 70
+
+_context = contextvars.ContextVar("vertex_voyages_log_context", default={})
+_listener = None
+
+
+class Banner:
+    """A console banner: ruled block in text logs, just its title in JSON logs."""
+
+    __slots__ = ("title", "lines")
+
+    def __init__(self, title: str, *lines: str):
+        self.title = title
+        self.lines = lines
+
+    def __str__(self) -> str:
+        body = [RULE, *self.lines] if self.lines else []
+        return "\n".join(["", RULE, self.title, *body, RULE, ""])
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: time, level, event, message, context and fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        message = record.msg.title if isinstance(record.msg, Banner) else record.getMessage()
+        entry = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "event": getattr(record, "event", None),
+            "message": message,
+        }
+        entry.update(getattr(record, "context", {}))
+        entry.update(getattr(record, "fields", {}))
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class _ContextQueueHandler(logging.handlers.QueueHandler):
+    """Stamps the caller's log context and defers all formatting to the listener."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.context = _context.get()
+        return record
+
+
+@contextlib.contextmanager
+def log_context(**fields):
+    """Attach correlation fields (e.g. trip_id, session_id) to records logged inside."""
+    token = _context.set({**_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger under the vertex_voyages namespace, e.g. get_logger("main")."""
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+def configure_logging(
+    fmt: str = LOG_FORMAT,
+    level: str = LOG_LEVEL,
+    quiet: bool = LOG_QUIET,
+    stream=None
+) -> logging.Logger:
+    """Route vertex_voyages logs through a queue to a background writer.
+
+    Calling it again replaces the previous configuration; the old listener
+    is flushed first.
+
+    Args:
+        fmt: "text" for console banners or "json" for JSON lines
+        level: Minimum level name, e.g. "INFO"
+        quiet: Drop everything below WARNING regardless of level
+        stream: Where the listener writes (stdout by default)
+
+    Returns:
+        The vertex_voyages root logger
+    """
+    global _listener
+    stop_logging()
+
+    handler = logging.StreamHandler(stream if stream is not None else sys.stdout)
+    handler.setFormatter(JsonFormatter() if fmt == "json" else logging.Formatter("%(message)s"))
+    records = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(records, handler)
+    _listener.start()
+
+    logger = logging.getLogger(ROOT_LOGGER)
+    logger.addHandler(_ContextQueueHandler(records))
+    logger.setLevel(logging.WARNING if quiet else level.upper())
+    logger.propagate = False
+    return logger
+
+
+def ensure_logging() -> logging.Logger:
+    """configure_logging() with the settings defaults, unless already configured."""
+    if _listener is None:
+        return configure_logging()
+    return logging.getLogger(ROOT_LOGGER)
+
+
+def stop_logging():
+    """Write out queued records and stop the listener thread."""
+    global _listener
+    logger = logging.getLogger(ROOT_LOGGER)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(stop_logging)
@@ -0,0 +1,254 @@
+"""Per-user session index and memory of past trips.
+
+Sessions live in main.session_service under their user's id, so the
+session service keeps one partition per user. SessionDirectory indexes
+those sessions by id, user and tenant. Finding a trip's owner, or
+listing a user's or tenant's trips, is then a dict lookup instead of a
+scan of every session.
+
+UserMemory remembers the finished trips of identified users in one small
+JSON file per user (USER_MEMORY_DIR), named by a digest of the user id
+and replaced atomically on every save.
+It provides:
+
+- preferences: recent destinations, usual accommodation level, party
+  size, currency and budget
+- prefill(): fills trip parameters the user left out
+- research(): research from an earlier trip to the same city in the same
+  month, which main.create_trip_session saves as completed researcher
+  stages so CheckpointPlugin answers them without a model call
+
+Trips under DEFAULT_USER_ID are shared by everyone and are not remembered.
+"""
+
+import hashlib
+import json
+import os
+import statistics
+import time
+from collections import Counter
+from typing import Optional
+
+from config import (
+    BASE_CURRENCY,
+    DEFAULT_TRIP_PREFERENCES,
+    DEFAULT_USER_ID,
+    RESEARCH_OUTPUT_KEYS,
+    USER_MEMORY_CACHE_SIZE,
+    USER_MEMORY_DIR,
+    USER_MEMORY_ENABLED,
+    USER_MEMORY_TRIPS,
+    USER_RESEARCH_TTL,
+)
+from utils.cache import TTLCache
+from utils.metrics import metrics
+
+
+PREFILLED_FIELDS = ["num_travelers", "accommodation_level", "currency"]
+
+
+def research_key(destination: str, travel_dates: str) -> str:
+    """City and travel month research is remembered under, e.g. "paris|05"."""
+    return f"{(destination or '').lower().split(',')[0].strip()}|{(travel_dates or '')[5:7]}"
+
+
+class SessionDirectory:
+    """Sessions indexed by id, user and tenant.
+
+    Sessions are added when their trip starts and removed when
+    SessionRetention evicts them, so the index holds exactly the
+    sessions the session service holds.
+    """
+
+    def __init__(self):
+        self._owners = {}  # session_id -> (user_id, tenant_id)
+        self._by_user = {}  # user_id -> {session_id: None}, in start order
+        self._by_tenant = {}  # tenant_id -> {session_id: None}, in start order
+
+    def __len__(self) -> int:
+        return len(self._owners)
+
+    def register(self, session_id: str, user_id: str, tenant_id: Optional[str] = None):
+        self.remove(session_id)
+        self._owners[session_id] = (user_id, tenant_id)
+        self._by_user.setdefault(user_id, {})[session_id] = None
+        if tenant_id:
+            self._by_tenant.setdefault(tenant_id, {})[session_id] = None
+
+    def owner(self, session_id: str) -> Optional[tuple]:
+        """(user_id, tenant_id) of a session, or None if it is not indexed."""
+        return self._owners.get(session_id)
+
+    def sessions(self, user_id: Optional[str] = None, tenant_id: Optional[str] = None) -> list:
+        """Session ids of a user or a tenant (or both), oldest first."""
+        if user_id is not None:
+            ids = list(self._by_user.get(user_id, ()))
+            if tenant_id is not None:
+                ids = [session_id for session_id in ids if self._owners[session_id][1] == tenant_id]
+            return ids
+        if tenant_id is not None:
+            return list(self._by_tenant.get(tenant_id, ()))
+        return list(self._owners)
+
+    def remove(self, session_id: str):
+        owner = self._owners.pop(session_id, None)
+        if owner is None:
+            return
+        for index, key in ((self._by_user, owner[0]), (self._by_tenant, owner[1])):
+            bucket = index.get(key)
+            if bucket is not None:
+                bucket.pop(session_id, None)
+                if not bucket:
+                    del index[key]
+
+    def stats(self) -> dict:
+        return {"sessions": len(self._owners), "users": len(self._by_user), "tenants": len(self._by_tenant)}
+
+
+class UserMemory:
+    """Past trips and research per user, one JSON file each.
+
+    Args:
+        directory: Directory holding the user files
+        max_trips: Past trips, and researched city/months, kept per user
+        research_ttl: Seconds remembered research may be reused
+        cache_size: Users kept loaded in memory
+        enabled: With False nothing is remembered or prefilled
+    """
+
+    def __init__(
+        self,
+        directory: str = USER_MEMORY_DIR,
+        max_trips: int = USER_MEMORY_TRIPS,
+        research_ttl: float = USER_RESEARCH_TTL,
+        cache_size: int = USER_MEMORY_CACHE_SIZE,
+        enabled: bool = USER_MEMORY_ENABLED
+    ):
+        self.directory = directory
+        self.max_trips = max_trips
+        self.research_ttl = research_ttl
+        self.enabled = enabled
+        self._records = TTLCache(maxsize=cache_size, ttl=float("inf"))
+
+    def remembers(self, user_id: Optional[str]) -> bool:
+        """Whether trips of this user are remembered."""
+        return self.enabled and bool(user_id) and user_id != DEFAULT_USER_ID
+
+    def load(self, user_id: str) -> dict:
+        """The user's memory; empty for new (or anonymous) users."""
+        if not self.remembers(user_id):
+            return {"user_id": user_id, "tenant_id": None, "trips": [], "research": {}}
+        record = self._records.get(user_id)
+        if record is None:
+            try:
+                with open(self._path(user_id), encoding="utf-8") as f:
+                    record = json.load(f)
+            except FileNotFoundError:
+                record = None
+            if record is None or record.get("user_id") != user_id:
+                record = {"user_id": user_id, "tenant_id": None, "trips": [], "research": {}}
+            self._records.set(user_id, record)
+        return record
+
+    def preferences(self, user_id: str) -> dict:
+        """What the user's past trips say about the next one.
+
+        Returns:
+            Dictionary with the number of remembered trips, recent
+            destinations (newest first), the most common accommodation
+            level, the last party size and currency, the median budget
+            (BASE_CURRENCY) and the user's tenant; only "trips" for new users
+        """
+        record = self.load(user_id)
+        trips = record["trips"]
+        if not trips:
+            return {"trips": 0}
+        budgets = [trip["budget"] for trip in trips if trip.get("budget") is not None]
+        return {
+            "trips": len(trips),
+            "destinations": list(dict.fromkeys(trip["destination"] for trip in reversed(trips))),
+            "accommodation_level": Counter(trip["accommodation_level"] for trip in trips).most_common(1)[0][0],
+            "num_travelers": trips[-1]["num_travelers"],
+            "currency": trips[-1]["currency"],
+            "budget": round(statistics.median(budgets), 2) if budgets else None,
+            "tenant_id": record.get("tenant_id"),
+        }
+
+    def prefill(self, user_id: str, params: dict) -> dict:
+        """Trip parameters with the ones left out (or None) filled in.
+
+        Missing PREFILLED_FIELDS come from the user's preferences, else
+        from DEFAULT_TRIP_PREFERENCES (BASE_CURRENCY for the currency).
+        """
+        preferences = self.preferences(user_id)
+        defaults = {**DEFAULT_TRIP_PREFERENCES, "currency": BASE_CURRENCY}
+        filled = dict(params)
+        for field in PREFILLED_FIELDS:
+            if filled.get(field) is None:
+                filled[field] = preferences.get(field) or defaults[field]
+                if field in preferences:
+                    metrics.increment("user_memory.prefilled", field=field)
+        return filled
+
+    def research(self, user_id: str, destination: str, travel_dates: str) -> Optional[dict]:
+        """Research outputs of the user's earlier trip to this city and month, if still fresh."""
+        entry = self.load(user_id)["research"].get(research_key(destination, travel_dates))
+        if entry is None or time.time() - entry["saved_at"] > self.research_ttl:
+            return None
+        metrics.increment("user_memory.research_reused")
+        return entry["outputs"]
+
+    def remember_trip(self, user_id: str, trip: dict, state: dict, tenant_id: Optional[str] = None):
+        """Add a finished trip, and the research of a single-city trip, to the user's memory.
+
+        Args:
+            user_id: Owner of the trip
+            trip: plan_trip parameters of the trip
+            state: Final session state of the trip
+            tenant_id: Tenant the trip was booked under
+        """
+        if not self.remembers(user_id):
+            return
+        record = self.load(user_id)
+        if tenant_id:
+            record["tenant_id"] = tenant_id
+        record["trips"].append({
+            "destination": trip["destination"],
+            "travel_dates": trip["travel_dates"],
+            "num_days": trip["num_days"],
+            "num_travelers": trip["num_travelers"],
+            "accommodation_level": trip["accommodation_level"],
+            "currency": trip["currency"].upper(),
+            "budget": state.get("last_budget"),
+            "finished_at": time.time(),
+        })
+        del record["trips"][:-self.max_trips]
+
+        outputs = {key: state.get(key) for key in RESEARCH_OUTPUT_KEYS}
+        if not (trip.get("legs") and len(trip["legs"]) > 1) and all(outputs.values()):
+            key = research_key(trip["destination"], trip["travel_dates"])
+            record["research"].pop(key, None)
+            record["research"][key] = {"outputs": outputs, "saved_at": time.time()}
+            for stale in list(record["research"])[:-self.max_trips]:
+                del record["research"][stale]
+        self._write(user_id, record)
+
+    def forget(self, user_id: str):
+        """Delete everything remembered about a user."""
+        self._records.set(user_id, None)
+        try:
+            os.remove(self._path(user_id))
+        except FileNotFoundError:
+            pass
+
+    def _path(self, user_id: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(user_id.encode()).hexdigest() + ".json")
+
+    def _write(self, user_id: str, record: dict):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(user_id)
+        staging = f"{path}.{os.getpid()}.tmp"
+        with open(staging, "w", encoding="utf-8") as f:
+            json.dump(record, f, default=str, ensure_ascii=False)
+        os.replace(staging, path)
+        self._records.set(user_id, record)